@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the course summary index used by the Studio home page.
+
+Examples:
+
+    ./manage.py cms rebuild_course_summaries - rebuilds the summaries of all courses
+"""
+from textwrap import dedent
+
+from django.core.management import BaseCommand
+
+from contentstore.models import CourseSummary
+from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the course summary index from the courses in the modulestore, and removes the
+    summaries of courses which no longer exist.
+    """
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        course_keys = set()
+        for course in modulestore().get_courses():
+            if isinstance(course, ErrorDescriptor):
+                continue
+            CourseSummary.update_from_course(course)
+            course_keys.add(course.id)
+
+        stale = [summary.id for summary in CourseSummary.objects.all() if summary.course_key not in course_keys]
+        CourseSummary.objects.filter(id__in=stale).delete()
+        self.stdout.write("Rebuilt {} course summaries, removed {}.\n".format(len(course_keys), len(stale)))
@@ -3,9 +3,12 @@ Models for contentstore
 """
 # pylint: disable=no-member
 
+from django.conf import settings
+from django.db import models
 from django.db.models.fields import TextField
 
 from config_models.models import ConfigurationModel
+from xmodule_django.models import CourseKeyField, UsageKeyField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -23,3 +26,52 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class CourseSummary(models.Model):
+    """
+    A lightweight summary of a course, kept up to date as the course is published, so that the
+    Studio home page can list the courses a user has access to without loading every course
+    from the modulestore.
+    """
+    course_key = CourseKeyField(max_length=255, db_index=True, unique=True)
+    course_location = UsageKeyField(max_length=255)
+    display_name = TextField(blank=True)
+    org = models.CharField(max_length=255, db_index=True)
+    number = models.CharField(max_length=255)
+    run = models.CharField(max_length=255)
+    display_org_with_default = TextField(blank=True)
+    display_number_with_default = TextField(blank=True)
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Returns whether Studio lists courses from the summary index.
+        """
+        return settings.FEATURES.get('ENABLE_COURSE_SUMMARY_INDEX', False)
+
+    @classmethod
+    def update_from_course(cls, course):
+        """
+        Creates or updates the summary of the given course descriptor.
+        """
+        summary, __ = cls.objects.get_or_create(course_key=course.id, defaults={'course_location': course.location})
+        summary.course_location = course.location
+        summary.display_name = course.display_name or u''
+        summary.org = course.id.org
+        summary.number = course.id.course
+        summary.run = course.id.run
+        summary.display_org_with_default = course.display_org_with_default
+        summary.display_number_with_default = course.display_number_with_default
+        summary.save()
+        return summary
+
+    @property
+    def location(self):
+        """
+        The location of the course block, so that summaries can be listed like course descriptors.
+        """
+        return self.course_location.map_into_course(self.course_key)
+
+    def __unicode__(self):
+        return unicode(self.course_key)
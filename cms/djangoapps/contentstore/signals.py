@@ -6,6 +6,7 @@ from django.dispatch import receiver
 
 from xmodule.modulestore.django import SignalHandler
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
+from contentstore.models import CourseSummary
 
 
 @receiver(SignalHandler.course_published)
@@ -19,6 +20,17 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
         update_search_index.delay(unicode(course_key), datetime.now(UTC).isoformat())
 
 
+@receiver(SignalHandler.course_published)
+def listen_for_course_publish_summary(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receives signal and kicks off celery task to update the course summary index
+    """
+    # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
+    from .tasks import update_course_summary
+    if CourseSummary.is_enabled():
+        update_course_summary.delay(unicode(course_key))
+
+
 @receiver(SignalHandler.library_updated)
 def listen_for_library_update(sender, library_key, **kwargs):  # pylint: disable=unused-argument
     """
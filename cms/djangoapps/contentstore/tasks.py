@@ -11,6 +11,7 @@ from pytz import UTC
 from django.contrib.auth.models import User
 
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
+from contentstore.models import CourseSummary
 from contentstore.utils import initialize_permissions
 from course_action_state.models import CourseRerunState
 from opaque_keys.edx.keys import CourseKey
@@ -48,6 +49,9 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
         # update state: Succeeded
         CourseRerunState.objects.succeeded(course_key=destination_course_key)
 
+        if CourseSummary.is_enabled():
+            CourseSummary.update_from_course(store.get_course(destination_course_key))
+
         # call edxval to attach videos to the rerun
         copy_course_videos(source_course_key, destination_course_key)
 
@@ -104,6 +108,17 @@ def update_search_index(course_id, triggered_time_isoformat):
         LOGGER.debug('Search indexing successful for complete course %s', course_id)
 
 
+@task()
+def update_course_summary(course_id):
+    """ Updates the Studio course summary index entry for a course. """
+    course_key = CourseKey.from_string(course_id)
+    course = modulestore().get_course(course_key)
+    if course is None:
+        LOGGER.debug('Not updating course summary for missing course %s', course_id)
+        return
+    CourseSummary.update_from_course(course)
+
+
 @task()
 def update_library_index(library_id, triggered_time_isoformat):
     """ Updates course search index. """
@@ -10,7 +10,11 @@ import ddt
 
 from django.test import RequestFactory
 
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups, AccessListFallback
+from contentstore.views.course import (
+    _accessible_courses_list, _accessible_courses_list_from_groups, _accessible_course_summaries_list,
+    AccessListFallback
+)
+from contentstore.models import CourseSummary
 from contentstore.utils import delete_course_and_groups
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
@@ -297,3 +301,35 @@ class TestCourseListing(ModuleStoreTestCase):
             self.assertSetEqual(
                 set_of_course_keys(courses_in_progress), set_of_course_keys(unsucceeded_course_actions, 'course_key')
             )
+
+    def test_course_summary_listing(self):
+        """
+        Test listing courses from the course summary index by course and org roles, in a constant number of queries
+        """
+        courses = [
+            self._create_course_with_access_groups(self.store.make_course_key('Org1', 'Course{}'.format(num), 'Run1'))
+            for num in range(3)
+        ]
+        org_course = self._create_course_with_access_groups(self.store.make_course_key('Org2', 'Course1', 'Run1'))
+        for course in courses + [org_course]:
+            CourseSummary.update_from_course(course)
+
+        CourseStaffRole(courses[0].id).add_users(self.user)
+        OrgStaffRole(org_course.id.org).add_users(self.user)
+
+        with self.assertNumQueries(3):
+            summaries, __ = _accessible_course_summaries_list(self.request)
+        self.assertSetEqual(
+            set(summary.course_key for summary in summaries),
+            set([courses[0].id, org_course.id])
+        )
+        summary = [summary for summary in summaries if summary.course_key == courses[0].id][0]
+        self.assertEqual(summary.location, courses[0].location)
+        self.assertEqual(summary.display_name, courses[0].display_name)
+
+        GlobalStaff().add_users(self.user)
+        summaries, __ = _accessible_course_summaries_list(self.request)
+        self.assertEqual(len(summaries), 4)
+
+        delete_course_and_groups(courses[0].id, self.user.id)
+        self.assertFalse(CourseSummary.objects.filter(course_key=courses[0].id).exists())
@@ -3,15 +3,19 @@
 import unittest
 from uuid import uuid4
 import copy
+import json
 import textwrap
 from mock import patch, Mock
 
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.conf import settings
 from django.utils import translation
 
 from nose.plugins.skip import SkipTest
 
+from request_cache.middleware import RequestCache
+
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -74,6 +78,14 @@ class TestGenerateSubs(unittest.TestCase):
             }
         )
 
+    def test_generate_subs_for_speeds(self):
+        """Every subs id gets its speed, and a speed shared by several ids is generated once."""
+        with patch.object(transcripts_utils, 'generate_subs', wraps=transcripts_utils.generate_subs) as mock_generate:
+            result = transcripts_utils.generate_subs_for_speeds({2: 'fast', 1: 'normal'}, 1, self.source_subs)
+        self.assertEqual(mock_generate.call_count, 2)
+        self.assertEqual(result['normal'], self.source_subs)
+        self.assertEqual(result['fast']['start'], [200, 400, 480, 780, 2000])
+
 
 @override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
 class TestSaveSubsToStore(ModuleStoreTestCase):
@@ -135,6 +147,45 @@ class TestSaveSubsToStore(ModuleStoreTestCase):
         self.assertTrue(contentstore().find(self.content_location))
         self.assertEqual(result_location, self.content_location)
 
+    def test_save_subs_to_store_many(self):
+        """
+        Saving several subs ids at once replaces the existing versions with one bulk write.
+        """
+        transcripts_utils.save_subs_to_store(self.subs, self.subs_id, self.course)
+        new_subs = dict(self.subs, text=['new'] * 5)
+        other_subs_id = str(uuid4())
+        other_location = StaticContent.compute_location(self.course.id, 'subs_{0}.srt.sjson'.format(other_subs_id))
+        self.addCleanup(contentstore().delete, other_location)
+
+        with patch.object(contentstore(), 'save', wraps=contentstore().save) as mock_save:
+            locations = transcripts_utils.save_subs_to_store_many(
+                {self.subs_id: new_subs, other_subs_id: self.subs},
+                self.course
+            )
+        self.assertFalse(mock_save.called)
+        self.assertItemsEqual(locations, [self.content_location, other_location])
+        self.assertEqual(json.loads(contentstore().find(self.content_location).data), new_subs)
+        self.assertEqual(json.loads(contentstore().find(other_location).data), self.subs)
+
+    def test_transcript_asset_read_once_per_request(self):
+        """
+        While servicing a request, a transcript asset is only read from the contentstore once.
+        """
+        transcripts_utils.save_subs_to_store(self.subs, self.subs_id, self.course)
+        request_cache = RequestCache()
+        request_cache.process_request(RequestFactory().get('/'))
+        self.addCleanup(request_cache.clear_request_cache)
+
+        with patch.object(contentstore(), 'find', wraps=contentstore().find) as mock_find:
+            for __ in range(2):
+                data = transcripts_utils.Transcript.asset(self.course.location, self.subs_id).data
+                self.assertEqual(json.loads(data), self.subs)
+        self.assertEqual(mock_find.call_count, 1)
+
+        transcripts_utils.remove_subs_from_store(self.subs_id, self.course)
+        with self.assertRaises(NotFoundError):
+            transcripts_utils.Transcript.asset(self.course.location, self.subs_id)
+
     def test_save_unjsonable_subs_to_store(self):
         """
         Assures that subs, that can't be dumped, can't be found later.
@@ -534,6 +585,38 @@ class TestTranscript(unittest.TestCase):
             transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'sjson')
 
 
+class TestTranscriptCache(unittest.TestCase):
+    """
+    Tests for the `TranscriptCache` LRU cache.
+    """
+    def setUp(self):
+        super(TestTranscriptCache, self).setUp()
+        self.cache = transcripts_utils.TranscriptCache(max_size=10)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', 'aaaa')
+        self.assertEqual(self.cache.get('a'), 'aaaa')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 4))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.set('a', 'aaaa')
+        self.cache.set('b', 'bbbb')
+        self.cache.get('a')
+        self.cache.set('c', 'cccc')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'aaaa')
+        self.assertEqual(self.cache.get('c'), 'cccc')
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertEqual(self.cache.stats()['size'], 8)
+
+    def test_oversized_value_not_cached(self):
+        self.cache.set('a', 'a' * 11)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+
 class TestSubsFilename(unittest.TestCase):
     """
     Tests for subs_filename funtion.
@@ -12,6 +12,7 @@ from pytz import UTC
 from django.conf import settings
 from django.utils.translation import ugettext as _
 from django.core.urlresolvers import reverse
+from contentstore.models import CourseSummary
 from django_comment_common.models import assign_default_role
 from django_comment_common.utils import seed_permissions_roles
 
@@ -78,6 +79,7 @@ def delete_course_and_groups(course_key, user_id):
 
     with module_store.bulk_operations(course_key):
         module_store.delete_course(course_key, user_id)
+        CourseSummary.objects.filter(course_key=course_key).delete()
 
         print 'removing User permissions from course....'
         # in the django layer, we need to remove all the user permissions groups associated with this course
@@ -11,6 +11,7 @@ from django.contrib.auth.decorators import login_required
 from django.conf import settings
 from django.views.decorators.http import require_http_methods, require_GET
 from django.core.exceptions import PermissionDenied
+from django.db.models import Q
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse, Http404
 from util.json_request import JsonResponse, JsonResponseBadRequest
@@ -75,10 +76,12 @@ from .item import create_xblock_info
 from contentstore.push_notification import push_notification_enabled
 from course_creators.views import get_course_creator_status, add_user_with_status_unrequested
 from contentstore import utils
+from contentstore.models import CourseSummary
 from student.roles import (
     CourseInstructorRole, CourseStaffRole, CourseCreatorRole, GlobalStaff, UserBasedRole
 )
 from student import auth
+from student.models import CourseAccessRole
 from course_action_state.models import CourseRerunState, CourseRerunUIStateManager
 from course_action_state.managers import CourseActionStateItemNotFoundError
 from microsite_configuration import microsite
@@ -400,6 +403,43 @@ def _accessible_courses_list_from_groups(request):
     return courses_list.values(), in_process_course_actions
 
 
+def _accessible_course_summaries_list(request):
+    """
+    List the summaries of all courses available to the logged in user from the course summary index.
+
+    Global staff see every course. Other users see the courses, and the courses in the orgs, on which
+    they hold an instructor or staff role. This takes a constant number of queries, however many
+    courses there are.
+    """
+    in_process_course_actions = CourseRerunState.objects.find_all(
+        exclude_args={'state': CourseRerunUIStateManager.State.SUCCEEDED}, should_display=True
+    )
+    if GlobalStaff().has_user(request.user):
+        return list(CourseSummary.objects.all()), list(in_process_course_actions)
+
+    course_keys = set()
+    orgs = set()
+    for course_access in CourseAccessRole.objects.filter(
+            user=request.user, role__in=[CourseInstructorRole.ROLE, CourseStaffRole.ROLE]
+    ):
+        if course_access.course_id is None:
+            orgs.add(course_access.org)
+        else:
+            course_keys.add(course_access.course_id)
+
+    if not course_keys and not orgs:
+        return [], []
+
+    query = Q(course_key__in=course_keys) if course_keys else Q(org__in=orgs)
+    if course_keys and orgs:
+        query |= Q(org__in=orgs)
+    in_process_course_actions = [
+        course for course in in_process_course_actions
+        if course.course_key in course_keys or course.course_key.org in orgs
+    ]
+    return list(CourseSummary.objects.filter(query)), in_process_course_actions
+
+
 def _accessible_libraries_list(user):
     """
     List all libraries available to the logged in user by iterating through all libraries
@@ -528,6 +568,8 @@ def get_courses_accessible_to_user(request):
     Try to get all courses by first reversing django groups and fallback to old method if it fails
     Note: overhead of pymongo reads will increase if getting courses from django groups fails
     """
+    if CourseSummary.is_enabled():
+        return _accessible_course_summaries_list(request)
     if GlobalStaff().has_user(request.user):
         # user has global access so no need to get courses from django groups
         courses, in_process_course_actions = _accessible_courses_list(request)
@@ -548,14 +590,15 @@ def _remove_in_process_courses(courses, in_process_course_actions):
     """
     def format_course_for_view(course):
         """
-        Return a dict of the data which the view requires for each course
+        Return a dict of the data which the view requires for each course, given either a course
+        descriptor or a CourseSummary
         """
         return {
             'display_name': course.display_name,
             'course_key': unicode(course.location.course_key),
-            'url': reverse_course_url('course_handler', course.id),
+            'url': reverse_course_url('course_handler', course.location.course_key),
             'lms_link': get_lms_link_for_item(course.location),
-            'rerun_link': _get_rerun_link_for_item(course.id),
+            'rerun_link': _get_rerun_link_for_item(course.location.course_key),
             'org': course.display_org_with_default,
             'number': course.display_number_with_default,
             'run': course.location.run
@@ -565,7 +608,7 @@ def _remove_in_process_courses(courses, in_process_course_actions):
     courses = [
         format_course_for_view(c)
         for c in courses
-        if not isinstance(c, ErrorDescriptor) and (c.id not in in_process_action_course_keys)
+        if not isinstance(c, ErrorDescriptor) and (c.location.course_key not in in_process_action_course_keys)
     ]
     return courses
 
@@ -708,6 +751,8 @@ def create_new_course_in_store(store, user, org, number, run, fields):
 
     # Initialize permissions for user in the new course
     initialize_permissions(new_course.id, user)
+    if CourseSummary.is_enabled():
+        CourseSummary.update_from_course(new_course)
     return new_course
 
 
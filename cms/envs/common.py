@@ -152,6 +152,14 @@ FEATURES = {
     # Enable content libraries search functionality
     'ENABLE_LIBRARY_INDEX': False,
 
+    # List courses on the Studio home page from the course summary index
+    # (populate it with the rebuild_course_summaries management command)
+    'ENABLE_COURSE_SUMMARY_INDEX': False,
+
+    # Load every mako template in each web server process before it accepts
+    # requests (compile them ahead of time with compile_mako_templates).
+    'ENABLE_MAKO_WARMUP': False,
+
     # Enable course reruns, which will always use the split modulestore
     'ALLOW_COURSE_RERUNS': True,
 
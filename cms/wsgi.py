@@ -15,6 +15,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cms.envs.aws")
 import cms.startup as startup
 startup.run()
 
+# Load what the first requests would otherwise pay for (e.g. compiled templates)
+from openedx.core.lib.django_startup import autowarmup
+autowarmup()
+
 # This application object is used by the development server
 # as well as any WSGI server configured to use this file.
 from django.core.wsgi import get_wsgi_application
@@ -0,0 +1,47 @@
+"""
+Management command to compile every mako template ahead of time into settings.MAKO_MODULE_DIR,
+so web server processes only have to load the compiled modules.
+
+Run it as part of a deploy, after the templates are in place and before the web servers restart.
+
+Examples:
+
+    ./manage.py lms compile_mako_templates - compiles the templates of every lookup namespace
+    ./manage.py lms compile_mako_templates main - compiles the templates of the 'main' namespace
+    ./manage.py lms compile_mako_templates --slowest 20 - also lists the 20 slowest templates
+"""
+from optparse import make_option
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from edxmako import precompile_templates
+
+
+class Command(BaseCommand):
+    """
+    Compiles the mako templates of the given lookup namespaces and reports how long it took.
+    """
+    help = dedent(__doc__).strip()
+    args = '[namespace ...]'
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--slowest',
+            type='int',
+            default=10,
+            help='Number of the slowest templates to list'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        results = precompile_templates(args or None)
+        failures = [result for result in results if result[3]]
+
+        self.stdout.write("Compiled {} templates into {} in {:.2f}s.\n".format(
+            len(results) - len(failures), settings.MAKO_MODULE_DIR, sum(result[2] for result in results)
+        ))
+        for namespace, uri, seconds, __ in sorted(results, key=lambda result: result[2], reverse=True)[:options['slowest']]:
+            self.stdout.write("{:8.3f}s  {}:{}\n".format(seconds, namespace, uri))
+        for namespace, uri, __, error in failures:
+            self.stdout.write(u"Skipped {}:{}: {}\n".format(namespace, uri, error))
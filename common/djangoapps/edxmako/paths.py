@@ -1,20 +1,38 @@
 """
 Set up lookup paths for mako templates.
 """
+import logging
 import os
 import pkg_resources
+import time
 
 from django.conf import settings
 from mako.lookup import TemplateLookup
 
+import dogstats_wrapper as dog_stats_api
+
 from . import LOOKUP
 
+log = logging.getLogger(__name__)
+
+# Extensions of the files in the lookup directories which are compiled ahead of time
+PRECOMPILED_TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
 
 class DynamicTemplateLookup(TemplateLookup):
     """
     A specialization of the standard mako `TemplateLookup` class which allows
     for adding directories progressively.
+
+    Lookups are instrumented: the hit ratio of the in-process template collection
+    and the time taken to compile (or load the compiled module of) each template
+    are reported to datadog.
     """
+    def __init__(self, *args, **kwargs):
+        super(DynamicTemplateLookup, self).__init__(*args, **kwargs)
+        self.hits = 0
+        self.misses = 0
+
     def add_directory(self, directory, prepend=False):
         """
         Add a new directory to the template lookup path.
@@ -24,6 +42,47 @@ class DynamicTemplateLookup(TemplateLookup):
         else:
             self.directories.append(os.path.normpath(directory))
 
+    def get_template(self, uri):
+        """
+        Return the template for `uri`, recording whether it was already loaded in this process.
+        """
+        if uri in self._collection:
+            self.hits += 1
+            dog_stats_api.increment('edxmako.lookup', tags=[u'result:hit'])
+        else:
+            self.misses += 1
+            dog_stats_api.increment('edxmako.lookup', tags=[u'result:miss'])
+        return super(DynamicTemplateLookup, self).get_template(uri)
+
+    def _load(self, filename, uri):
+        """
+        Compile the template at `filename`, or load its module from `module_directory`
+        when it was compiled already, timing how long that takes.
+        """
+        start = time.time()
+        template = super(DynamicTemplateLookup, self)._load(filename, uri)
+        dog_stats_api.histogram('edxmako.template.load_time', time.time() - start, tags=[u'template:{}'.format(uri)])
+        return template
+
+    def template_uris(self, extensions=PRECOMPILED_TEMPLATE_EXTENSIONS):
+        """
+        Yield the uri of every template file under this lookup's directories, in
+        the form `lookup_template` is called with (relative to the directory).
+
+        Directories earlier in the lookup path shadow templates of the same uri
+        in later directories, so each uri is only yielded once.
+        """
+        seen = set()
+        for directory in self.directories:
+            for root, __, filenames in os.walk(directory):
+                for filename in filenames:
+                    if os.path.splitext(filename)[1] not in extensions:
+                        continue
+                    uri = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+                    if uri not in seen:
+                        seen.add(uri)
+                        yield uri
+
 
 def clear_lookups(namespace):
     """
@@ -60,3 +119,30 @@ def lookup_template(namespace, name):
     Look up a Mako template by namespace and name.
     """
     return LOOKUP[namespace].get_template(name)
+
+
+def precompile_templates(namespaces=None):
+    """
+    Compile every template of the given lookup namespaces (all of them by default),
+    writing the compiled modules to `settings.MAKO_MODULE_DIR` and loading them
+    into this process.
+
+    Templates which were compiled already are only loaded, so this is also
+    how each process warms up its templates at startup.
+
+    Returns a list of (namespace, uri, seconds taken, error message or None).
+    """
+    results = []
+    for namespace in namespaces or sorted(LOOKUP):
+        lookup = LOOKUP[namespace]
+        for uri in lookup.template_uris():
+            start = time.time()
+            error = None
+            try:
+                lookup.get_template(uri)
+            except Exception as exc:  # pylint: disable=broad-except
+                # Not every file in a template directory is a valid Mako template
+                error = u'{}: {}'.format(type(exc).__name__, exc)
+                log.debug(u"Could not compile template %s:%s: %s", namespace, uri, error)
+            results.append((namespace, uri, time.time() - start, error))
+    return results
@@ -1,8 +1,13 @@
 """
 Initialize the mako template lookup
 """
+import logging
+import time
+
 from django.conf import settings
-from . import add_lookup, clear_lookups
+from . import add_lookup, clear_lookups, precompile_templates
+
+log = logging.getLogger(__name__)
 
 
 def run():
@@ -17,3 +22,20 @@ def run():
         clear_lookups(namespace)
         for directory in directories:
             add_lookup(namespace, directory)
+
+
+def warmup():
+    """
+    Load every template into this process' lookups, so that first requests don't pay for it.
+
+    Templates compiled ahead of time (with the compile_mako_templates command)
+    are only loaded from `settings.MAKO_MODULE_DIR`; any others are compiled now.
+    """
+    if not settings.FEATURES.get('ENABLE_MAKO_WARMUP', False):
+        return
+    start = time.time()
+    results = precompile_templates()
+    log.info(
+        "Warmed up %d mako templates in %.2fs (%d could not be compiled)",
+        len(results), time.time() - start, len([result for result in results if result[3]])
+    )
@@ -1,5 +1,6 @@
 
 from mock import patch, Mock
+import os
 import unittest
 import ddt
 
@@ -11,12 +12,13 @@ from django.test.client import RequestFactory
 from django.core.urlresolvers import reverse
 import edxmako.middleware
 from edxmako.middleware import get_template_request_context
-from edxmako import add_lookup, LOOKUP
+from edxmako import add_lookup, precompile_templates, LOOKUP
 from edxmako.shortcuts import (
     marketing_link,
     render_to_string,
     open_source_footer_context_processor
 )
+from openedx.core.lib.tempdir import mkdtemp_clean
 from student.tests.factories import UserFactory
 from util.testing import UrlResetMixin
 
@@ -63,6 +65,40 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class PrecompileTemplatesTests(TestCase):
+    """
+    Test the `precompile_templates` function.
+    """
+    def setUp(self):
+        super(PrecompileTemplatesTests, self).setUp()
+        self.template_dir = mkdtemp_clean()
+        with open(os.path.join(self.template_dir, 'good.html'), 'w') as template:
+            template.write('<p>${1 + 1}</p>')
+        with open(os.path.join(self.template_dir, 'bad.html'), 'w') as template:
+            template.write('<%def name="unclosed()">')
+        with open(os.path.join(self.template_dir, 'ignored.underscore'), 'w') as template:
+            template.write('<%= name %>')
+
+    @patch('edxmako.LOOKUP', {})
+    def test_precompile(self):
+        module_dir = mkdtemp_clean()
+        with override_settings(MAKO_MODULE_DIR=module_dir):
+            add_lookup('test', self.template_dir)
+            results = precompile_templates(['test'])
+
+        errors = {uri: error for namespace, uri, __, error in results}
+        self.assertEqual(sorted(errors), ['bad.html', 'good.html'])
+        self.assertIsNone(errors['good.html'])
+        self.assertIsNotNone(errors['bad.html'])
+        self.assertTrue(os.path.exists(os.path.join(module_dir, 'good.html.py')))
+
+        # the compiled template is now served from the lookup's collection
+        lookup = LOOKUP['test']
+        hits = lookup.hits
+        self.assertEqual(lookup.get_template('good.html').render(), '<p>2</p>')
+        self.assertEqual(lookup.hits, hits + 1)
+
+
 class MakoMiddlewareTest(TestCase):
     """
     Test MakoMiddleware.
@@ -25,6 +25,7 @@ from embargo.models import (
 
 from util.testing import UrlResetMixin
 from embargo import api as embargo_api
+from geoinfo.api import clear_lookup_cache
 from embargo.exceptions import InvalidAccessPoint
 from mock import patch
 
@@ -184,9 +185,13 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
 
     @contextmanager
     def _mock_geoip(self, country_code):
+        clear_lookup_cache()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = country_code
-            yield
+            try:
+                yield
+            finally:
+                clear_lookup_cache()
 
 
 @ddt.ddt
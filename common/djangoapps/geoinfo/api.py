@@ -0,0 +1,105 @@
+"""
+Country lookups of IP addresses, shared by the threads of a process.
+
+The GeoIP databases at `settings.GEOIP_PATH` (IPv4) and `settings.GEOIPV6_PATH` (IPv6)
+are each opened once per process, memory-mapped, instead of being opened and read
+for every lookup.  The country codes of the most recently looked up addresses are
+kept in a size-bounded LRU cache.
+"""
+from collections import OrderedDict
+import threading
+
+import pygeoip
+
+from django.conf import settings
+
+# Number of IP addresses whose country code is kept
+LOOKUP_CACHE_SIZE = 10000
+
+# Open GeoIP databases, by path
+_READERS = {}
+_READERS_LOCK = threading.Lock()
+
+
+def _reader(path):
+    """
+    Return the GeoIP reader of the database at `path`, opening it on first use.
+    """
+    reader = _READERS.get(path)
+    if reader is None:
+        with _READERS_LOCK:
+            reader = _READERS.get(path)
+            if reader is None:
+                reader = _READERS[path] = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+    return reader
+
+
+class LookupCache(object):
+    """
+    Size-bounded LRU cache of the country codes of IP addresses.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ip_addr):
+        """
+        Return the (found, country code) of `ip_addr`, where `found` is False if the
+        address is not cached.
+        """
+        with self._lock:
+            if ip_addr not in self._entries:
+                return False, None
+            # re-insert as most recently used
+            country_code = self._entries[ip_addr] = self._entries.pop(ip_addr)
+        return True, country_code
+
+    def set(self, ip_addr, country_code):
+        """
+        Cache the `country_code` of `ip_addr`, evicting the least recently used addresses to make room.
+        """
+        with self._lock:
+            self._entries.pop(ip_addr, None)
+            self._entries[ip_addr] = country_code
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all of the cached addresses.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_LOOKUP_CACHE = LookupCache(LOOKUP_CACHE_SIZE)
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code, or an empty value if the address
+            is not in the database.
+
+    """
+    found, country_code = _LOOKUP_CACHE.get(ip_addr)
+    if not found:
+        path = settings.GEOIPV6_PATH if ip_addr.find(':') >= 0 else settings.GEOIP_PATH
+        country_code = _reader(path).country_code_by_addr(ip_addr)
+        _LOOKUP_CACHE.set(ip_addr, country_code)
+    return country_code
+
+
+def clear_lookup_cache():
+    """
+    Forget the country codes of the IP addresses looked up so far, e.g. in tests
+    which mock the GeoIP databases.
+    """
+    _LOOKUP_CACHE.clear()
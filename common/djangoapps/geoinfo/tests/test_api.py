@@ -0,0 +1,60 @@
+"""
+Tests for the shared GeoIP lookups.
+"""
+from mock import patch
+import pygeoip
+
+from django.test import TestCase
+
+from geoinfo import api as geoinfo_api
+
+
+class CountryCodeByAddrTests(TestCase):
+    """
+    Tests of country_code_by_addr.
+    """
+    def setUp(self):
+        super(CountryCodeByAddrTests, self).setUp()
+        geoinfo_api.clear_lookup_cache()
+        self.addCleanup(geoinfo_api.clear_lookup_cache)
+
+    def test_lookup(self):
+        self.assertEqual(geoinfo_api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(geoinfo_api.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+
+    def test_lookups_cached(self):
+        with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='SD') as mock_lookup:
+            for __ in range(3):
+                self.assertEqual(geoinfo_api.country_code_by_addr('4.0.0.0'), 'SD')
+            self.assertEqual(mock_lookup.call_count, 1)
+
+            geoinfo_api.clear_lookup_cache()
+            geoinfo_api.country_code_by_addr('4.0.0.0')
+            self.assertEqual(mock_lookup.call_count, 2)
+
+    def test_databases_opened_once(self):
+        # pylint: disable=protected-access
+        reader = geoinfo_api._reader(geoinfo_api.settings.GEOIP_PATH)
+        self.assertIs(geoinfo_api._reader(geoinfo_api.settings.GEOIP_PATH), reader)
+        self.assertIsNot(geoinfo_api._reader(geoinfo_api.settings.GEOIPV6_PATH), reader)
+
+
+class LookupCacheTests(TestCase):
+    """
+    Tests of LookupCache.
+    """
+    def test_least_recently_used_evicted(self):
+        cache = geoinfo_api.LookupCache(2)
+        cache.set('1.1.1.1', 'AU')
+        cache.set('2.2.2.2', 'FR')
+        self.assertEqual(cache.get('1.1.1.1'), (True, 'AU'))
+
+        cache.set('3.3.3.3', 'US')
+        self.assertEqual(cache.get('2.2.2.2'), (False, None))
+        self.assertEqual(cache.get('1.1.1.1'), (True, 'AU'))
+        self.assertEqual(cache.get('3.3.3.3'), (True, 'US'))
+
+    def test_empty_country_code_cached(self):
+        cache = geoinfo_api.LookupCache(2)
+        cache.set('127.0.0.1', '')
+        self.assertEqual(cache.get('127.0.0.1'), (True, ''))
@@ -0,0 +1,46 @@
+"""
+Management command to report the most expensive imports of a cold process start.
+
+The modules are imported in a fresh python process, since everything this command's own
+process imported during startup would otherwise cost nothing.
+
+Examples:
+
+    ./manage.py lms profile_imports - profiles the start of an LMS web server process (lms.wsgi)
+    ./manage.py lms profile_imports xmodule.capa_module - profiles importing the capa module
+    ./manage.py lms profile_imports --count 50 lms.wsgi - lists the 50 slowest imports
+"""
+from optparse import make_option
+import os
+import subprocess
+import sys
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Profiles importing the given modules in a new process and lists the slowest imports.
+    """
+    help = dedent(__doc__).strip()
+    args = '[module ...]'
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--count',
+            type='int',
+            default=30,
+            help='Number of the slowest imports to list'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        modules = list(args) or ['lms.wsgi']
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'lms.envs.aws'))
+        output = subprocess.check_output(
+            [sys.executable, '-m', 'openedx.core.lib.import_profiler', '--count={}'.format(options['count'])] + modules,
+            cwd=settings.REPO_ROOT,
+            env=env,
+        )
+        self.stdout.write(output)
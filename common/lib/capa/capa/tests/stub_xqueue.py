@@ -0,0 +1,125 @@
+"""
+Local stand-in for the xqueue server, for testing `capa.xqueue_interface`.
+
+It implements just enough of the xqueue submission protocol: logging in sets
+a session cookie, and submissions are only accepted from logged in sessions.
+Every request is recorded so tests can check what was sent.
+"""
+import cgi
+import json
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+
+class StubXQueueHandler(BaseHTTPRequestHandler):
+    """
+    Handles the xqueue login and submit endpoints.
+    """
+    protocol_version = 'HTTP/1.1'
+    SESSION_COOKIE = 'sessionid=stub-xqueue-session'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Dispatch a POST request to the login or submit endpoint.
+        """
+        form = cgi.FieldStorage(
+            fp=self.rfile,
+            headers=self.headers,
+            environ={'REQUEST_METHOD': 'POST', 'CONTENT_TYPE': self.headers['Content-Type']},
+        )
+        self.server.record(self.path, form, self.headers)
+
+        if self.path == '/xqueue/login/':
+            self._reply(0, 'Logged in', cookie=self.SESSION_COOKIE)
+        elif self.path == '/xqueue/submit/':
+            if self.SESSION_COOKIE not in self.headers.get('Cookie', ''):
+                self._reply(1, 'login_required')
+            else:
+                self._reply(0, 'Queued')
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def _reply(self, return_code, content, cookie=None):
+        """
+        Send an xqueue style JSON reply.
+        """
+        body = json.dumps({'return_code': return_code, 'content': content})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if cookie is not None:
+            self.send_header('Set-Cookie', cookie + '; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        Keep test output quiet.
+        """
+        pass
+
+
+class StubXQueueServer(ThreadingMixIn, HTTPServer):
+    """
+    Stand-in xqueue server listening on a free local port in a background thread.
+
+    Usage:
+        server = StubXQueueServer()
+        ... point an XQueueInterface at server.url ...
+        server.shutdown()
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubXQueueHandler)
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def url(self):
+        """
+        Base URL of the server.
+        """
+        return 'http://127.0.0.1:{}'.format(self.server_port)
+
+    def record(self, path, form, headers):
+        """
+        Remember a request: its path, its non-file form fields, the names of
+        its uploaded files, and the client port it arrived on.
+        """
+        with self._lock:
+            self.requests.append({
+                'path': path,
+                'data': {key: form[key].value for key in form.keys() if form[key].filename is None},
+                'files': sorted(form[key].filename for key in form.keys() if form[key].filename is not None),
+            })
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections.add(client_address)
+        return ThreadingMixIn.process_request(self, request, client_address)
+
+    def submissions(self):
+        """
+        The recorded requests to the submit endpoint.
+        """
+        with self._lock:
+            return [request for request in self.requests if request['path'] == '/xqueue/submit/']
+
+    def handle_error(self, request, client_address):
+        """
+        Keep-alive connections are dropped when the server shuts down; don't
+        report that.
+        """
+        pass
+
+    def shutdown(self):
+        HTTPServer.shutdown(self)
+        self.server_close()
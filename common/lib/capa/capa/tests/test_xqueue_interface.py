@@ -0,0 +1,106 @@
+"""
+Tests for the xqueue client in capa.xqueue_interface, run against a local
+stand-in xqueue server.
+"""
+import json
+import unittest
+from StringIO import StringIO
+
+from mock import patch
+
+from capa.tests.stub_xqueue import StubXQueueServer
+from capa.xqueue_interface import BufferedXQueueInterface, XQueueInterface, make_xheader
+
+
+class XQueueInterfaceTest(unittest.TestCase):
+    """
+    Tests for XQueueInterface.
+    """
+    interface_class = XQueueInterface
+
+    def setUp(self):
+        super(XQueueInterfaceTest, self).setUp()
+        self.server = StubXQueueServer()
+        self.addCleanup(self.server.shutdown)
+        self.xqueue = self.interface_class(self.server.url, {'username': 'lms', 'password': 'secret'})
+        self.header = make_xheader('http://lms/callback', 'secret-key', 'test-queue')
+
+    def send(self, count):
+        """
+        Submit `count` submissions and return their results.
+        """
+        return [self.xqueue.send_to_queue(self.header, json.dumps({'n': index})) for index in xrange(count)]
+
+    def test_logs_in_once(self):
+        results = self.send(5)
+
+        self.assertEqual(results, [(0, 'Queued')] * 5)
+        paths = [request['path'] for request in self.server.requests]
+        # The first submission is refused, then the session stays logged in
+        self.assertEqual(paths, ['/xqueue/submit/', '/xqueue/login/'] + ['/xqueue/submit/'] * 5)
+        self.assertEqual(
+            [json.loads(request['data']['xqueue_body'])['n'] for request in self.server.submissions()[1:]],
+            range(5)
+        )
+
+    def test_reuses_connections(self):
+        self.send(5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_uploads_files(self):
+        upload = StringIO('print "hello"')
+        upload.name = 'answer.py'
+        self.assertEqual(self.xqueue.send_to_queue(self.header, '{}', [upload]), (0, 'Queued'))
+        self.assertEqual(self.server.submissions()[-1]['files'], ['answer.py'])
+
+    def test_cannot_connect(self):
+        self.server.shutdown()
+        self.assertEqual(self.send(1), [(1, 'cannot connect to server')])
+
+    @patch('capa.xqueue_interface.dog_stats_api')
+    def test_reports_request_time(self, mock_stats):
+        self.send(1)
+        metrics = [args[0] for args, __ in mock_stats.histogram.call_args_list]
+        self.assertIn('edxapp.xqueue.request_time', metrics)
+
+
+class BufferedXQueueInterfaceTest(XQueueInterfaceTest):
+    """
+    Tests for BufferedXQueueInterface.
+    """
+    interface_class = BufferedXQueueInterface
+
+    def send(self, count):
+        results = super(BufferedXQueueInterfaceTest, self).send(count)
+        self.xqueue.flush()
+        return results
+
+    def test_logs_in_once(self):
+        self.assertEqual(self.send(5), [(0, 'queued')] * 5)
+        self.assertEqual(len(self.server.submissions()), 6)
+        self.assertEqual(
+            sorted(json.loads(request['data']['xqueue_body'])['n'] for request in self.server.submissions()[1:]),
+            range(5)
+        )
+
+    def test_uploads_files(self):
+        upload = StringIO('print "hello"')
+        upload.name = 'answer.py'
+        self.assertEqual(self.xqueue.send_to_queue(self.header, '{}', [upload]), (0, 'queued'))
+        # The upload can go away before the buffered submission is sent
+        upload.close()
+        self.xqueue.flush()
+        self.assertEqual(self.server.submissions()[-1]['files'], ['answer.py'])
+
+    def test_cannot_connect(self):
+        self.server.shutdown()
+        # Delivery failures are only logged, since the caller has moved on
+        with patch('capa.xqueue_interface.log') as mock_log:
+            self.assertEqual(self.send(1), [(0, 'queued')])
+        self.assertTrue(mock_log.error.called)
+
+    def test_buffer_full(self):
+        xqueue = BufferedXQueueInterface(self.server.url, {'username': 'lms', 'password': 'secret'}, max_buffered=1)
+        with patch.object(xqueue, '_ensure_worker'):
+            self.assertEqual(xqueue.send_to_queue(self.header, '{}'), (0, 'queued'))
+            self.assertEqual(xqueue.send_to_queue(self.header, '{}')[0], 1)
@@ -4,7 +4,13 @@
 import hashlib
 import json
 import logging
+import Queue
+import threading
+import time
+from StringIO import StringIO
+
 import requests
+from requests.adapters import HTTPAdapter
 import dogstats_wrapper as dog_stats_api
 
 
@@ -16,6 +22,12 @@ XQUEUE_METRIC_NAME = 'edxapp.xqueue'
 # Wait time for response from Xqueue.
 XQUEUE_TIMEOUT = 35  # seconds
 
+# Number of keep-alive connections to xqueue kept open per interface
+XQUEUE_POOL_SIZE = 10
+
+# Number of times a request is retried when xqueue can't be connected to
+XQUEUE_CONNECT_RETRIES = 2
+
 
 def make_hashkey(seed):
     """
@@ -67,11 +79,18 @@ class XQueueInterface(object):
     Interface to the external grading system
     """
 
-    def __init__(self, url, django_auth, requests_auth=None):
+    def __init__(self, url, django_auth, requests_auth=None,
+                 pool_size=XQUEUE_POOL_SIZE, connect_retries=XQUEUE_CONNECT_RETRIES):
         self.url = unicode(url)
         self.auth = django_auth
+        # The session keeps both the xqueue login cookie and a pool of
+        # keep-alive connections, so that a long-lived interface only logs in
+        # and connects once rather than on each submission.
         self.session = requests.Session()
         self.session.auth = requests_auth
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=connect_retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def send_to_queue(self, header, body, files_to_upload=None):
         """
@@ -133,13 +152,123 @@ class XQueueInterface(object):
         return self._http_post(self.url + '/xqueue/submit/', payload, files=files)
 
     def _http_post(self, url, data, files=None):
+        start_time = time.time()
         try:
-            r = self.session.post(url, data=data, files=files)
+            r = self.session.post(url, data=data, files=files, timeout=XQUEUE_TIMEOUT)
         except requests.exceptions.ConnectionError, err:
             log.error(err)
             return (1, 'cannot connect to server')
+        except requests.exceptions.Timeout, err:
+            log.error(err)
+            return (1, 'timed out waiting for server')
+        finally:
+            dog_stats_api.histogram(
+                XQUEUE_METRIC_NAME + '.request_time',
+                time.time() - start_time,
+                tags=[u'path:{}'.format(url[len(self.url):])]
+            )
 
         if r.status_code not in [200]:
             return (1, 'unexpected HTTP status code [%d]' % r.status_code)
 
         return parse_xreply(r.text)
+
+
+class BufferedXQueueInterface(XQueueInterface):
+    """
+    Interface to the external grading system that doesn't block the caller.
+
+    `send_to_queue` only buffers the submission and returns immediately. A
+    background thread drains the buffer in batches of up to `batch_size`
+    submissions, sending each batch back to back over the pooled, already
+    authenticated session. Delivery errors can no longer be reported to the
+    student, so they are logged and counted instead; the student can
+    resubmit once the queue wait time has passed.
+    """
+
+    def __init__(self, url, django_auth, requests_auth=None,
+                 pool_size=XQUEUE_POOL_SIZE, connect_retries=XQUEUE_CONNECT_RETRIES,
+                 batch_size=20, max_buffered=1000):
+        super(BufferedXQueueInterface, self).__init__(
+            url, django_auth, requests_auth, pool_size=pool_size, connect_retries=connect_retries
+        )
+        self.batch_size = batch_size
+        self.buffer = Queue.Queue(max_buffered)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def send_to_queue(self, header, body, files_to_upload=None):
+        """
+        Buffer a request to xqueue. See `XQueueInterface.send_to_queue` for
+        the arguments.
+
+        Uploaded files are read into memory here, since the request that
+        received them may be over by the time the submission is sent.
+
+        Returns (0, msg) once the submission is buffered, or (1, msg) if the
+        buffer is full.
+        """
+        files = None
+        if files_to_upload is not None:
+            files = []
+            for f in files_to_upload:
+                buffered_file = StringIO(f.read())
+                buffered_file.name = f.name
+                files.append(buffered_file)
+
+        try:
+            self.buffer.put_nowait((time.time(), header, body, files))
+        except Queue.Full:
+            dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[u'action:buffer_full'])
+            return (1, 'too many submissions waiting to be sent to the grader')
+
+        self._ensure_worker()
+        return (0, 'queued')
+
+    def flush(self):
+        """
+        Block until every buffered submission has been sent.
+        """
+        self.buffer.join()
+
+    def _ensure_worker(self):
+        """
+        Start the background sender thread if it isn't running.
+        """
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._send_buffered, name='xqueue-sender')
+                self._worker.daemon = True
+                self._worker.start()
+
+    def _next_batch(self):
+        """
+        Wait for a buffered submission, then return it along with any others
+        already waiting, up to `batch_size` submissions.
+        """
+        batch = [self.buffer.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.buffer.get_nowait())
+            except Queue.Empty:
+                break
+        return batch
+
+    def _send_buffered(self):
+        """
+        Body of the background sender thread.
+        """
+        while True:
+            batch = self._next_batch()
+            dog_stats_api.histogram(XQUEUE_METRIC_NAME + '.batch_size', len(batch))
+            for (buffered_time, header, body, files) in batch:
+                try:
+                    dog_stats_api.histogram(XQUEUE_METRIC_NAME + '.buffered_time', time.time() - buffered_time)
+                    (error, msg) = super(BufferedXQueueInterface, self).send_to_queue(header, body, files)
+                    if error:
+                        dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[u'action:send_failed'])
+                        log.error("Failed to send buffered submission to xqueue: %s (header: %s)", msg, header)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Unexpected error sending buffered submission to xqueue (header: %s)", header)
+                finally:
+                    self.buffer.task_done()
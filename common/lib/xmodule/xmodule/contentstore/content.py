@@ -7,9 +7,19 @@ XASSET_THUMBNAIL_TAIL_NAME = '.jpg'
 
 STREAM_DATA_CHUNK_SIZE = 1024
 
+# Number of threads generating thumbnails in `ContentStore.ingest_assets`
+THUMBNAIL_WORKERS = 4
+
+# Number of pieces of content saved together by `ContentStore.ingest_assets`
+INGEST_BATCH_SIZE = 20
+
+from collections import OrderedDict
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 import os
 import logging
 import StringIO
+import time
 from urlparse import urlparse, urlunparse, parse_qsl
 from urllib import urlencode
 
@@ -21,7 +31,7 @@ from PIL import Image
 
 class StaticContent(object):
     def __init__(self, loc, name, content_type, data, last_modified_at=None, thumbnail_location=None, import_path=None,
-                 length=None, locked=False):
+                 length=None, locked=False, content_digest=None):
         self.location = loc
         self.name = name  # a display string which can be edited, and thus not part of the location which needs to be fixed
         self.content_type = content_type
@@ -33,6 +43,8 @@ class StaticContent(object):
         # cycles
         self.import_path = import_path
         self.locked = locked
+        # a hash of the stored bytes (the GridFS md5), when the store provides one
+        self.content_digest = content_digest
 
     @property
     def is_thumbnail(self):
@@ -171,10 +183,10 @@ class StaticContent(object):
 
 class StaticContentStream(StaticContent):
     def __init__(self, loc, name, content_type, stream, last_modified_at=None, thumbnail_location=None, import_path=None,
-                 length=None, locked=False):
+                 length=None, locked=False, content_digest=None):
         super(StaticContentStream, self).__init__(loc, name, content_type, None, last_modified_at=last_modified_at,
                                                   thumbnail_location=thumbnail_location, import_path=import_path,
-                                                  length=length, locked=locked)
+                                                  length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
     def stream_data(self):
@@ -206,7 +218,8 @@ class StaticContentStream(StaticContent):
         self._stream.seek(0)
         content = StaticContent(self.location, self.name, self.content_type, self._stream.read(),
                                 last_modified_at=self.last_modified_at, thumbnail_location=self.thumbnail_location,
-                                import_path=self.import_path, length=self.length, locked=self.locked)
+                                import_path=self.import_path, length=self.length, locked=self.locked,
+                                content_digest=self.content_digest)
         return content
 
 
@@ -217,6 +230,13 @@ class ContentStore(object):
     def save(self, content):
         raise NotImplementedError
 
+    def save_many(self, contents):
+        """
+        Save each of `contents`, replacing any existing versions. Stores which can write in bulk
+        should override this.
+        """
+        return [self.save(content) for content in contents]
+
     def find(self, filename):
         raise NotImplementedError
 
@@ -249,51 +269,148 @@ class ContentStore(object):
         raise NotImplementedError
 
     def generate_thumbnail(self, content, tempfile_path=None):
-        thumbnail_content = None
-        # use a naming convention to associate originals with the thumbnail
-        thumbnail_name = StaticContent.generate_thumbnail_name(content.location.name)
-
-        thumbnail_file_location = StaticContent.compute_location(
-            content.location.course_key, thumbnail_name, is_thumbnail=True
-        )
-
-        # if we're uploading an image, then let's generate a thumbnail so that we can
-        # serve it up when needed without having to rescale on the fly
-        if content.content_type is not None and content.content_type.split('/')[0] == 'image':
+        thumbnail_content, thumbnail_file_location = make_thumbnail(content, tempfile_path)
+        if thumbnail_content is not None:
             try:
-                # use PIL to do the thumbnail generation (http://www.pythonware.com/products/pil/)
-                # My understanding is that PIL will maintain aspect ratios while restricting
-                # the max-height/width to be whatever you pass in as 'size'
-                # @todo: move the thumbnail size to a configuration setting?!?
-                if tempfile_path is None:
-                    im = Image.open(StringIO.StringIO(content.data))
-                else:
-                    im = Image.open(tempfile_path)
-
-                # I've seen some exceptions from the PIL library when trying to save palletted
-                # PNG files to JPEG. Per the google-universe, they suggest converting to RGB first.
-                im = im.convert('RGB')
-                size = 128, 128
-                im.thumbnail(size, Image.ANTIALIAS)
-                thumbnail_file = StringIO.StringIO()
-                im.save(thumbnail_file, 'JPEG')
-                thumbnail_file.seek(0)
-
-                # store this thumbnail as any other piece of content
-                thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
-                                                  'image/jpeg', thumbnail_file)
-
                 self.save(thumbnail_content)
-
             except Exception, e:
                 # log and continue as thumbnails are generally considered as optional
-                logging.exception(u"Failed to generate thumbnail for {0}. Exception: {1}".format(content.location, str(e)))
+                logging.exception(u"Failed to save thumbnail for {0}. Exception: {1}".format(content.location, str(e)))
+                thumbnail_content = None
 
         return thumbnail_content, thumbnail_file_location
 
+    def ingest_assets(self, contents, workers=THUMBNAIL_WORKERS, batch_size=INGEST_BATCH_SIZE):
+        """
+        Save many pieces of content, e.g. the static files of an imported course, with their thumbnails.
+
+        The contents are processed in batches of `batch_size`: the thumbnails of a batch are
+        generated by a pool of `workers` threads (PIL releases the GIL while decoding and resizing
+        images), and the batch is saved with its thumbnails by a single `save_many`.  The data of
+        the contents must be in memory, not streams.
+
+        Yields a (content, timing) pair for each piece of content once its batch is saved, where
+        timing is a dict with:
+            'thumbnail': the seconds taken to generate its thumbnail
+            'save': its share of the seconds taken to save its batch
+            'error': the exception raised saving it, or None
+        """
+        pool = ThreadPool(workers) if workers > 1 else None
+        contents = iter(contents)
+        try:
+            while True:
+                batch = list(islice(contents, batch_size))
+                if not batch:
+                    return
+                if pool is not None:
+                    thumbnails = pool.map(_timed_thumbnail, batch)
+                else:
+                    thumbnails = [_timed_thumbnail(content) for content in batch]
+
+                # later contents replace earlier ones at the same location, as if saved one by one
+                to_save = OrderedDict()
+                for content, (thumbnail_content, thumbnail_location, __) in zip(batch, thumbnails):
+                    if thumbnail_content is not None:
+                        content.thumbnail_location = thumbnail_location
+                        to_save.pop(thumbnail_location, None)
+                        to_save[thumbnail_location] = thumbnail_content
+                    to_save.pop(content.location, None)
+                    to_save[content.location] = content
+
+                start = time.time()
+                errors = self._save_batch(to_save.values())
+                save_seconds = (time.time() - start) / len(batch)
+
+                for content, (__, __, thumbnail_seconds) in zip(batch, thumbnails):
+                    yield content, {
+                        'thumbnail': thumbnail_seconds,
+                        'save': save_seconds,
+                        'error': errors.get(content.location),
+                    }
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _save_batch(self, contents):
+        """
+        Save `contents` with `save_many`, or one by one if that fails, and return the exceptions
+        raised saving any of them, by location.
+        """
+        try:
+            self.save_many(contents)
+            return {}
+        except Exception:  # pylint: disable=broad-except
+            logging.exception(u"Failed to save a batch of %d pieces of content; saving them one by one", len(contents))
+
+        errors = {}
+        for content in contents:
+            try:
+                self.save(content)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors[content.location] = exc
+        return errors
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
         an exception if unable to.
         """
         pass
+
+
+def make_thumbnail(content, tempfile_path=None):
+    """
+    Generate the thumbnail of `content`, without saving it.
+
+    Returns the thumbnail StaticContent, or None if `content` is not an image or its
+    thumbnail could not be generated, and the location of the thumbnail.
+    """
+    thumbnail_content = None
+    # use a naming convention to associate originals with the thumbnail
+    thumbnail_name = StaticContent.generate_thumbnail_name(content.location.name)
+
+    thumbnail_file_location = StaticContent.compute_location(
+        content.location.course_key, thumbnail_name, is_thumbnail=True
+    )
+
+    # if we're uploading an image, then let's generate a thumbnail so that we can
+    # serve it up when needed without having to rescale on the fly
+    if content.content_type is not None and content.content_type.split('/')[0] == 'image':
+        try:
+            # use PIL to do the thumbnail generation (http://www.pythonware.com/products/pil/)
+            # My understanding is that PIL will maintain aspect ratios while restricting
+            # the max-height/width to be whatever you pass in as 'size'
+            # @todo: move the thumbnail size to a configuration setting?!?
+            if tempfile_path is None:
+                im = Image.open(StringIO.StringIO(content.data))
+            else:
+                im = Image.open(tempfile_path)
+
+            # I've seen some exceptions from the PIL library when trying to save palletted
+            # PNG files to JPEG. Per the google-universe, they suggest converting to RGB first.
+            im = im.convert('RGB')
+            size = 128, 128
+            im.thumbnail(size, Image.ANTIALIAS)
+            thumbnail_file = StringIO.StringIO()
+            im.save(thumbnail_file, 'JPEG')
+
+            # store this thumbnail as any other piece of content
+            thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
+                                              'image/jpeg', thumbnail_file.getvalue())
+
+        except Exception, e:
+            # log and continue as thumbnails are generally considered as optional
+            logging.exception(u"Failed to generate thumbnail for {0}. Exception: {1}".format(content.location, str(e)))
+
+    return thumbnail_content, thumbnail_file_location
+
+
+def _timed_thumbnail(content):
+    """
+    Generate the thumbnail of `content` and return it with its location and the seconds taken;
+    used as the worker function of the thread pool in `ContentStore.ingest_assets`.
+    """
+    start = time.time()
+    thumbnail_content, thumbnail_location = make_thumbnail(content)
+    return thumbnail_content, thumbnail_location, time.time() - start
@@ -1,3 +1,18 @@
+"""
+MongoDB/GridFS backed content store.
+
+By default, the data of every asset is stored in its own GridFS file, whose `_id` is derived
+from the asset location.  In content-addressed mode (the `content_addressed` option), the data
+is stored once per distinct content, in a GridFS file of the `<bucket>.blobs` bucket found by the
+sha1 of the data, which counts its references.  The GridFS file of each asset then holds only
+the asset metadata and the `blob_id` of its data, so that copying assets, e.g. for a course
+rerun, writes no data, and saving content which is already stored writes no data either.
+
+Assets referencing blobs are read in either mode, so the mode can be switched at any time.
+"""
+import datetime
+import hashlib
+
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
@@ -19,11 +34,16 @@ from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 class MongoContentStore(ContentStore):
 
     # pylint: disable=unused-argument
-    def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None, **kwargs):
+    def __init__(
+            self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None,
+            content_addressed=False, **kwargs
+    ):
         """
         Establish the connection with the mongo backend and connect to the collections
 
         :param collection: ignores but provided for consistency w/ other doc_store_config patterns
+        :param content_addressed: whether to store the data of new content once per distinct content,
+            in reference counted blobs (see the module docstring)
         """
         logging.debug('Using MongoDB for static content serving at host={0} port={1} db={2}'.format(host, port, db))
         _db = pymongo.database.Database(
@@ -42,6 +62,11 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.fs_chunks = _db[bucket + ".chunks"]
+
+        self.content_addressed = content_addressed
+        self.blob_fs = gridfs.GridFS(_db, bucket + ".blobs")
+        self.blob_files = _db[bucket + ".blobs.files"]
 
     def close_connections(self):
         """
@@ -65,7 +90,49 @@ class MongoContentStore(ContentStore):
         # the location as the _id, we must delete before adding (there's no replace method in gridFS)
         self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
 
+        return self._write_content(content, content_id, content_son)
+
+    def save_many(self, contents):
+        """
+        Save several pieces of content at once. Any previous versions are removed with a single
+        bulk delete of their files and chunks rather than one delete per piece of content.
+        """
+        contents = list(contents)
+        db_keys = [self.asset_db_key(content.location) for content in contents]
+        if not db_keys:
+            return contents
+
+        content_ids = [content_id for content_id, __ in db_keys]
+        blob_ids = [
+            entry['blob_id']
+            for entry in self.fs_files.find({'_id': {'$in': content_ids}, 'blob_id': {'$exists': True}}, ['blob_id'])
+        ]
+        # same order of operations as GridFS.delete: files first, so no reader finds a file without chunks
+        self.fs_files.remove({'_id': {'$in': content_ids}})
+        self.fs_chunks.remove({'files_id': {'$in': content_ids}})
+        for blob_id in blob_ids:
+            self._release_blob(blob_id)
+
+        for content, (content_id, content_son) in zip(contents, db_keys):
+            self._write_content(content, content_id, content_son)
+        return contents
+
+    def _write_content(self, content, content_id, content_son):
+        """
+        Write `content` to GridFS under `content_id`, which must not already exist.
+        """
         thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None
+        if self.content_addressed:
+            self._insert_blob_reference(
+                content_id, self._store_blob(content.data),
+                filename=unicode(content.location), contentType=content.content_type,
+                displayname=content.name, content_son=content_son,
+                thumbnail_location=thumbnail_location,
+                import_path=content.import_path,
+                locked=getattr(content, 'locked', False)
+            )
+            return content
+
         with self.fs.new_file(_id=content_id, filename=unicode(content.location), content_type=content.content_type,
                               displayname=content.name, content_son=content_son,
                               thumbnail_location=thumbnail_location,
@@ -80,11 +147,89 @@ class MongoContentStore(ContentStore):
 
         return content
 
+    def _store_blob(self, data):
+        """
+        Add a reference to the blob holding `data` (a string or an iterable of strings), storing it
+        if no blob holds the same data yet, and return the blob's GridFS file document.
+        """
+        if not hasattr(data, '__iter__'):
+            blob = self._reference_blob(hashlib.sha1(data).hexdigest())
+            if blob is not None:
+                return blob
+            data = [data]
+
+        digest = hashlib.sha1()
+        with self.blob_fs.new_file(refcount=1) as fp:
+            for chunk in data:
+                fp.write(chunk)
+                digest.update(chunk)
+            fp.sha1 = digest.hexdigest()
+
+        # data streamed in is only known to be a duplicate once written; release the new blob
+        # rather than delete it, as a concurrent save of the same data may have referenced it
+        blob = self._reference_blob(fp.sha1, exclude_id=fp._id)
+        if blob is not None:
+            self._release_blob(fp._id)
+            return blob
+        return self.blob_files.find_one({'_id': fp._id})
+
+    def _reference_blob(self, sha1, exclude_id=None):
+        """
+        Add a reference to a live blob whose data has the digest `sha1`, and return its GridFS file
+        document, or None if there is no such blob.
+        """
+        query = {'sha1': sha1, 'refcount': {'$gt': 0}}
+        if exclude_id is not None:
+            query['_id'] = {'$ne': exclude_id}
+        return self.blob_files.find_and_modify(query, {'$inc': {'refcount': 1}}, new=True)
+
+    def _release_blob(self, blob_id):
+        """
+        Remove a reference to the blob `blob_id`, and delete the blob if it was the last one.
+        """
+        blob = self.blob_files.find_and_modify({'_id': blob_id}, {'$inc': {'refcount': -1}}, new=True)
+        if blob is not None and blob['refcount'] <= 0:
+            self.blob_fs.delete(blob_id)
+
+    def _insert_blob_reference(self, content_id, blob, **attrs):
+        """
+        Insert the GridFS file document of an asset under `content_id`, with the metadata `attrs`,
+        whose data is held by `blob` (a blob's GridFS file document, already referenced for it).
+        """
+        entry = dict(
+            attrs,
+            _id=content_id,
+            blob_id=blob['_id'],
+            length=blob['length'],
+            chunkSize=blob['chunkSize'],
+            md5=blob.get('md5'),
+            uploadDate=datetime.datetime.utcnow(),
+        )
+        self.fs_files.insert(entry)
+
+    def _open_data(self, fp):
+        """
+        Return the GridOut to read the data of the asset whose GridFS file is `fp`.
+        """
+        blob_id = getattr(fp, 'blob_id', None)
+        if blob_id is None:
+            return fp
+        return self.blob_fs.get(blob_id)
+
+    def _delete_entry(self, content_id, blob_id=None):
+        """
+        Delete the GridFS file of an asset, and release the blob holding its data if any.
+        """
+        self.fs.delete(content_id)
+        if blob_id is not None:
+            self._release_blob(blob_id)
+
     def delete(self, location_or_id):
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
+        entry = self.fs_files.find_one({'_id': location_or_id}, ['blob_id'])
         # Deletes of non-existent files are considered successful
-        self.fs.delete(location_or_id)
+        self._delete_entry(location_or_id, entry.get('blob_id') if entry else None)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
@@ -99,10 +244,11 @@ class MongoContentStore(ContentStore):
                         thumbnail_location[4]
                     )
                 return StaticContentStream(
-                    location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
+                    location, fp.displayname, fp.content_type, self._open_data(fp), last_modified_at=fp.uploadDate,
                     thumbnail_location=thumbnail_location,
                     import_path=getattr(fp, 'import_path', None),
-                    length=fp.length, locked=getattr(fp, 'locked', False)
+                    length=fp.length, locked=getattr(fp, 'locked', False),
+                    content_digest=getattr(fp, 'md5', None)
                 )
             else:
                 with self.fs.get(content_id) as fp:
@@ -113,10 +259,12 @@ class MongoContentStore(ContentStore):
                             thumbnail_location[4]
                         )
                     return StaticContent(
-                        location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
+                        location, fp.displayname, fp.content_type, self._open_data(fp).read(),
+                        last_modified_at=fp.uploadDate,
                         thumbnail_location=thumbnail_location,
                         import_path=getattr(fp, 'import_path', None),
-                        length=fp.length, locked=getattr(fp, 'locked', False)
+                        length=fp.length, locked=getattr(fp, 'locked', False),
+                        content_digest=getattr(fp, 'md5', None)
                     )
         except NoFile:
             if throw_on_not_found:
@@ -163,7 +311,7 @@ class MongoContentStore(ContentStore):
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
             for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key', 'blob_id']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
         with open(assets_policy_file, 'w') as f:
@@ -192,7 +340,7 @@ class MongoContentStore(ContentStore):
             items = self.fs_files.find(query)
             assets_to_delete = assets_to_delete + items.count()
             for asset in items:
-                self.fs.delete(asset[prefix])
+                self._delete_entry(asset[prefix], asset.get('blob_id'))
 
             self.fs_files.remove(query)
         return assets_to_delete
@@ -271,7 +419,7 @@ class MongoContentStore(ContentStore):
         :param location:  a c4x asset location
         """
         for attr in attr_dict.iterkeys():
-            if attr in ['_id', 'md5', 'uploadDate', 'length']:
+            if attr in ['_id', 'md5', 'uploadDate', 'length', 'blob_id']:
                 raise AttributeError("{} is a protected attribute.".format(attr))
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
@@ -299,14 +447,16 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        Assets whose data is held by a blob are copied as new references to the blob, without
+        reading any data.  Otherwise, this implementation fairly expensively copies all of the
+        data, into a blob in content-addressed mode.
         """
         source_query = query_for_course(source_course_key)
         # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
             asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
+            # asset_key is changed into the destination key below
+            source_id = asset_key if isinstance(asset_key, basestring) else SON(asset_key)
             if isinstance(asset_key, basestring):
                 asset_key = AssetKey.from_string(asset_key)
                 __, asset_key = self.asset_db_key(asset_key)
@@ -322,10 +472,8 @@ class MongoContentStore(ContentStore):
                     dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
                 )
 
-            self.fs.put(
-                source_content.read(),
-                _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-                displayname=asset['displayname'], content_son=asset_key,
+            attrs = dict(
+                filename=asset['filename'], displayname=asset['displayname'], content_son=asset_key,
                 # thumbnail is not technically correct but will be functionally correct as the code
                 # only looks at the name which is not course relative.
                 thumbnail_location=asset['thumbnail_location'],
@@ -334,6 +482,23 @@ class MongoContentStore(ContentStore):
                 locked=asset.get('locked', False)
             )
 
+            if 'blob_id' in asset:
+                # the source asset holds a reference, so the blob is alive
+                self.blob_files.update({'_id': asset['blob_id']}, {'$inc': {'refcount': 1}})
+                blob = dict(
+                    _id=asset['blob_id'], length=asset['length'], chunkSize=asset['chunkSize'], md5=asset.get('md5')
+                )
+                self._insert_blob_reference(asset_id, blob, contentType=asset['contentType'], **attrs)
+                continue
+
+            source_content = self.fs.get(source_id)
+            if self.content_addressed:
+                self._insert_blob_reference(
+                    asset_id, self._store_blob(source_content), contentType=asset['contentType'], **attrs
+                )
+            else:
+                self.fs.put(source_content.read(), _id=asset_id, content_type=asset['contentType'], **attrs)
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all assets identified via this course_key. Dangerous operation which may remove assets
@@ -344,7 +509,7 @@ class MongoContentStore(ContentStore):
         matching_assets = self.fs_files.find(course_query)
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
-            self.fs.delete(asset_key)
+            self._delete_entry(asset_key, asset.get('blob_id'))
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -412,6 +577,8 @@ class MongoContentStore(ContentStore):
             [('content_son.org', pymongo.ASCENDING), ('content_son.course', pymongo.ASCENDING), ('display_name', pymongo.ASCENDING)],
             sparse=True
         )
+        # Index needed by `_store_blob` to find the blob holding some data
+        self.blob_files.create_index([('sha1', pymongo.ASCENDING)])
 
 
 def query_for_course(course_key, category=None):
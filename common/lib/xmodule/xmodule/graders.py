@@ -6,6 +6,8 @@ import sys
 
 from collections import namedtuple
 
+import numpy
+
 log = logging.getLogger("edx.courseware")
 
 # This is a tuple for holding scores, either from problems or sections.
@@ -46,6 +48,104 @@ def aggregate_scores(scores, section_name="summary"):
     return all_total, graded_total
 
 
+class ScoreMatrix(object):
+    """
+    The graded section scores of many students at once, for `batch_grade`.
+
+    section_formats: the format of each graded section (column), in course order
+    section_names: the name of each graded section (column)
+    earned, possible: arrays of shape (students, sections). As in the grade sheets
+        built for `CourseGrader.grade`, a section whose possible score is not positive
+        is left out of that student's grade sheet.
+    """
+    def __init__(self, section_formats, section_names, earned, possible):
+        self.section_formats = list(section_formats)
+        self.section_names = list(section_names)
+        self.earned = numpy.asarray(earned, dtype=float)
+        self.possible = numpy.asarray(possible, dtype=float)
+        if self.earned.shape != self.possible.shape or self.earned.shape[1:] != (len(self.section_formats),):
+            raise ValueError("earned and possible must both have one column per section")
+
+    @property
+    def num_students(self):
+        """
+        The number of students (rows) in the matrix.
+        """
+        return self.earned.shape[0]
+
+    def columns(self, section_format):
+        """
+        Returns the indices of the sections with format `section_format`, in course order.
+        """
+        return [index for index, fmt in enumerate(self.section_formats) if fmt == section_format]
+
+    def percents(self, columns):
+        """
+        Returns (percent, present) arrays of shape (students, len(columns)): the
+        earned/possible fraction of each section, and whether it is in the student's
+        grade sheet. Percents of absent sections are 0.
+        """
+        earned = self.earned[:, columns]
+        possible = self.possible[:, columns]
+        present = possible > 0
+        percent = numpy.where(present, earned / numpy.where(present, possible, 1.0), 0.0)
+        return percent, present
+
+    def grade_sheet(self, student_index):
+        """
+        Returns the grade sheet of one student, as passed to `CourseGrader.grade`.
+        """
+        grade_sheet = {}
+        for column, (section_format, section_name) in enumerate(zip(self.section_formats, self.section_names)):
+            possible = self.possible[student_index, column]
+            if possible > 0:
+                grade_sheet.setdefault(section_format, []).append(
+                    Score(self.earned[student_index, column], possible, True, section_name, None)
+                )
+        return grade_sheet
+
+
+def batch_grade(grader, score_matrix, grade_cutoffs=None):
+    """
+    Grade every student of a ScoreMatrix with a course grader in one pass.
+
+    This computes the same percentages as calling `grader.grade` on each student's
+    grade sheet, which remains the reference implementation, but with array operations
+    instead of per-student loops. Percentages are rounded to whole percents as the LMS
+    does before assigning letter grades.
+
+    Returns a dict with:
+        percent: array of the final percentage of each student
+        grade: list of the letter grade of each student (None when failing), if
+            grade_cutoffs is given
+        grade_breakdown: list of {'category', 'percent'} dicts whose percent is an array
+            of each student's weighted contribution of that category
+    """
+    result = grader.batch_grade(score_matrix)
+    percent = numpy.floor(result['percent'] * 100 + 0.05 + 0.5) / 100
+    summary = {
+        'percent': percent,
+        'grade_breakdown': result.get('grade_breakdown', []),
+    }
+    if grade_cutoffs is not None:
+        summary['grade'] = letter_grades(grade_cutoffs, percent)
+    return summary
+
+
+def letter_grades(grade_cutoffs, percents):
+    """
+    Returns the letter grade for each of an array of percentages, as defined by
+    `grade_cutoffs`, a dict mapping each grade to the lowest percentage that earns it.
+    Percentages below every cutoff get None.
+    """
+    grades = numpy.empty(len(percents), dtype=object)
+    grades.fill(None)
+    # Assign from the lowest cutoff up, so that the highest grade earned wins
+    for letter in sorted(grade_cutoffs, key=lambda x: grade_cutoffs[x]):
+        grades[numpy.asarray(percents) >= grade_cutoffs[letter]] = letter
+    return list(grades)
+
+
 def invalid_args(func, argdict):
     """
     Given a function and a dictionary of arguments, returns a set of arguments
@@ -160,6 +260,21 @@ class CourseGrader(object):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def batch_grade(self, score_matrix):
+        """
+        Given a ScoreMatrix, return a dict whose 'percent' is an array of the percentage
+        `grade` computes for each student. Graders may add a 'grade_breakdown' of arrays.
+
+        This default grades each student separately; subclasses override it with
+        vectorized equivalents of `grade`.
+        """
+        return {
+            'percent': numpy.array([
+                self.grade(score_matrix.grade_sheet(index))['percent']
+                for index in xrange(score_matrix.num_students)
+            ], dtype=float)
+        }
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -199,6 +314,18 @@ class WeightedSubsectionsGrader(CourseGrader):
                 'section_breakdown': section_breakdown,
                 'grade_breakdown': grade_breakdown}
 
+    def batch_grade(self, score_matrix):
+        total_percent = numpy.zeros(score_matrix.num_students)
+        grade_breakdown = []
+
+        for subgrader, category, weight in self.sections:
+            weighted_percent = subgrader.batch_grade(score_matrix)['percent'] * weight
+            total_percent += weighted_percent
+            grade_breakdown.append({'percent': weighted_percent, 'category': category})
+
+        return {'percent': total_percent,
+                'grade_breakdown': grade_breakdown}
+
 
 class SingleSectionGrader(CourseGrader):
     """
@@ -249,6 +376,20 @@ class SingleSectionGrader(CourseGrader):
                 #No grade_breakdown here
                 }
 
+    def batch_grade(self, score_matrix):
+        columns = [
+            column for column in score_matrix.columns(self.type)
+            if score_matrix.section_names[column] == self.name
+        ]
+        if not columns:
+            return {'percent': numpy.zeros(score_matrix.num_students)}
+
+        percent, present = score_matrix.percents(columns)
+        # Like `grade`, use the first matching section in each student's grade sheet
+        first_present = numpy.argmax(present, axis=1)
+        rows = numpy.arange(score_matrix.num_students)
+        return {'percent': numpy.where(present.any(axis=1), percent[rows, first_present], 0.0)}
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -390,3 +531,27 @@ class AssignmentFormatGrader(CourseGrader):
                 'section_breakdown': breakdown,
                 #No grade_breakdown here
                 }
+
+    def batch_grade(self, score_matrix):
+        percent, present = score_matrix.percents(score_matrix.columns(self.type))
+        num_present = present.sum(axis=1)
+        # Each student is graded on max(min_count, sections in their grade sheet)
+        # assignments, the missing ones counting as 0.
+        count = numpy.maximum(num_present, self.min_count)
+
+        # Lay out each student's assignment percents followed by their placeholder
+        # zeros, padding the rows to the same width with +inf so that they sort last.
+        placeholders = numpy.arange(self.min_count)[numpy.newaxis, :] < (count - num_present)[:, numpy.newaxis]
+        marks = numpy.hstack([
+            numpy.where(present, percent, numpy.inf),
+            numpy.where(placeholders, 0.0, numpy.inf),
+        ])
+        marks.sort(axis=1)
+
+        # Drop the lowest drop_count marks, and average the rest
+        kept = marks[:, self.drop_count:]
+        kept_total = numpy.where(numpy.isfinite(kept), kept, 0.0).sum(axis=1)
+        kept_count = count - self.drop_count
+        total_percent = numpy.where(kept_count > 0, kept_total / numpy.maximum(kept_count, 1), 0.0)
+
+        return {'percent': total_percent}
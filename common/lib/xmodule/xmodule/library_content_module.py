@@ -5,7 +5,6 @@ LibraryContent: The XBlock used to include blocks from a library in a course.
 import json
 from lxml import etree
 from copy import copy
-from capa.responsetypes import registry
 from gettext import ngettext
 from lazy import lazy
 
@@ -41,6 +40,9 @@ def _get_capa_types():
     """
     Gets capa types tags and labels
     """
+    # capa's response types are only imported once a problem type list is needed
+    from capa.responsetypes import registry
+
     capa_types = {tag: _get_human_name(registry.get_class_for_tag(tag)) for tag in registry.registered_tags()}
 
     return [{'value': ANY_CAPA_TYPE_VALUE, 'display_name': _('Any Type')}] + sorted([
@@ -97,7 +99,7 @@ class LibraryContentFields(object):
         display_name=_("Problem Type"),
         help=_('Choose a problem type to fetch from the library. If "Any Type" is selected no filtering is applied.'),
         default=ANY_CAPA_TYPE_VALUE,
-        values=_get_capa_types(),
+        values=_get_capa_types,
         scope=Scope.settings,
     )
     filters = String(default="")  # TBD
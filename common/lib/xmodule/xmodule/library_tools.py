@@ -7,7 +7,6 @@ from search.search_engine_base import SearchEngine
 from xmodule.library_content_module import ANY_CAPA_TYPE_VALUE
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.capa_module import CapaDescriptor
 
 
 def normalize_key_for_search(library_key):
@@ -94,6 +93,8 @@ class LibraryToolsService(object):
 
     def _problem_type_filter(self, library, capa_type):
         """ Filters library children by capa type"""
+        from xmodule.capa_module import CapaDescriptor  # imported on first use: loading capa is expensive
+
         search_engine = SearchEngine.get_search_engine(index="library_index")
         if search_engine:
             filter_clause = {
@@ -114,6 +115,8 @@ class LibraryToolsService(object):
         if usage_key.block_type != "problem":
             return False
 
+        from xmodule.capa_module import CapaDescriptor  # imported on first use: loading capa is expensive
+
         descriptor = self.store.get_item(usage_key, depth=0)
         assert isinstance(descriptor, CapaDescriptor)
         return capa_type in descriptor.problem_types
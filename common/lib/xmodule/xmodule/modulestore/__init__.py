@@ -306,6 +306,12 @@ class EditInfo(object):
     """
     Encapsulates the editing info of a block.
     """
+    # Every block of every loaded structure has one of these, so keep them compact.
+    __slots__ = (
+        'previous_version', 'update_version', 'source_version', 'edited_on', 'edited_by',
+        'original_usage', 'original_usage_version', '_subtree_edited_on', '_subtree_edited_by',
+    )
+
     def __init__(self, **kwargs):
         self.from_storable(kwargs)
 
@@ -369,12 +375,19 @@ class EditInfo(object):
         )  # pylint: disable=bad-continuation
 
 
+# Shared by every BlockData which has no defaults: replace it rather than changing it in place.
+_EMPTY_DEFAULTS = {}
+
+
 class BlockData(object):
     """
     Wrap the block data in an object instead of using a straight Python dictionary.
     Allows the storing of meta-information about a structure that doesn't persist along with
     the structure itself.
     """
+    # Every block of every loaded structure has one of these, so keep them compact.
+    __slots__ = ('fields', 'block_type', 'definition', 'defaults', 'edit_info', 'definition_loaded')
+
     def __init__(self, **kwargs):
         # Has the definition been loaded?
         self.definition_loaded = False
@@ -408,7 +421,7 @@ class BlockData(object):
 
         # Scope.settings default values copied from a template block (used e.g. when
         # blocks are copied from a library to a course)
-        self.defaults = block_data.get('defaults', {})
+        self.defaults = block_data.get('defaults') or _EMPTY_DEFAULTS
 
         # EditInfo object containing all versioning/editing data.
         self.edit_info = EditInfo(**block_data.get('edit_info', {}))
@@ -790,8 +803,8 @@ class ModuleStoreRead(ModuleStoreAssetBase):
             # If an XBlock is passed-in, just match its fields.
             xblock, fields = (block, block.fields)
         elif isinstance(block, BlockData):
-            # BlockData is an object - compare its attributes in dict form.
-            xblock, fields = (None, block.__dict__)
+            # BlockData is an object with slots - compare its attributes in dict form.
+            xblock, fields = (None, dict((name, getattr(block, name)) for name in BlockData.__slots__))
         else:
             xblock, fields = (None, block)
 
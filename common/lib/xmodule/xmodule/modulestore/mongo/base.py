@@ -65,9 +65,21 @@ SORT_REVISION_FAVOR_DRAFT = ('_id.revision', pymongo.DESCENDING)
 # sort order that returns PUBLISHED items first
 SORT_REVISION_FAVOR_PUBLISHED = ('_id.revision', pymongo.ASCENDING)
 
-BLOCK_TYPES_WITH_CHILDREN = list(set(
-    name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
-))
+_BLOCK_TYPES_WITH_CHILDREN = []
+
+
+def block_types_with_children():
+    """
+    Return the names of the installed XBlock types which can have children.
+
+    Finding them imports every installed XBlock class, so it is done on first
+    use rather than when this module is imported.
+    """
+    if not _BLOCK_TYPES_WITH_CHILDREN:
+        _BLOCK_TYPES_WITH_CHILDREN.extend(set(
+            name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
+        ))
+    return _BLOCK_TYPES_WITH_CHILDREN
 
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
@@ -677,7 +689,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
-            ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
+            ('_id.category', {'$in': block_types_with_children()})
         ])
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
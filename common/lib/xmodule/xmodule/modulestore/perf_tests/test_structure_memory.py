@@ -0,0 +1,148 @@
+"""
+Memory benchmark for split modulestore structures.
+
+Compares the memory taken by a decoded synthetic course structure against the same
+blocks held as plain dicts of dicts. Run it directly to print the numbers:
+
+    python -m xmodule.modulestore.perf_tests.test_structure_memory [block_count]
+"""
+import copy
+import datetime
+import gc
+import sys
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+
+# Number of blocks in the synthetic course
+BLOCK_COUNT = 10000
+
+# Number of children of each chapter, sequential and vertical in the synthetic course
+FANOUT = 10
+
+
+def make_mongo_structure(block_count=BLOCK_COUNT):
+    """
+    Return a structure document, as read from mongo, for a course of about `block_count` blocks:
+    chapters of sequentials of verticals of problems.
+    """
+    version = ObjectId()
+    edited_on = datetime.datetime(2015, 1, 1)
+    blocks = []
+
+    def add_block(block_type, block_id, children=()):
+        """ Add a block document and return its [block_type, block_id] reference """
+        fields = {'display_name': u'{} {}'.format(block_type, block_id)}
+        if children:
+            fields['children'] = [list(child) for child in children]
+        blocks.append({
+            'block_type': block_type,
+            'block_id': block_id,
+            'definition': ObjectId(),
+            'fields': fields,
+            'defaults': {},
+            'edit_info': {
+                'previous_version': None,
+                'update_version': version,
+                'source_version': None,
+                'edited_on': edited_on,
+                'edited_by': 1,
+                'original_usage': None,
+                'original_usage_version': None,
+            },
+        })
+        return [block_type, block_id]
+
+    per_chapter = 1 + FANOUT * (1 + FANOUT * (1 + FANOUT))
+    chapters = []
+    for chapter in range(max(1, block_count // per_chapter)):
+        sequentials = []
+        for sequential in range(FANOUT):
+            verticals = []
+            for vertical in range(FANOUT):
+                problems = [
+                    add_block(u'problem', u'p{}_{}_{}_{}'.format(chapter, sequential, vertical, problem))
+                    for problem in range(FANOUT)
+                ]
+                verticals.append(add_block(u'vertical', u'v{}_{}_{}'.format(chapter, sequential, vertical), problems))
+            sequentials.append(add_block(u'sequential', u's{}_{}'.format(chapter, sequential), verticals))
+        chapters.append(add_block(u'chapter', u'c{}'.format(chapter), sequentials))
+    root = add_block(u'course', u'course', chapters)
+
+    return {'_id': version, 'root': root, 'blocks': blocks}
+
+
+def dict_blocks(mongo_structure):
+    """
+    Return the blocks of `mongo_structure` as plain dicts of dicts keyed by BlockKey,
+    with a new BlockKey for every reference to a block.
+    """
+    blocks = {}
+    for block in copy.deepcopy(mongo_structure['blocks']):
+        if 'children' in block['fields']:
+            block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
+        block['definition_loaded'] = False
+        blocks[BlockKey(block['block_type'], block.pop('block_id'))] = block
+    return blocks
+
+
+def deep_size(root):
+    """
+    Return the total size in bytes of `root` and every object it refers to, counting shared objects once.
+    """
+    seen = set()
+    pending = [root]
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return size
+
+
+def measure(block_count=BLOCK_COUNT):
+    """
+    Return the number of blocks and the sizes of their dict and decoded representations.
+    """
+    mongo_structure = make_mongo_structure(block_count)
+    dict_size = deep_size(dict_blocks(mongo_structure))
+    structure = structure_from_mongo(mongo_structure)
+    # the blocks are decoded on first access
+    for block in structure['blocks'].itervalues():
+        block.fields  # pylint: disable=pointless-statement
+    return len(structure['blocks']), dict_size, deep_size(structure['blocks'])
+
+
+class StructureMemoryTest(unittest.TestCase):
+    """
+    Checks that decoded structures are more compact than dicts of dicts.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def test_decoded_structure_is_compact(self):
+        block_count, dict_size, decoded_size = measure()
+        self.assertGreaterEqual(block_count, BLOCK_COUNT)
+        self.assertLess(decoded_size, dict_size * 0.8)
+
+    def test_block_keys_shared(self):
+        structure = structure_from_mongo(make_mongo_structure(FANOUT ** 3))
+        blocks = structure['blocks']
+        keys = {key: key for key in blocks}
+        self.assertIs(keys[structure['root']], structure['root'])
+        for block in blocks.itervalues():
+            for child in block.fields.get('children', []):
+                self.assertIs(keys[child], child)
+
+
+if __name__ == '__main__':
+    COUNT, DICT_SIZE, DECODED_SIZE = measure(int(sys.argv[1]) if len(sys.argv) > 1 else BLOCK_COUNT)
+    print "{} blocks: {:.1f}MB as dicts, {:.1f}MB decoded ({:.0%})".format(
+        COUNT, DICT_SIZE / 1048576.0, DECODED_SIZE / 1048576.0, float(DECODED_SIZE) / DICT_SIZE
+    )
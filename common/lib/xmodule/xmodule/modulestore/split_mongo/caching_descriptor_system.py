@@ -87,6 +87,12 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 parent_map[child] = block_key
         return parent_map
 
+    def _get_parent_key(self, block_key):
+        """
+        Return the BlockKey of the parent of the block, or None if it has none.
+        """
+        return self._parent_map.get(block_key)
+
     @contract(usage_key="BlockUsageLocator | BlockKey", course_entry_override="CourseEnvelope | None")
     def _load_item(self, usage_key, course_entry_override=None, **kwargs):
         """
@@ -201,8 +207,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         converted_fields = convert_fields(block_data.fields)
         converted_defaults = convert_fields(block_data.defaults)
-        if block_key in self._parent_map:
-            parent_key = self._parent_map[block_key]
+        parent_key = self._get_parent_key(block_key)
+        if parent_key is not None:
             parent = course_key.make_usage_key(parent_key.type, parent_key.id)
         else:
             parent = None
@@ -334,3 +340,92 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         block_data.edit_info._subtree_edited_on = max_date
         block_data.edit_info._subtree_edited_by = max_date_by
+
+
+class ProjectedDescriptorSystem(CachingDescriptorSystem):
+    """
+    A CachingDescriptorSystem over only some of the blocks of a course version.
+
+    course_entry.structure has the fields of the structure, but only the blocks read so far:
+    the blocks it needs, and their parents, are read from the database as they are needed,
+    without reading the whole structure.
+    """
+    def __init__(self, modulestore, course_entry, default_class, module_data, lazy, **kwargs):
+        super(ProjectedDescriptorSystem, self).__init__(
+            modulestore, course_entry, default_class, module_data, lazy, **kwargs
+        )
+        # The parent of each block whose parent is known, None if it has none
+        self._parent_keys = {course_entry.structure['root']: None}
+
+    def _add_blocks(self, blocks):
+        """
+        Add the blocks read from the database to the structure, and record them as the
+        parents of their children, keeping the blocks which were already read.
+        """
+        structure_blocks = self.course_entry.structure['blocks']
+        for block_key, block in blocks.iteritems():
+            if block_key in structure_blocks:
+                continue
+            structure_blocks[block_key] = block
+            for child in block.fields.get('children', []):
+                self._parent_keys[child] = block_key
+
+    def fetch_blocks(self, block_keys):
+        """
+        Read those of the blocks ``block_keys`` which have not been read yet.
+        """
+        blocks = self.course_entry.structure['blocks']
+        missing = [block_key for block_key in set(block_keys) if block_key not in blocks]
+        if missing:
+            self._add_blocks(
+                self.modulestore.db_connection.get_structure_blocks(self.course_entry.structure['_id'], missing)
+            )
+
+    def fetch_descendants(self, block_keys, depth):
+        """
+        Read the blocks ``block_keys`` and their descendants out to ``depth``
+        (0 => these blocks only, 1 => these blocks and their children, etc...; None => all
+        descendants), reading each level of descendants with one query.
+        """
+        blocks = self.course_entry.structure['blocks']
+        while block_keys:
+            self.fetch_blocks(block_keys)
+            if depth == 0:
+                return
+            if depth is not None:
+                depth -= 1
+            block_keys = [
+                child
+                for block_key in block_keys if block_key in blocks
+                for child in blocks[block_key].fields.get('children', [])
+            ]
+
+    def _get_parent_key(self, block_key):
+        """
+        Return the BlockKey of the parent of the block, reading the parent if it is not known yet.
+        """
+        if isinstance(block_key.id, LocalId):
+            # in-memory blocks aren't in the stored structure
+            return None
+        if block_key not in self._parent_keys:
+            parent = self.modulestore.db_connection.find_parent_block(self.course_entry.structure['_id'], block_key)
+            self._add_blocks(parent)
+            self._parent_keys.setdefault(block_key, None)
+        return self._parent_keys[block_key]
+
+    def get_module_data(self, block_key, course_key):
+        """
+        Get block from module_data, reading it if it hasn't been read yet, along with its
+        siblings which are likely to be needed next, e.g. by get_children.
+
+        Raises:
+            ItemNotFoundError if block is not in the structure
+        """
+        blocks = self.course_entry.structure['blocks']
+        if block_key not in self.module_data and block_key not in blocks:
+            parent_key = self._parent_keys.get(block_key)
+            if parent_key in blocks:
+                self.fetch_blocks([block_key] + blocks[parent_key].fields.get('children', []))
+            else:
+                self.fetch_blocks([block_key])
+        return super(ProjectedDescriptorSystem, self).get_module_data(block_key, course_key)
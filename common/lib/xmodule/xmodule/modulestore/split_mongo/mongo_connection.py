@@ -8,6 +8,7 @@ import pymongo
 # Import this just to export it
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
+import contracts
 from contracts import check, new_contract
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
@@ -19,6 +20,47 @@ import pytz
 new_contract('BlockData', BlockData)
 
 
+def _validate_structures():
+    """
+    Return whether structures are checked against their contracts as they are decoded
+    and encoded, i.e. unless contracts are disabled, as they are in production.
+    """
+    return not contracts.all_disabled()
+
+
+class LazyBlockData(BlockData):
+    """
+    BlockData decoded from its mongo document on first access to any of its fields, so
+    that reading a few blocks of a large structure doesn't pay for decoding all of them.
+    """
+    __slots__ = ('_source',)
+
+    def __init__(self, document, block_key):  # pylint: disable=super-init-not-called
+        self.definition_loaded = False
+        # The document to decode, and the function returning the BlockKey of a child
+        self._source = (document, block_key)
+
+    def __getattr__(self, name):
+        # Only called for unset slots, i.e. until the block is decoded
+        if name not in BlockData.__slots__ or self._source is None:
+            raise AttributeError(name)
+        document, block_key = self._source
+        self._source = None
+        fields = document.get('fields', {})
+        if 'children' in fields:
+            fields['children'] = [block_key(*child) for child in fields['children']]
+        # keep the fields which were set before the block was decoded
+        assigned = [(slot, getattr(self, slot)) for slot in BlockData.__slots__ if hasattr(self, slot)]
+        self.from_storable(document)
+        for slot, value in assigned:
+            setattr(self, slot, value)
+        return getattr(self, name)
+
+    def __getstate__(self):
+        # Copies and pickles are of the decoded block
+        return None, dict((name, getattr(self, name)) for name in BlockData.__slots__)
+
+
 def structure_from_mongo(structure):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -26,24 +68,70 @@ def structure_from_mongo(structure):
     Converts 'root' from [block_type, block_id] to BlockKey.
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
+
+    Each block's BlockKey is created once and shared by the 'blocks' map, 'root' and the
+    'children' which refer to it, as are the block type strings, to keep large structures compact.
+
+    The blocks are LazyBlockData, only decoded when first used.  The structure is only
+    checked against its contracts when contracts are enabled.
     """
-    check('seq[2]', structure['root'])
-    check('list(dict)', structure['blocks'])
-    for block in structure['blocks']:
-        if 'children' in block['fields']:
-            check('list(list[2])', block['fields']['children'])
+    if _validate_structures():
+        check('seq[2]', structure['root'])
+        check('list(dict)', structure['blocks'])
+        for block in structure['blocks']:
+            if 'children' in block['fields']:
+                check('list(list[2])', block['fields']['children'])
 
-    structure['root'] = BlockKey(*structure['root'])
-    new_blocks = {}
-    for block in structure['blocks']:
-        if 'children' in block['fields']:
-            block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-        new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-    structure['blocks'] = new_blocks
+    block_key = _block_key_factory()
+    structure['root'] = block_key(*structure['root'])
+    structure['blocks'] = blocks_from_mongo(structure['blocks'], block_key)
 
     return structure
 
 
+def _block_key_factory():
+    """
+    Return a function returning the BlockKey for (block_type, block_id), which creates
+    each BlockKey and block type string only once.
+    """
+    if _validate_structures():
+        new_block_key = lambda key: BlockKey(*key)
+    else:
+        # skip the contract on BlockKey.__new__
+        new_block_key = BlockKey._make  # pylint: disable=protected-access
+
+    block_types = {}
+    block_keys = {}
+
+    def block_key(block_type, block_id):
+        """
+        Return the one BlockKey for (block_type, block_id).
+        """
+        key = block_keys.get((block_type, block_id))
+        if key is None:
+            key = block_keys[(block_type, block_id)] = new_block_key(
+                (block_types.setdefault(block_type, block_type), block_id)
+            )
+        return key
+
+    return block_key
+
+
+def blocks_from_mongo(blocks, block_key=None):
+    """
+    Converts a list [block_data] of block documents to a map {BlockKey: block_data}
+    of LazyBlockData, as in structure_from_mongo.
+    """
+    if block_key is None:
+        block_key = _block_key_factory()
+    new_blocks = {}
+    for block in blocks:
+        key = block_key(block['block_type'], block.pop('block_id'))
+        block['block_type'] = key.type
+        new_blocks[key] = LazyBlockData(block, block_key)
+    return new_blocks
+
+
 def structure_to_mongo(structure):
     """
     Converts the 'blocks' key from a map {BlockKey: block_data} to
@@ -51,12 +139,14 @@ def structure_to_mongo(structure):
         and BlockKey.id as 'block_id'.
     Doesn't convert 'root', since namedtuple's can be inserted
         directly into mongo.
+    The structure is only checked against its contracts when contracts are enabled.
     """
-    check('BlockKey', structure['root'])
-    check('dict(BlockKey: BlockData)', structure['blocks'])
-    for block in structure['blocks'].itervalues():
-        if 'children' in block.fields:
-            check('list(BlockKey)', block.fields['children'])
+    if _validate_structures():
+        check('BlockKey', structure['root'])
+        check('dict(BlockKey: BlockData)', structure['blocks'])
+        for block in structure['blocks'].itervalues():
+            if 'children' in block.fields:
+                check('list(BlockKey)', block.fields['children'])
 
     new_structure = dict(structure)
     new_structure['blocks'] = []
@@ -124,6 +214,60 @@ class MongoConnection(object):
         """
         return structure_from_mongo(self.structures.find_one({'_id': key}))
 
+    @autoretry_read()
+    def get_structure_header(self, key):
+        """
+        Get the structure whose id is the given key without its blocks, or None if there is no such structure.
+        Converts 'root' to a BlockKey, as structure_from_mongo does.
+        """
+        structure = self.structures.find_one({'_id': key}, fields={'blocks': False})
+        if structure is not None:
+            structure['root'] = BlockKey(*structure['root'])
+        return structure
+
+    @autoretry_read()
+    def get_structure_blocks(self, key, block_keys):
+        """
+        Get the blocks ``block_keys`` of the structure whose id is the given key, as a map
+        {BlockKey: block_data}, without reading the rest of the structure. Blocks which are
+        not in the structure are left out.
+
+        Arguments:
+            key: The id of a structure
+            block_keys (list): A list of BlockKeys
+        """
+        if not block_keys:
+            return {}
+        result = self.structures.aggregate([
+            {'$match': {'_id': key}},
+            {'$unwind': '$blocks'},
+            {'$match': {'$or': [
+                {'blocks.block_type': block_key.type, 'blocks.block_id': block_key.id}
+                for block_key in block_keys
+            ]}},
+            {'$project': {'_id': False, 'blocks': True}},
+        ])
+        return blocks_from_mongo([document['blocks'] for document in result['result']])
+
+    @autoretry_read()
+    def find_parent_block(self, key, block_key):
+        """
+        Find the block of the structure whose id is the given key which has ``block_key`` as a child,
+        without reading the rest of the structure. Returns a map {BlockKey: block_data} of the parent,
+        empty if the block has none.
+
+        Arguments:
+            key: The id of a structure
+            block_key (BlockKey): The id of the child block
+        """
+        structure = self.structures.find_one(
+            {'_id': key, 'blocks': {'$elemMatch': {'fields.children': [block_key.type, block_key.id]}}},
+            fields={'_id': False, 'blocks.$': True},
+        )
+        if structure is None:
+            return {}
+        return blocks_from_mongo(structure['blocks'])
+
     @autoretry_read()
     def find_structures_by_id(self, ids):
         """
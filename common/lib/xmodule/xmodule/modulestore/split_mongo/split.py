@@ -78,7 +78,7 @@ from xmodule.modulestore import (
 )
 
 from ..exceptions import ItemNotFoundError
-from .caching_descriptor_system import CachingDescriptorSystem
+from .caching_descriptor_system import CachingDescriptorSystem, ProjectedDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.error_module import ErrorDescriptor
@@ -636,9 +636,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, projected_reads=False, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param projected_reads: whether get_item reads only the blocks it needs of a course
+            structure, rather than the whole structure, when the structure isn't loaded yet.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -666,6 +668,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["user"] = user_service
 
         self.signal_handler = signal_handler
+        self.projected_reads = projected_reads
 
     def close_connections(self):
         """
@@ -755,24 +758,56 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
 
-    def _get_cache(self, course_version_guid):
+    def _load_projected_items(self, course_key, block_keys, depth=0, **kwargs):
+        """
+        Load & cache the given blocks from the course like _load_items, reading only those
+        blocks and their descendants out to depth, rather than the whole structure, unless
+        the whole structure is already loaded.
+        """
+        course_key = self._lookup_course_version(course_key)
+        version_guid = course_key.version_guid
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if self._get_cache(version_guid) is not None or (
+                bulk_write_record.active and version_guid in bulk_write_record.structures
+        ):
+            course_entry = CourseEnvelope(course_key, self.get_structure(course_key, version_guid))
+            return self._load_items(course_entry, block_keys, depth, **kwargs)
+
+        lazy = kwargs.pop('lazy', True)
+        runtime = self._get_cache(version_guid, 'projected_course_cache')
+        if runtime is None:
+            structure = self.db_connection.get_structure_header(course_key.as_object_id(version_guid))
+            if structure is None:
+                raise ItemNotFoundError('Structure: {}'.format(version_guid))
+            structure['blocks'] = {}
+            runtime = self.create_runtime(CourseEnvelope(course_key, structure), lazy, projected=True)
+            self._add_cache(version_guid, runtime, 'projected_course_cache')
+
+        course_entry = CourseEnvelope(course_key, runtime.course_entry.structure)
+        runtime.fetch_descendants(block_keys, depth)
+        self.cache_items(runtime, block_keys, course_key, depth, lazy)
+        return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
+
+    def _get_cache(self, course_version_guid, cache_name='course_cache'):
         """
         Find the descriptor cache for this course if it exists
         :param course_version_guid:
+        :param cache_name: 'projected_course_cache' for the caches of the runtimes over some blocks only
         """
         if self.request_cache is None:
             return None
 
-        return self.request_cache.data.setdefault('course_cache', {}).get(course_version_guid)
+        return self.request_cache.data.setdefault(cache_name, {}).get(course_version_guid)
 
-    def _add_cache(self, course_version_guid, system):
+    def _add_cache(self, course_version_guid, system, cache_name='course_cache'):
         """
         Save this cache for subsequent access
         :param course_version_guid:
         :param system:
+        :param cache_name: 'projected_course_cache' for the caches of the runtimes over some blocks only
         """
         if self.request_cache is not None:
-            self.request_cache.data.setdefault('course_cache', {})[course_version_guid] = system
+            self.request_cache.data.setdefault(cache_name, {})[course_version_guid] = system
         return system
 
     def _clear_cache(self, course_version_guid=None):
@@ -783,13 +818,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if self.request_cache is None:
             return
 
-        if course_version_guid:
-            try:
-                del self.request_cache.data.setdefault('course_cache', {})[course_version_guid]
-            except KeyError:
-                pass
-        else:
-            self.request_cache.data['course_cache'] = {}
+        for cache_name in ('course_cache', 'projected_course_cache'):
+            if course_version_guid:
+                try:
+                    del self.request_cache.data.setdefault(cache_name, {})[course_version_guid]
+                except KeyError:
+                    pass
+            else:
+                self.request_cache.data[cache_name] = {}
 
     def _lookup_course(self, course_key, head_validation=True):
         """
@@ -803,6 +839,24 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         reference) unless you specify head_validation = False, in which case it will return the
         revision (if specified) by the course_key.
 
+        :param course_key: any subclass of CourseLocator
+        """
+        course_key = self._lookup_course_version(course_key, head_validation)
+        entry = self.get_structure(course_key, course_key.version_guid)
+        if entry is None:
+            raise ItemNotFoundError('Structure: {}'.format(course_key.version_guid))
+
+        # b/c more than one course can use same structure, the 'org', 'course',
+        # 'run', and 'branch' are not intrinsic to structure
+        # and the one assoc'd w/ it by another fetch may not be the one relevant to this fetch; so,
+        # add it in the envelope for the structure.
+        return CourseEnvelope(course_key, entry)
+
+    def _lookup_course_version(self, course_key, head_validation=True):
+        """
+        Return the course_key with the version_guid of the structure which _lookup_course
+        would return, without reading the structure.
+
         :param course_key: any subclass of CourseLocator
         """
         if not course_key.version_guid:
@@ -831,15 +885,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             # TODO should this raise an exception if branch was provided?
             version_guid = course_key.version_guid
 
-        entry = self.get_structure(course_key, version_guid)
-        if entry is None:
-            raise ItemNotFoundError('Structure: {}'.format(version_guid))
-
-        # b/c more than one course can use same structure, the 'org', 'course',
-        # 'run', and 'branch' are not intrinsic to structure
-        # and the one assoc'd w/ it by another fetch may not be the one relevant to this fetch; so,
-        # add it in the envelope for the structure.
-        return CourseEnvelope(course_key.replace(version_guid=version_guid), entry)
+        return course_key.replace(version_guid=version_guid)
 
     def _get_structures_for_branch(self, branch, **kwargs):
         """
@@ -1034,8 +1080,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(usage_key)
 
         with self.bulk_operations(usage_key.course_key):
-            course = self._lookup_course(usage_key.course_key)
-            items = self._load_items(course, [BlockKey.from_usage_key(usage_key)], depth, **kwargs)
+            block_keys = [BlockKey.from_usage_key(usage_key)]
+            if self.projected_reads and depth is not None:
+                items = self._load_projected_items(usage_key.course_key, block_keys, depth, **kwargs)
+            else:
+                course = self._lookup_course(usage_key.course_key)
+                items = self._load_items(course, block_keys, depth, **kwargs)
             if len(items) == 0:
                 raise ItemNotFoundError(usage_key)
             elif len(items) > 1:
@@ -3070,11 +3120,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         return {ModuleStoreEnum.Type.split: self.db_connection.heartbeat()}
 
-    def create_runtime(self, course_entry, lazy):
+    def create_runtime(self, course_entry, lazy, projected=False):
         """
         Create the proper runtime for this course
+        :param projected: whether course_entry.structure has only some of the blocks, the runtime
+            reading the others as needed
         """
-        return CachingDescriptorSystem(
+        runtime_class = ProjectedDescriptorSystem if projected else CachingDescriptorSystem
+        return runtime_class(
             modulestore=self,
             course_entry=course_entry,
             module_data={},
@@ -314,36 +314,58 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         :param xblock: the block to check
         :return: True if the draft and published versions differ
         """
-        def get_course(branch_name):
-            return self._lookup_course(xblock.location.course_key.for_branch(branch_name)).structure
+        changed_subtrees = self._get_changed_subtrees(xblock.location.course_key)
+        return changed_subtrees(BlockKey.from_usage_key(xblock.location))
 
-        def get_block(course_structure, block_key):
-            return self._get_block_from_structure(course_structure, block_key)
-
-        draft_course = get_course(ModuleStoreEnum.BranchName.draft)
-        published_course = get_course(ModuleStoreEnum.BranchName.published)
-
-        def has_changes_subtree(block_key):
-            draft_block = get_block(draft_course, block_key)
-            if draft_block is None:  # temporary fix for bad pointers TNL-1141
-                return True
-            published_block = get_block(published_course, block_key)
-            if published_block is None:
-                return True
+    def _get_changed_subtrees(self, course_key):
+        """
+        Returns a function which, given a BlockKey, reports whether the draft subtree rooted at that
+        block differs from the published one.
 
-            # check if the draft has changed since the published was created
-            if self._get_version(draft_block) != self._get_version(published_block):
-                return True
+        The answers are memoized per (draft version, published version) pair, so a single walk of the
+        draft structure serves every has_changes call made against the same pair of versions (e.g.,
+        once per xblock when Studio renders a course outline). The memo is kept in the request cache,
+        and is not shared when a bulk operation has versioned either branch, since those structures
+        are edited in place.
+        """
+        draft_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.draft)).structure
+        published_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.published)).structure
 
-            # check the children in the draft
-            if 'children' in draft_block.fields:
-                return any(
-                    [has_changes_subtree(child_block_id) for child_block_id in draft_block.fields['children']]
-                )
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if self.request_cache is None or (bulk_write_record.active and bulk_write_record.dirty_branches):
+            changed = {}
+        else:
+            changed = self.request_cache.data.setdefault('changed_subtrees_cache', {}).setdefault(
+                (draft_course['_id'], published_course['_id']), {}
+            )
 
-            return False
+        def has_changes_subtree(block_key):
+            """
+            Compute (or look up) whether the subtree under block_key has unpublished changes.
+            """
+            if block_key in changed:
+                return changed[block_key]
 
-        return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
+            draft_block = self._get_block_from_structure(draft_course, block_key)
+            if draft_block is None:  # temporary fix for bad pointers TNL-1141
+                result = True
+            else:
+                published_block = self._get_block_from_structure(published_course, block_key)
+                if published_block is None:
+                    result = True
+                # check if the draft has changed since the published was created
+                elif self._get_version(draft_block) != self._get_version(published_block):
+                    result = True
+                else:
+                    # check the children in the draft; visit all of them so that their answers are memoized
+                    result = False
+                    for child_block_key in draft_block.fields.get('children', []):
+                        result = has_changes_subtree(child_block_key) or result
+
+            changed[block_key] = result
+            return result
+
+        return has_changes_subtree
 
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
@@ -1,6 +1,7 @@
 """
  Test contentstore.mongo functionality
 """
+import hashlib
 import logging
 from uuid import uuid4
 import unittest
@@ -51,13 +52,13 @@ class TestContentstore(unittest.TestCase):
             delattr(CourseLocator, 'deprecated')
         return super(TestContentstore, cls).tearDownClass()
 
-    def set_up_assets(self, deprecated):
+    def set_up_assets(self, deprecated, content_addressed=False):
         """
         Setup contentstore w/ proper overriding of deprecated.
         """
         # since MongoModuleStore and MongoContentStore are basically assumed to be together, create this class
         # as well
-        self.contentstore = MongoContentStore(HOST, DB, port=PORT)
+        self.contentstore = MongoContentStore(HOST, DB, port=PORT, content_addressed=content_addressed)
         self.addCleanup(self.contentstore._drop_database)  # pylint: disable=protected-access
 
         setattr(AssetLocator, 'deprecated', deprecated)
@@ -209,3 +210,85 @@ class TestContentstore(unittest.TestCase):
         # ensure it didn't remove any from other course
         __, count = self.contentstore.get_all_content_for_course(self.course2_key)
         self.assertEqual(count, len(self.course2_files))
+
+    def _assert_asset_data(self, course_key, files):
+        """
+        Check that the assets of the course hold the data of their files.
+        """
+        for filename in files:
+            asset_key = course_key.make_asset_key('asset', filename)
+            with open("{}/static/{}".format(DATA_DIR, filename), "rb") as f:
+                data = f.read()
+            content = self.contentstore.find(asset_key)
+            self.assertEqual(content.data, data)
+            self.assertEqual(content.length, len(data))
+            stream = self.contentstore.find(asset_key, as_stream=True)
+            self.assertEqual(''.join(stream.stream_data()), data)
+
+    def _blob_refcount(self, filename):
+        """
+        Return the reference count of the blob holding the data of the file.
+        """
+        with open("{}/static/{}".format(DATA_DIR, filename), "rb") as f:
+            sha1 = hashlib.sha1(f.read()).hexdigest()
+        return self.contentstore.blob_files.find_one({'sha1': sha1})['refcount']
+
+    @ddt.data(True, False)
+    def test_content_addressed_save(self, deprecated):
+        """
+        Test that content-addressed assets store each distinct content once
+        """
+        self.set_up_assets(deprecated, content_addressed=True)
+        # picture1.jpg is in both courses
+        self.assertEqual(self.contentstore.blob_files.count(), 5)
+        self.assertEqual(self.contentstore.fs_chunks.count(), 0)
+        self.assertEqual(self._blob_refcount('picture1.jpg'), 2)
+        self._assert_asset_data(self.course1_key, self.course1_files)
+        self._assert_asset_data(self.course2_key, self.course2_files)
+
+        # saving other data for an asset releases the blob of its previous data
+        asset_key = self.course1_key.make_asset_key('asset', 'picture1.jpg')
+        self.save_asset('picture3.jpg', asset_key, 'picture1.jpg', False)
+        self.assertEqual(self.contentstore.blob_files.count(), 5)
+        self.assertEqual(self._blob_refcount('picture3.jpg'), 2)
+        self._assert_asset_data(self.course2_key, ['picture1.jpg'])
+
+    @ddt.data(True, False)
+    def test_content_addressed_copy_and_delete(self, deprecated):
+        """
+        Test that copying content-addressed assets only adds references, and that deleting
+        assets deletes the blobs which are no longer referenced
+        """
+        self.set_up_assets(deprecated, content_addressed=True)
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+
+        self.assertEqual(self.contentstore.blob_files.count(), 5)
+        self.assertEqual(self._blob_refcount('picture1.jpg'), 3)
+        self._assert_asset_data(dest_course, self.course1_files)
+
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        self.assertEqual(self.contentstore.blob_files.count(), 5)
+        self._assert_asset_data(dest_course, self.course1_files)
+
+        self.contentstore.delete_all_course_assets(dest_course)
+        # only the blobs of the assets of course 2 are left
+        self.assertEqual(self.contentstore.blob_files.count(), 3)
+        self._assert_asset_data(self.course2_key, self.course2_files)
+
+        self.contentstore.delete(self.course2_key.make_asset_key('asset', 'picture1.jpg'))
+        self.assertEqual(self.contentstore.blob_files.count(), 2)
+
+    @ddt.data(True, False)
+    def test_content_addressed_copy_of_stored_assets(self, deprecated):
+        """
+        Test copying assets saved before the content-addressed mode was enabled
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.content_addressed = True
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+
+        self.assertEqual(self.contentstore.blob_files.count(), 3)
+        self._assert_asset_data(self.course1_key, self.course1_files)
+        self._assert_asset_data(dest_course, self.course1_files)
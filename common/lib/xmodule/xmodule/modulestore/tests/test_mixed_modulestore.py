@@ -18,6 +18,7 @@ from contextlib import contextmanager
 from django.conf import settings
 # This import breaks this test file when run separately. Needs to be fixed! (PLAT-449)
 from mock_django import mock_signal_receiver
+from mock import Mock, patch
 from nose.plugins.attrib import attr
 import pymongo
 from pytz import UTC
@@ -702,6 +703,34 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             # Check the parent for changes should return True and not throw an exception
             self.assertTrue(self.store.has_changes(parent))
 
+    def test_has_changes_memoized_per_version(self):
+        """
+        Tests that split computes has_changes once per block for a given pair of draft and published versions,
+        and recomputes it once either version changes.
+        """
+        locations = self.setup_has_changes('split')
+        split_store = self.store._get_modulestore_by_type(ModuleStoreEnum.Type.split)  # pylint: disable=protected-access
+        split_store.request_cache = Mock(data={})
+        self.addCleanup(setattr, split_store, 'request_cache', None)
+
+        items = dict((key, self.store.get_item(location)) for key, location in locations.iteritems())
+        self.assertFalse(self.store.has_changes(items['grandparent']))
+
+        # every block under the grandparent has been visited, so no further structure lookups are needed
+        get_block = split_store._get_block_from_structure  # pylint: disable=protected-access
+        with patch.object(split_store, '_get_block_from_structure', side_effect=get_block) as mock_get_block:
+            for item in items.itervalues():
+                self.assertFalse(self.store.has_changes(item))
+            self.assertEqual(mock_get_block.call_count, 0)
+
+        child = items['child']
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        self.assertTrue(self._has_changes(locations['grandparent']))
+        self.assertTrue(self._has_changes(locations['child']))
+        self.assertFalse(self._has_changes(locations['child_sibling']))
+
     # Draft
     #   Find: find parents (definition.children query), get parent, get course (fill in run?),
     #         find parents of the parent (course), get inheritance items,
@@ -10,6 +10,7 @@ import unittest
 import uuid
 
 from contracts import contract
+from mock import patch
 from nose.plugins.attrib import attr
 
 from openedx.core.lib import tempdir
@@ -25,6 +26,8 @@ from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator, VersionTre
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.caching_descriptor_system import ProjectedDescriptorSystem
+from xmodule.modulestore.split_mongo.mongo_connection import LazyBlockData
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -968,6 +971,36 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 6)
 
+    def test_get_items_block_data_qualifiers(self):
+        """
+        get_items matches qualifiers against the attributes of the blocks' BlockData
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        matches = modulestore().get_items(locator, qualifiers={'block_type': 'chapter'})
+        self.assertEqual(sorted(match.location.block_id for match in matches), ['chapter1', 'chapter2', 'chapter3'])
+        matches = modulestore().get_items(locator, qualifiers={'definition_loaded': {'$exists': True}})
+        self.assertEqual(len(matches), 7)
+        matches = modulestore().get_items(locator, qualifiers={'name': 'chapter1', 'block_type': 'chapter'})
+        self.assertEqual([match.location.block_id for match in matches], ['chapter1'])
+
+    def test_block_matches_lazy_block_data(self):
+        """
+        Qualifiers are matched against the decoded fields of blocks not decoded yet
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        course_key = modulestore().get_course(locator).location.course_key
+        structure = modulestore().db_connection.get_structure(course_key.as_object_id(course_key.version_guid))
+        # pylint: disable=protected-access
+        chapter = structure['blocks'][BlockKey('chapter', 'chapter1')]
+        self.assertIsInstance(chapter, LazyBlockData)
+        self.assertIsNotNone(chapter._source)
+        self.assertTrue(modulestore()._block_matches(chapter, {'block_type': 'chapter'}))
+        self.assertIsNone(chapter._source)
+
+        problem = structure['blocks'][BlockKey('problem', 'problem1')]
+        self.assertFalse(modulestore()._block_matches(problem, {'block_type': 'chapter'}))
+        self.assertTrue(modulestore()._block_matches(problem, {'definition': {'$exists': True}}))
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -1978,6 +2011,54 @@ class TestSchema(SplitModuleTest):
             )
 
 
+class TestProjectedReads(SplitModuleTest):
+    """
+    Test get_item reading only the blocks it needs of the structure.
+    """
+    def setUp(self):
+        super(TestProjectedReads, self).setUp()
+        modulestore().projected_reads = True
+        self.course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+
+    def test_get_item(self):
+        with patch.object(modulestore().db_connection, 'get_structure') as mock_get_structure:
+            problem = modulestore().get_item(BlockUsageLocator(self.course_key, 'problem', 'problem3_2'))
+            self.assertIsInstance(problem.runtime, ProjectedDescriptorSystem)
+            # inherited
+            self.assertEqual(problem.graceperiod, datetime.timedelta(hours=2))
+            self.assertEqual(problem.parent.block_id, 'chapter3')
+
+            problem = modulestore().get_item(BlockUsageLocator(self.course_key, 'problem', 'problem1'))
+            # overridden
+            self.assertEqual(problem.graceperiod, datetime.timedelta(hours=4))
+            self.assertFalse(mock_get_structure.called)
+
+    def test_get_children(self):
+        locator = BlockUsageLocator(self.course_key, 'chapter', 'chapter3')
+        chapter = modulestore().get_item(locator, depth=1)
+        children = [child.location.block_id for child in chapter.get_children()]
+        self.assertIn('problem3_2', children)
+        course = modulestore().get_item(BlockUsageLocator(self.course_key, 'course', 'head12345'))
+        self.assertIn('chapter3', [child.block_id for child in course.children])
+
+        modulestore().projected_reads = False
+        chapter = modulestore().get_item(locator)
+        self.assertEqual(children, [child.location.block_id for child in chapter.get_children()])
+
+    def test_not_found(self):
+        with self.assertRaises(ItemNotFoundError):
+            modulestore().get_item(BlockUsageLocator(self.course_key, 'problem', 'doesnotexist'))
+
+    def test_structure_already_loaded(self):
+        with modulestore().bulk_operations(self.course_key):
+            modulestore().get_course(self.course_key)
+            with patch.object(modulestore().db_connection, 'get_structure_blocks') as mock_get_blocks:
+                problem = modulestore().get_item(BlockUsageLocator(self.course_key, 'problem', 'problem3_2'))
+            self.assertFalse(mock_get_blocks.called)
+            self.assertNotIsInstance(problem.runtime, ProjectedDescriptorSystem)
+            self.assertEqual(problem.graceperiod, datetime.timedelta(hours=2))
+
+
 # ===========================================
 def modulestore():
     """
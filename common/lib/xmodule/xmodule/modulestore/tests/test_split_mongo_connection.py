@@ -0,0 +1,107 @@
+"""
+Tests of the decoding and encoding of split modulestore structures.
+"""
+import copy
+import cPickle as pickle
+import unittest
+
+from contracts import ContractNotRespected
+from mock import patch
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    LazyBlockData, structure_from_mongo, structure_to_mongo
+)
+
+
+def make_mongo_structure():
+    """
+    Return a structure document, as read from mongo, of a course with one chapter.
+    """
+    return {
+        '_id': 'version',
+        'root': ['course', 'course'],
+        'blocks': [
+            {
+                'block_type': 'course',
+                'block_id': 'course',
+                'definition': 'course_definition',
+                'fields': {'children': [['chapter', 'chapter']]},
+                'defaults': {},
+                'edit_info': {'edited_by': 1, 'update_version': 'version'},
+            },
+            {
+                'block_type': 'chapter',
+                'block_id': 'chapter',
+                'definition': 'chapter_definition',
+                'fields': {'display_name': 'Chapter'},
+                'defaults': {},
+                'edit_info': {'edited_by': 2, 'update_version': 'version'},
+            },
+        ],
+    }
+
+
+class StructureCodecTest(unittest.TestCase):
+    """
+    Tests of structure_from_mongo and structure_to_mongo.
+    """
+    # pylint: disable=protected-access
+    def test_blocks_decoded_on_access(self):
+        structure = structure_from_mongo(make_mongo_structure())
+        course = structure['blocks'][BlockKey('course', 'course')]
+        self.assertIsInstance(course, LazyBlockData)
+        self.assertIsNotNone(course._source)
+        self.assertFalse(course.definition_loaded)
+
+        self.assertEqual(course.fields['children'], [BlockKey('chapter', 'chapter')])
+        self.assertIsNone(course._source)
+        self.assertEqual(course.definition, 'course_definition')
+        self.assertEqual(course.edit_info.edited_by, 1)
+        # the children share the BlockKeys of the blocks map
+        keys = dict((key, key) for key in structure['blocks'])
+        self.assertIs(course.fields['children'][0], keys[BlockKey('chapter', 'chapter')])
+        self.assertIs(keys[structure['root']], structure['root'])
+        self.assertIsNotNone(structure['blocks'][BlockKey('chapter', 'chapter')]._source)
+
+    def test_set_before_decoding(self):
+        structure = structure_from_mongo(make_mongo_structure())
+        chapter = structure['blocks'][BlockKey('chapter', 'chapter')]
+        chapter.fields = {'display_name': 'New name'}
+        chapter.definition_loaded = True
+
+        self.assertEqual(chapter.fields, {'display_name': 'New name'})
+        self.assertEqual(chapter.edit_info.edited_by, 2)
+        self.assertTrue(chapter.definition_loaded)
+
+    def test_copies_are_decoded(self):
+        structure = structure_from_mongo(make_mongo_structure())
+        for copied in (copy.deepcopy(structure), pickle.loads(pickle.dumps(structure, pickle.HIGHEST_PROTOCOL))):
+            chapter = copied['blocks'][BlockKey('chapter', 'chapter')]
+            self.assertEqual(chapter.fields, {'display_name': 'Chapter'})
+            self.assertEqual(chapter.definition, 'chapter_definition')
+            self.assertEqual(chapter.edit_info.edited_by, 2)
+
+    def test_round_trip(self):
+        mongo_structure = make_mongo_structure()
+        structure = structure_to_mongo(structure_from_mongo(copy.deepcopy(mongo_structure)))
+        self.assertEqual(structure['root'], ('course', 'course'))
+        self.assertEqual(
+            sorted(block['block_id'] for block in structure['blocks']),
+            ['chapter', 'course']
+        )
+        course = [block for block in structure['blocks'] if block['block_id'] == 'course'][0]
+        self.assertEqual(course['fields']['children'], [('chapter', 'chapter')])
+        self.assertEqual(course['edit_info']['edited_by'], 1)
+
+    def test_contracts_checked_when_enabled(self):
+        mongo_structure = make_mongo_structure()
+        mongo_structure['blocks'][0]['fields']['children'] = [['chapter']]
+        with self.assertRaises(ContractNotRespected):
+            structure_from_mongo(mongo_structure)
+
+    @patch('contracts.all_disabled', return_value=True)
+    def test_contracts_not_checked_when_disabled(self, _mock_disabled):
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.check') as mock_check:
+            structure_to_mongo(structure_from_mongo(make_mongo_structure()))
+        self.assertFalse(mock_check.called)
@@ -64,7 +64,7 @@ def import_static_content(
     try:
         with open(course_data_path / 'policies/assets.json') as f:
             policy = json.load(f)
-    except (IOError, ValueError) as err:
+    except (IOError, ValueError):
         # xml backed courses won't have this file, only exported courses;
         # so, its absence is not really an exception.
         policy = {}
@@ -75,66 +75,68 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
-
-            content_path = os.path.join(dirname, filename)
-
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+    def static_contents():
+        """
+        Generate the StaticContent of each file to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                content_path = os.path.join(dirname, filename)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
                     continue
-                # Not a 'hidden file', then re-raise exception
-                raise
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
-
-            policy_ele = policy.get(asset_key.path, {})
-            displayname = policy_ele.get('displayname', filename)
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+                if verbose:
+                    log.debug('importing static content %s...', content_path)
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+                try:
+                    with open(content_path, 'rb') as f:
+                        data = f.read()
+                except IOError:
+                    if filename.startswith('._'):
+                        # OS X "companion files". See
+                        # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                        continue
+                    # Not a 'hidden file', then re-raise exception
+                    raise
+
+                # strip away leading path from the name
+                fullname_with_subpath = content_path.replace(static_dir, '')
+                if fullname_with_subpath.startswith('/'):
+                    fullname_with_subpath = fullname_with_subpath[1:]
+                asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+                policy_ele = policy.get(asset_key.path, {})
+                displayname = policy_ele.get('displayname', filename)
+                locked = policy_ele.get('locked', False)
+                mime_type = policy_ele.get('contentType')
+
+                # Check extracted contentType in list of all valid mimetypes
+                if not mime_type or mime_type not in mimetypes_list:
+                    mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+                yield StaticContent(
+                    asset_key, displayname, mime_type, data,
+                    import_path=fullname_with_subpath, locked=locked
+                )
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+    # save the content with its thumbnail, generating the thumbnails in parallel and saving in batches
+    for content, timing in static_content_store.ingest_assets(static_contents()):
+        if timing['error'] is not None:
+            log.error(u'Error importing {0}, error={1}'.format(
+                content.import_path, timing['error']
+            ))
+        elif verbose:
+            log.debug(
+                u'imported static content %s: thumbnail %.3fs, save %.3fs',
+                content.import_path, timing['thumbnail'], timing['save']
+            )
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
-
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+        # store the remapping information which will be needed
+        # to subsitute in the module data
+        remap_dict[content.import_path] = content.location
 
     return remap_dict
 
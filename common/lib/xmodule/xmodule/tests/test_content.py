@@ -8,6 +8,7 @@ from xmodule.contentstore.content import StaticContent, StaticContentStream
 from xmodule.contentstore.content import ContentStore
 from opaque_keys.edx.locations import SlashSeparatedCourseKey, AssetLocation
 from xmodule.static_content import _write_js, _list_descriptors
+from xmodule.tests import DATA_DIR
 
 SAMPLE_STRING = """
 This is a sample string with more than 1024 bytes, the default STREAM_DATA_CHUNK_SIZE
@@ -173,3 +174,86 @@ class ContentTest(unittest.TestCase):
         js_file_paths = [file_path for file_path in js_file_paths if os.path.basename(file_path).startswith('000-')]
         self.assertEqual(len(js_file_paths), 1)
         self.assertIn("XModule.Descriptor = (function () {", open(js_file_paths[0]).read())
+
+
+class RecordingContentStore(ContentStore):
+    """
+    Content store recording the batches of content it saves, failing to save the
+    content whose name is in `failing_names`.
+    """
+    def __init__(self, failing_names=()):
+        self.failing_names = failing_names
+        self.batches = []
+        self.saved = {}
+
+    def save(self, content):
+        if content.name in self.failing_names:
+            raise ValueError(content.name)
+        self.saved[content.location] = content
+        return content
+
+    def save_many(self, contents):
+        self.batches.append([content.name for content in contents])
+        return super(RecordingContentStore, self).save_many(contents)
+
+
+class IngestAssetsTest(unittest.TestCase):
+    """
+    Tests of ContentStore.ingest_assets
+    """
+    COURSE_KEY = SlashSeparatedCourseKey('mitX', '800', 'ignore_run')
+
+    def _content(self, filename, name=None, content_type='text/plain', data='data'):
+        """
+        Return a StaticContent for the asset `filename` of the course.
+        """
+        location = StaticContent.compute_location(self.COURSE_KEY, filename)
+        return StaticContent(location, name or filename, content_type, data)
+
+    def test_thumbnails_and_batches(self):
+        with open(DATA_DIR / 'static' / 'picture1.jpg', 'rb') as image_file:
+            image_data = image_file.read()
+        contents = [
+            self._content('picture1.jpg', content_type='image/jpeg', data=image_data),
+            self._content('a.txt'),
+            self._content('picture2.png', content_type='image/png', data=image_data),
+            self._content('b.txt'),
+            self._content('c.txt'),
+        ]
+        store = RecordingContentStore()
+        results = list(store.ingest_assets(contents, workers=2, batch_size=2))
+
+        self.assertEqual([content for content, __ in results], contents)
+        for __, timing in results:
+            self.assertIsNone(timing['error'])
+            self.assertGreaterEqual(timing['thumbnail'], 0)
+            self.assertGreaterEqual(timing['save'], 0)
+        self.assertEqual(
+            store.batches,
+            [['picture1.jpg', 'picture1.jpg', 'a.txt'], ['picture2-png.jpg', 'picture2.png', 'b.txt'], ['c.txt']]
+        )
+        self.assertEqual(
+            contents[0].thumbnail_location,
+            StaticContent.compute_location(self.COURSE_KEY, 'picture1.jpg', is_thumbnail=True)
+        )
+        self.assertEqual(store.saved[contents[0].thumbnail_location].content_type, 'image/jpeg')
+        self.assertIsNone(contents[1].thumbnail_location)
+
+    def test_same_location_in_batch(self):
+        contents = [self._content('a/b.txt', name='first'), self._content('a_b.txt', name='second')]
+        store = RecordingContentStore()
+        list(store.ingest_assets(contents, workers=1))
+
+        self.assertEqual(store.batches, [['second']])
+        self.assertEqual(store.saved[contents[0].location].name, 'second')
+
+    def test_failed_save(self):
+        contents = [self._content('a.txt'), self._content('b.txt')]
+        store = RecordingContentStore(failing_names=['b.txt'])
+        results = dict(
+            (content.name, timing['error']) for content, timing in store.ingest_assets(contents, workers=1)
+        )
+
+        self.assertIsNone(results['a.txt'])
+        self.assertIsInstance(results['b.txt'], ValueError)
+        self.assertEqual(store.saved.keys(), [contents[0].location])
@@ -1,6 +1,8 @@
 """Grading tests"""
 import unittest
 
+import numpy
+
 from xmodule import graders
 from xmodule.graders import Score, aggregate_scores
 
@@ -240,3 +242,70 @@ class GraderTest(unittest.TestCase):
 
         # TODO: How do we test failure cases? The parser only logs an error when
         # it can't parse something. Maybe it should throw exceptions?
+
+
+class BatchGraderTest(unittest.TestCase):
+    '''Tests that batch grading matches grading each student separately'''
+
+    grading_conf = [
+        {'type': "Homework", 'min_count': 4, 'drop_count': 1, 'weight': 0.3},
+        {'type': "Lab", 'min_count': 2, 'drop_count': 3, 'weight': 0.2},
+        {'type': "Midterm", 'name': "Midterm Exam", 'weight': 0.2},
+        {'type': "Final", 'min_count': 1, 'drop_count': 0, 'weight': 0.3},
+    ]
+    grade_cutoffs = {'A': 0.9, 'B': 0.7, 'C': 0.5}
+
+    section_formats = ["Homework"] * 6 + ["Lab"] * 3 + ["Midterm", "Midterm", "Final"]
+    section_names = ['hw{}'.format(i) for i in xrange(6)] + ['lab{}'.format(i) for i in xrange(3)] + \
+        ["Practice", "Midterm Exam", "Final Exam"]
+
+    def setUp(self):
+        super(BatchGraderTest, self).setUp()
+        rand = numpy.random.RandomState(0)
+        shape = (200, len(self.section_formats))
+        # Possible scores of 0 leave the section out of the student's grade sheet
+        possible = rand.randint(0, 4, size=shape).astype(float)
+        earned = numpy.floor(rand.rand(*shape) * (possible + 1))
+        self.score_matrix = graders.ScoreMatrix(self.section_formats, self.section_names, earned, possible)
+
+    def assert_matches_reference(self, grader):
+        '''Check batch_grade against grader.grade for every student'''
+        batch_result = grader.batch_grade(self.score_matrix)
+        for index in xrange(self.score_matrix.num_students):
+            result = grader.grade(self.score_matrix.grade_sheet(index))
+            self.assertAlmostEqual(batch_result['percent'][index], result['percent'])
+            for batch_breakdown, breakdown in zip(batch_result.get('grade_breakdown', []), result.get('grade_breakdown', [])):
+                self.assertEqual(batch_breakdown['category'], breakdown['category'])
+                self.assertAlmostEqual(batch_breakdown['percent'][index], breakdown['percent'])
+
+    def test_assignment_format_grader(self):
+        for min_count, drop_count in [(0, 0), (4, 1), (8, 2), (2, 5)]:
+            self.assert_matches_reference(graders.AssignmentFormatGrader("Homework", min_count, drop_count))
+
+    def test_single_section_grader(self):
+        self.assert_matches_reference(graders.SingleSectionGrader("Midterm", "Midterm Exam"))
+        self.assert_matches_reference(graders.SingleSectionGrader("Midterm", "No such exam"))
+
+    def test_weighted_grader(self):
+        self.assert_matches_reference(graders.grader_from_conf(self.grading_conf))
+        self.assert_matches_reference(graders.grader_from_conf([]))
+
+    def test_batch_grade(self):
+        grader = graders.grader_from_conf(self.grading_conf)
+        summary = graders.batch_grade(grader, self.score_matrix, self.grade_cutoffs)
+
+        for index in xrange(self.score_matrix.num_students):
+            percent = round(grader.grade(self.score_matrix.grade_sheet(index))['percent'] * 100 + 0.05) / 100
+            self.assertAlmostEqual(summary['percent'][index], percent)
+            expected_grade = None
+            for letter in sorted(self.grade_cutoffs, key=self.grade_cutoffs.get, reverse=True):
+                if percent >= self.grade_cutoffs[letter]:
+                    expected_grade = letter
+                    break
+            self.assertEqual(summary['grade'][index], expected_grade)
+
+    def test_letter_grades(self):
+        self.assertEqual(
+            graders.letter_grades(self.grade_cutoffs, numpy.array([0.95, 0.9, 0.89, 0.5, 0.1])),
+            ['A', 'A', 'B', 'C', None]
+        )
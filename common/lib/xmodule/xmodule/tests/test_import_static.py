@@ -2,21 +2,32 @@
 Tests that check that we ignore the appropriate files when importing courses.
 """
 import unittest
-from mock import Mock
+from xmodule.contentstore.content import ContentStore
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
 
 
+class RecordingContentStore(ContentStore):
+    """
+    Content store recording the content it saves.
+    """
+    def __init__(self):
+        self.saved = []
+
+    def save(self, content):
+        self.saved.append(content)
+        return content
+
+
 class IgnoredFilesTestCase(unittest.TestCase):
     "Tests for ignored files"
     def test_ignore_tilde_static_files(self):
         course_dir = DATA_DIR / "tilde"
         course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
-        content_store = Mock()
-        content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store = RecordingContentStore()
         import_static_content(course_dir, content_store, course_id)
-        saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+        saved_static_content = content_store.saved
         name_val = {sc.name: sc.data for sc in saved_static_content}
         self.assertIn("example.txt", name_val)
         self.assertNotIn("example.txt~", name_val)
@@ -28,10 +39,9 @@ class IgnoredFilesTestCase(unittest.TestCase):
         """
         course_dir = DATA_DIR / "dot-underscore"
         course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
-        content_store = Mock()
-        content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store = RecordingContentStore()
         import_static_content(course_dir, content_store, course_id)
-        saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+        saved_static_content = content_store.saved
         name_val = {sc.name: sc.data for sc in saved_static_content}
         self.assertIn("example.txt", name_val)
         self.assertIn(".example.txt", name_val)
@@ -7,17 +7,34 @@ import copy
 import json
 import requests
 import logging
+import threading
+from collections import OrderedDict
 from pysrt import SubRipTime, SubRipItem, SubRipFile
 from lxml import etree
 from HTMLParser import HTMLParser
 
+import dogstats_wrapper as dog_stats_api
 from xmodule.exceptions import NotFoundError
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 
+try:
+    # We may not always have the request_cache module available
+    from request_cache.middleware import RequestCache
+
+    HAS_REQUEST_CACHE = True
+except ImportError:
+    HAS_REQUEST_CACHE = False
+
 
 log = logging.getLogger(__name__)
 
+TRANSCRIPT_ASSETS_CACHE_KEY = 'transcripts_utils.transcript_assets'
+
+# Upper bound on the total length of the transcripts held by each process' TranscriptCache.
+TRANSCRIPT_CACHE_MAX_SIZE = 16 * 1024 * 1024
+TRANSCRIPT_CACHE_METRIC_NAME = 'video.transcript_cache'
+
 
 class TranscriptException(Exception):  # pylint: disable=missing-docstring
     pass
@@ -64,6 +81,64 @@ def generate_subs(speed, source_speed, source_subs):
     return subs
 
 
+def generate_subs_for_speeds(speed_subs, source_speed, source_subs):
+    """
+    Generate transcripts for several speeds from one source.
+
+    Speeds shared by more than one subs id are only computed once.
+
+    Args:
+    `speed_subs`: dict, {speed: subs_id, ...}
+    `source_speed`: float, speed of source_subs
+    `source_subs`: dict, existing subtitles for speed `source_speed`.
+
+    Returns:
+    dict, {subs_id: subs, ...}
+    """
+    by_speed = {}
+    result = {}
+    for speed, subs_id in speed_subs.iteritems():
+        if speed not in by_speed:
+            by_speed[speed] = generate_subs(speed, source_speed, source_subs)
+        result[subs_id] = by_speed[speed]
+    return result
+
+
+def _transcript_assets_cache():
+    """
+    Return the {asset location: content} cache for the current request,
+    or None when we are not servicing a request.
+    """
+    if not HAS_REQUEST_CACHE or RequestCache.get_current_request() is None:
+        return None
+    return RequestCache.get_request_cache().data.setdefault(TRANSCRIPT_ASSETS_CACHE_KEY, {})
+
+
+def sjson_content(subs, subs_id, item, language='en'):
+    """
+    Build, but don't save, the `StaticContent` for sjson transcripts.
+    """
+    filename = subs_filename(subs_id, language)
+    return StaticContent(
+        Transcript.asset_location(item.location, filename), filename, 'application/json', json.dumps(subs, indent=2)
+    )
+
+
+def save_contents_to_store(contents):
+    """
+    Save several transcript `StaticContent`s to store with one bulk write.
+
+    Returns locations of saved content.
+    """
+    contents = list(contents)
+    contentstore().save_many(contents)
+    assets_cache = _transcript_assets_cache()
+    if assets_cache is not None:
+        for content in contents:
+            assets_cache[content.location] = content
+    return [content.location for content in contents]
+
+
 def save_to_store(content, name, mime_type, location):
     """
     Save named content to store by location.
@@ -73,6 +148,9 @@ def save_to_store(content, name, mime_type, location):
     content_location = Transcript.asset_location(location, name)
     content = StaticContent(content_location, name, mime_type, content)
     contentstore().save(content)
+    assets_cache = _transcript_assets_cache()
+    if assets_cache is not None:
+        assets_cache.pop(content_location, None)
     return content_location
 
 
@@ -92,6 +170,22 @@ def save_subs_to_store(subs, subs_id, item, language='en'):
     return save_to_store(filedata, filename, 'application/json', item.location)
 
 
+def save_subs_to_store_many(subs_by_id, item, language='en'):
+    """
+    Save transcripts for several subs ids with one bulk write.
+
+    Args:
+    `subs_by_id`: dict, {subs_id: subs, ...}
+    `item`: video module instance
+    `language`: two chars str ('uk'), language of translation of transcripts
+
+    Returns: locations of saved subtitles.
+    """
+    return save_contents_to_store(
+        sjson_content(subs, subs_id, item, language) for subs_id, subs in subs_by_id.iteritems()
+    )
+
+
 def get_transcripts_from_youtube(youtube_id, settings, i18n):
     """
     Gets transcripts from youtube for youtube_id.
@@ -167,17 +261,13 @@ def remove_subs_from_store(subs_id, item, lang='en'):
     Transcript.delete_asset(item.location, filename)
 
 
-def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, language='en'):
-    """Generate transcripts from source files (like SubRip format, etc.)
-    and save them to assets for `item` module.
-    We expect, that speed of source subs equal to 1
+def parse_subs_from_source(subs_type, subs_filedata, item):
+    """Parse transcripts from source files (like SubRip format, etc.) into sjson subs.
 
-    :param speed_subs: dictionary {speed: sub_id, ...}
     :param subs_type: type of source subs: "srt", ...
     :param subs_filedata:unicode, content of source subs.
     :param item: module object.
-    :param language: str, language of translation of transcripts
-    :returns: True, if all subs are generated and saved successfully.
+    :returns: sjson subs dict.
     """
     _ = item.runtime.service(item, "i18n").ugettext
     if subs_type.lower() != 'srt':
@@ -201,19 +291,28 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
         sub_ends.append(sub.end.ordinal)
         sub_texts.append(sub.text.replace('\n', ' '))
 
-    subs = {
+    return {
         'start': sub_starts,
         'end': sub_ends,
         'text': sub_texts}
 
-    for speed, subs_id in speed_subs.iteritems():
-        save_subs_to_store(
-            generate_subs(speed, 1, subs),
-            subs_id,
-            item,
-            language
-        )
 
+def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, language='en'):
+    """Generate transcripts from source files (like SubRip format, etc.)
+    and save them to assets for `item` module.
+    We expect, that speed of source subs equal to 1
+
+    The source is parsed once and all speeds are saved with one bulk write.
+
+    :param speed_subs: dictionary {speed: sub_id, ...}
+    :param subs_type: type of source subs: "srt", ...
+    :param subs_filedata:unicode, content of source subs.
+    :param item: module object.
+    :param language: str, language of translation of transcripts
+    :returns: True, if all subs are generated and saved successfully.
+    """
+    subs = parse_subs_from_source(subs_type, subs_filedata, item)
+    save_subs_to_store_many(generate_subs_for_speeds(speed_subs, 1, subs), item, language)
     return subs
 
 
@@ -343,17 +442,16 @@ def manage_video_subtitles_save(item, user, old_metadata=None, generate_translat
                     remove_subs_from_store(video_id, item, lang)
 
         reraised_message = ''
+        speed_subs = {speed: subs_id for subs_id, speed in youtube_speed_dict(item).iteritems()}
+        contents = []
         for lang in new_langs:  # 3b
             try:
-                generate_sjson_for_all_speeds(
-                    item,
-                    item.transcripts[lang],
-                    {speed: subs_id for subs_id, speed in youtube_speed_dict(item).iteritems()},
-                    lang,
-                )
+                contents.extend(sjson_contents_for_all_speeds(item, item.transcripts[lang], speed_subs, lang))
             except TranscriptException as ex:
                 item.transcripts.pop(lang)  # remove key from transcripts because proper srt file does not exist in assets.
                 reraised_message += ' ' + ex.message
+        # all languages are written together, once every source has been parsed
+        save_contents_to_store(contents)
         if reraised_message:
             item.save_with_metadata(user)
             raise TranscriptException(reraised_message)
@@ -383,6 +481,16 @@ def generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, lang):
     """
     Generates sjson from srt for given lang.
 
+    `item` is module object.
+    """
+    save_contents_to_store(sjson_contents_for_all_speeds(item, user_filename, result_subs_dict, lang))
+
+
+def sjson_contents_for_all_speeds(item, user_filename, result_subs_dict, lang):
+    """
+    Parse the uploaded srt `user_filename` once and return the unsaved sjson
+    `StaticContent`s for every speed in `result_subs_dict` in given lang.
+
     `item` is module object.
     """
     _ = item.runtime.service(item, "i18n").ugettext
@@ -399,13 +507,15 @@ def generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, lang):
         lang = item.transcript_language
 
     # Used utf-8-sig encoding type instead of utf-8 to remove BOM(Byte Order Mark), e.g. U+FEFF
-    generate_subs_from_source(
-        result_subs_dict,
+    subs = parse_subs_from_source(
         os.path.splitext(user_filename)[1][1:],
         srt_transcripts.data.decode('utf-8-sig'),
-        item,
-        lang
+        item
     )
+    return [
+        sjson_content(speed_subs, subs_id, item, lang)
+        for subs_id, speed_subs in generate_subs_for_speeds(result_subs_dict, 1, subs).iteritems()
+    ]
 
 
 def get_or_create_sjson(item):
@@ -432,6 +542,87 @@ def get_or_create_sjson(item):
     return sjson_transcript
 
 
+class TranscriptCache(object):
+    """
+    Size-bounded LRU cache of converted transcripts, shared by the threads of a process.
+
+    Keys are (asset location, format, language, content digest), so a re-uploaded
+    transcript is never served stale: its old entries simply age out.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the transcript cached under `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self.misses += 1
+            else:
+                # re-insert as most recently used
+                self._entries[key] = value
+                self.hits += 1
+        dog_stats_api.increment(
+            TRANSCRIPT_CACHE_METRIC_NAME, tags=[u'result:{}'.format('miss' if value is None else 'hit')]
+        )
+        return value
+
+    def set(self, key, value):
+        """
+        Cache `value` under `key`, evicting the least recently used transcripts to make room.
+        """
+        if len(value) > self.max_size:
+            return
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_size:
+                __, oldest = self._entries.popitem(last=False)
+                self.size -= len(oldest)
+                evicted += 1
+            self.evictions += evicted
+        if evicted:
+            dog_stats_api.increment(TRANSCRIPT_CACHE_METRIC_NAME, evicted, tags=[u'result:eviction'])
+        dog_stats_api.histogram(TRANSCRIPT_CACHE_METRIC_NAME + '.size', self.size)
+
+    def clear(self):
+        """
+        Drop every cached transcript and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Return a dict of the cache counters, for monitoring.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+TRANSCRIPT_CACHE = TranscriptCache(TRANSCRIPT_CACHE_MAX_SIZE)
+
+
 class Transcript(object):
     """
     Container for transcript methods.
@@ -488,8 +679,39 @@ class Transcript(object):
     def get_asset(location, filename):
         """
         Return asset by location and filename.
+
+        While servicing a request, assets are only read from the contentstore once.
+        """
+        asset_location = Transcript.asset_location(location, filename)
+        assets_cache = _transcript_assets_cache()
+        if assets_cache is None:
+            return contentstore().find(asset_location)
+        if asset_location not in assets_cache:
+            assets_cache[asset_location] = contentstore().find(asset_location)
+        return assets_cache[asset_location]
+
+    @staticmethod
+    def get_converted(location, filename, input_format, output_format, lang):
+        """
+        Return asset by location and filename, converted from `input_format` to `output_format`.
+
+        Conversions are served from TRANSCRIPT_CACHE when the stored content is unchanged,
+        in which case only the asset's metadata is read from the contentstore.
         """
-        return contentstore().find(Transcript.asset_location(location, filename))
+        asset_location = Transcript.asset_location(location, filename)
+        asset = contentstore().find(asset_location, as_stream=True)
+        try:
+            # getattr b/c caching may mean some pickled instances don't have attr
+            content_digest = getattr(asset, 'content_digest', None)
+            cache_key = (unicode(asset_location), output_format, lang, content_digest)
+            content = TRANSCRIPT_CACHE.get(cache_key) if content_digest else None
+            if content is None:
+                content = Transcript.convert(''.join(asset.stream_data()), input_format, output_format)
+                if content_digest and content:
+                    TRANSCRIPT_CACHE.set(cache_key, content)
+        finally:
+            asset.close()
+        return content
 
     @staticmethod
     def asset_location(location, filename):
@@ -503,6 +725,9 @@ class Transcript(object):
         """
         Delete asset by location and filename.
         """
+        assets_cache = _transcript_assets_cache()
+        if assets_cache is not None:
+            assets_cache.pop(Transcript.asset_location(location, filename), None)
         try:
             contentstore().delete(Transcript.asset_location(location, filename))
             log.info("Transcript asset %s was removed from store.", filename)
@@ -583,13 +808,13 @@ class VideoTranscriptsMixin(object):
                 log.debug("No subtitles for 'en' language")
                 raise ValueError
 
-            data = Transcript.asset(self.location, transcript_name, lang).data
+            content = Transcript.get_converted(
+                self.location, subs_filename(transcript_name, lang), 'sjson', transcript_format, lang
+            )
             filename = u'{}.{}'.format(transcript_name, transcript_format)
-            content = Transcript.convert(data, 'sjson', transcript_format)
         else:
-            data = Transcript.asset(self.location, None, None, self.transcripts[lang]).data
+            content = Transcript.get_converted(self.location, self.transcripts[lang], 'srt', transcript_format, lang)
             filename = u'{}.{}'.format(os.path.splitext(self.transcripts[lang])[0], transcript_format)
-            content = Transcript.convert(data, 'srt', transcript_format)
 
         if not content:
             log.debug('no subtitles produced in get_transcript')
@@ -109,7 +109,7 @@ class VideoStudentViewHandlers(object):
         if youtube_id:
             # Youtube case:
             if self.transcript_language == 'en':
-                return Transcript.asset(self.location, youtube_id).data
+                return Transcript.get_converted(self.location, subs_filename(youtube_id), 'sjson', 'sjson', 'en')
 
             youtube_ids = youtube_speed_dict(self)
             if youtube_id not in youtube_ids:
@@ -132,7 +132,7 @@ class VideoStudentViewHandlers(object):
         else:
             # HTML5 case
             if self.transcript_language == 'en':
-                return Transcript.asset(self.location, self.sub).data
+                return Transcript.get_converted(self.location, subs_filename(self.sub), 'sjson', 'sjson', 'en')
             else:
                 return get_or_create_sjson(self)
 
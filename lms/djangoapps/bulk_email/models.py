@@ -12,6 +12,8 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import string
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -150,6 +152,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Context values of course emails which differ for each recipient.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -228,6 +233,125 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile(self, plaintext, htmltext, context):
+        """
+        Compile the plain text and HTML messages of an email for its `context` common to all
+        recipients, which must include 'course_id', and return a `CourseEmailMerge` which
+        renders them for each recipient.
+        """
+        return CourseEmailMerge(self, plaintext, htmltext, context)
+
+
+def _escape_format(text):
+    """
+    Escape `text` so that formatting it with str.format() returns it unchanged.
+    """
+    return text.replace(u'{', u'{{').replace(u'}', u'}}')
+
+
+class MailMergeTemplate(object):
+    """
+    A course email template and message body, compiled for the context common to all the
+    recipients of the email.
+
+    Everything which does not depend on the recipient is formatted once, so that `render`
+    only fills in the recipient-specific values, while returning the same as
+    `CourseEmailTemplate._render(format_string, message_body, context)`.
+    """
+    def __init__(self, format_string, message_body, context):
+        self.message_body = message_body
+        self.has_keywords = '%%' in message_body
+        self.format_string = format_string
+        self.parts = None
+
+        index = format_string.find(COURSE_EMAIL_MESSAGE_BODY_TAG)
+        if index >= 0:
+            sections = [format_string[:index], format_string[index + len(COURSE_EMAIL_MESSAGE_BODY_TAG):]]
+        else:
+            sections = [format_string]
+        try:
+            self.parts = [self._compile(section, context) for section in sections]
+        except ValueError:
+            # The message body tag is part of a field or of an escaped brace: use the plain render instead.
+            log.warning("Could not compile course email template, rendering it for every recipient.")
+
+    @staticmethod
+    def _compile(format_string, context):
+        """
+        Format the fields of `format_string` which do not depend on the recipient.
+
+        Returns a (text, has_fields) pair: the format string of the fields left and the
+        formatted text around them, or the fully formatted text.
+        """
+        formatter = string.Formatter()
+        compiled = []
+        recipient_fields = False
+        for literal_text, field_name, format_spec, conversion in formatter.parse(format_string):
+            compiled.append(_escape_format(literal_text))
+            if field_name is None:
+                continue
+            field = u'{{{}{}{}}}'.format(
+                field_name,
+                u'!' + conversion if conversion else u'',
+                u':' + format_spec if format_spec else u'',
+            )
+            name = field_name.split('.', 1)[0].split('[', 1)[0]
+            if name in RECIPIENT_CONTEXT_KEYS or name not in context or '{' in format_spec:
+                compiled.append(field)
+                recipient_fields = True
+            else:
+                compiled.append(_escape_format(field.format(**context)))
+
+        compiled = u''.join(compiled)
+        return (compiled, True) if recipient_fields else (compiled.format(), False)
+
+    def render(self, context):
+        """
+        Create the message for the recipient of `context`.
+        """
+        if self.parts is None:
+            return CourseEmailTemplate._render(self.format_string, self.message_body, context)
+
+        sections = [text.format(**context) if has_fields else text for text, has_fields in self.parts]
+        if len(sections) == 1:
+            return wrap_message(sections[0])
+
+        message_body = self.message_body
+        if self.has_keywords and 'user_id' in context and 'course_id' in context:
+            message_body = substitute_keywords_with_data(message_body, context)
+        return wrap_message(sections[0] + message_body + sections[1])
+
+
+class CourseEmailMerge(object):
+    """
+    The plain text and HTML messages of a course email, compiled with its template for the
+    context common to all of its recipients.
+    """
+    def __init__(self, template, plaintext, htmltext, context):
+        self.context = dict(context)
+        self.plaintext = MailMergeTemplate(template.plain_template, plaintext, self.context)
+        self.html = MailMergeTemplate(template.html_template, htmltext, self.context)
+
+    def render(self, recipient):
+        """
+        Returns the (plain text, HTML) messages for `recipient`, a dict with the 'email',
+        'profile__name' and 'pk' of a user, as in the recipient lists of bulk email subtasks.
+        """
+        context = dict(self.context)
+        context['email'] = recipient['email']
+        context['name'] = recipient['profile__name']
+        context['user_id'] = recipient['pk']
+        return self.plaintext.render(context), self.html.render(context)
+
+    def render_many(self, recipients):
+        """
+        Yields a (recipient, plain text, HTML) tuple for each of `recipients`, rendering
+        each message only when it is asked for.
+        """
+        for recipient in recipients:
+            plaintext, html = self.render(recipient)
+            yield recipient, plaintext, html
+
 
 class CourseAuthorization(models.Model):
     """
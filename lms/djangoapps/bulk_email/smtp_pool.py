@@ -0,0 +1,172 @@
+"""
+A small pool of mail connections for sending the messages of a bulk email subtask.
+
+Each connection of the pool is used by its own sending thread, so that a subtask waits
+on several SMTP round trips at once instead of one after the other.  Messages are
+produced (rendered) by the calling thread, which also receives the outcome of every
+send, so all the accounting of a subtask stays in one thread.
+
+A pool of size one sends each message in the calling thread as it is submitted.
+"""
+from Queue import Queue, Empty
+import logging
+import threading
+import time
+
+import dogstats_wrapper as dog_stats_api
+
+log = logging.getLogger('edx.celery.task')
+
+
+class SendThrottle(object):
+    """
+    Spaces the start of consecutive sends, across all the threads sharing it, by at least
+    `min_interval` seconds.
+    """
+    def __init__(self, min_interval=0):
+        self.min_interval = min_interval
+        self._next_send = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Block until the next send may start.
+        """
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next_send)
+            self._next_send = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class SMTPConnectionPool(object):
+    """
+    Sends messages over `size` connections made by `connection_factory`.
+
+    `stop_on` is called with the exception of every failed send.  When it returns True, the
+    pool stops sending: messages which were already submitted but not sent yet are dropped.
+
+    `tags` are the metric tags of the timing of every send.
+    """
+    def __init__(self, connection_factory, size=1, throttle=None, stop_on=None, tags=None):
+        self.connection_factory = connection_factory
+        self.size = max(1, size)
+        self.throttle = throttle or SendThrottle()
+        self.stop_on = stop_on or (lambda exc: True)
+        self.tags = tags or []
+        self.connections = []
+        self._threads = []
+        self._stopped = threading.Event()
+        self._pending = Queue(maxsize=self.size * 2)
+        self._done = Queue()
+
+    @property
+    def stopped(self):
+        """
+        Whether a send failed with an error which stopped the pool.
+        """
+        return self._stopped.is_set()
+
+    def open(self):
+        """
+        Open the connections, and start a sending thread for each if there is more than one.
+
+        Connection errors are raised to the caller.
+        """
+        for __ in range(self.size):
+            connection = self.connection_factory()
+            self.connections.append(connection)
+            connection.open()
+
+        if self.size > 1:
+            for connection in self.connections:
+                thread = threading.Thread(target=self._work, args=(connection,), name='bulk-email-smtp')
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def close(self):
+        """
+        Stop the sending threads, and close the connections.
+        """
+        self._stopped.set()
+        for __ in self._threads:
+            self._pending.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        for connection in self.connections:
+            try:
+                connection.close()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to close bulk email connection")
+        self.connections = []
+
+    def imap(self, items):
+        """
+        Send the message of each (key, message) pair of `items`, and yield a (key, exception)
+        pair for each message whose send was attempted, as the sends complete.  The exception
+        is None for messages which were sent.
+
+        `items` is consumed lazily, by the calling thread, and not any further once the pool
+        has stopped.
+        """
+        for key, message in items:
+            if self.stopped:
+                break
+            if self._threads:
+                self._pending.put((key, message))
+            else:
+                self._done.put((key, self._send(self.connections[0], message)))
+            for result in self._completed():
+                yield result
+
+        if self._threads:
+            self._pending.join()
+        for result in self._completed():
+            yield result
+
+    def _completed(self):
+        """
+        Return the (key, exception) results which are ready.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._done.get_nowait())
+            except Empty:
+                return results
+
+    def _send(self, connection, message):
+        """
+        Send `message` over `connection`, and return the exception raised, if any.
+        """
+        self.throttle.wait()
+        try:
+            with dog_stats_api.timer('course_email.single_send.time.overall', tags=self.tags):
+                connection.send_messages([message])
+        except Exception as exc:  # pylint: disable=broad-except
+            if self.stop_on(exc):
+                self._stopped.set()
+            return exc
+        return None
+
+    def _work(self, connection):
+        """
+        Body of a sending thread: send the submitted messages over `connection` until
+        the pool is closed.
+        """
+        while True:
+            item = self._pending.get()
+            try:
+                if item is None:
+                    return
+                if not self.stopped:
+                    key, message = item
+                    self._done.put((key, self._send(connection, message)))
+            finally:
+                self._pending.task_done()
@@ -6,8 +6,8 @@ to a course.
 import re
 import random
 import json
-from time import sleep
 from collections import Counter
+from itertools import izip
 import logging
 
 import dogstats_wrapper as dog_stats_api
@@ -39,6 +39,7 @@ from bulk_email.models import (
     SEND_TO_MYSELF, SEND_TO_ALL, TO_OPTIONS,
     SEND_TO_STAFF,
 )
+from bulk_email.smtp_pool import SMTPConnectionPool, SendThrottle
 from courseware.courses import get_course, course_image_url
 from student.roles import CourseStaffRole, CourseInstructorRole
 from instructor_task.models import InstructorTask
@@ -47,12 +48,17 @@ from instructor_task.subtasks import (
     queue_subtasks_for_query,
     check_subtask_is_valid,
     update_subtask_status,
+    is_pk_range_list,
+    get_items_in_pk_ranges,
 )
 from util.query import use_read_replica_if_available
 from util.date_utils import get_default_time_display
 
 log = logging.getLogger('edx.celery.task')
 
+# Fields of the users passed to subtasks as recipients, in addition to 'pk'.
+RECIPIENT_FIELDS = ['profile__name', 'email']
+
 
 # Errors that an individual email is failing to be sent, and should just
 # be treated as a fail.
@@ -95,6 +101,17 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
+def _is_single_email_failure(exc):
+    """
+    Returns whether `exc`, raised when sending an email to one recipient, means only that
+    this email could not be delivered, so that sending should go on with the next recipient.
+    """
+    if isinstance(exc, SMTPDataError):
+        # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+        return not 400 <= exc.smtp_code < 500
+    return isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS)
+
+
 def _get_recipient_querysets(user_id, to_option, course_id):
     """
     Returns a list of query sets of email recipients corresponding to the
@@ -224,7 +241,6 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     global_email_context = _get_course_email_context(course)
 
     recipient_qsets = _get_recipient_querysets(user_id, to_option, course_id)
-    recipient_fields = ['profile__name', 'email']
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s, to_option %s",
              task_id, course_id, email_id, to_option)
@@ -258,9 +274,10 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         action_name,
         _create_send_email_subtask,
         recipient_qsets,
-        recipient_fields,
+        RECIPIENT_FIELDS,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
+        pk_ranges=settings.BULK_EMAIL_SUBTASK_PK_RANGES,
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -283,6 +300,8 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
         - 'profile__name': full name of User.
         - 'email': email address of User.
         - 'pk': primary key of User model.
+        When subtasks are queued with settings.BULK_EMAIL_SUBTASK_PK_RANGES, the initial call
+        instead receives the ranges of pks of its recipients, and fetches them itself.
       * `global_email_context`: dict containing values that are unique for this email but the same
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
@@ -326,6 +345,10 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
     send_exception = None
     new_subtask_status = None
     try:
+        if is_pk_range_list(to_list):
+            to_list = _get_recipients_in_pk_ranges(entry_id, email_id, to_list)
+            num_to_send = len(to_list)
+
         course_title = global_email_context['course_title']
         with dog_stats_api.timer('course_email.single_task.time.overall', tags=[_statsd_tag(course_title)]):
             new_subtask_status, send_exception = _send_course_email(
@@ -366,6 +389,17 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
     return new_subtask_status.to_dict()
 
 
+def _get_recipients_in_pk_ranges(entry_id, email_id, pk_ranges):
+    """
+    Returns the recipients of the email in `pk_ranges`, for a subtask queued with ranges of
+    recipient pks, in the same form as the to_list of other subtasks.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_email = CourseEmail.objects.get(id=email_id)
+    recipient_qsets = _get_recipient_querysets(entry.requester.id, course_email.to_option, course_email.course_id)
+    return get_items_in_pk_ranges(recipient_qsets, RECIPIENT_FIELDS, pk_ranges)
+
+
 def _filter_optouts_from_recipients(to_list, course_id):
     """
     Filters a recipient list based on student opt-outs for a given course.
@@ -440,7 +474,6 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     parent_task_id = InstructorTask.objects.get(pk=entry_id).task_id
     task_id = subtask_status.task_id
     total_recipients = len(to_list)
-    recipient_num = 0
     total_recipients_successful = 0
     total_recipients_failed = 0
     recipients_info = Counter()
@@ -483,51 +516,50 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
-    try:
-        connection = get_connection()
-        connection.open()
-
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
-
-        while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
 
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+    # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+    # but if a task has been retried for rate-limiting reasons, then we space out
+    # all the emails within this task.  Choice of the value depends on the number of
+    # workers that might be sending email in parallel, and what the SES throttle rate is.
+    max_sends_per_second = settings.BULK_EMAIL_MAX_SENDS_PER_SECOND
+    min_interval = 1.0 / max_sends_per_second if max_sends_per_second else 0
+    if subtask_status.retried_nomax > 0:
+        min_interval = max(min_interval, settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+
+    connection_pool = SMTPConnectionPool(
+        get_connection,
+        size=settings.BULK_EMAIL_SMTP_CONNECTIONS,
+        throttle=SendThrottle(min_interval),
+        stop_on=lambda exc: not _is_single_email_failure(exc),
+        tags=[_statsd_tag(course_title)],
+    )
+    try:
+        connection_pool.open()
+
+        # Compile the message content with the context values to use in all course emails,
+        # so that only the user-specific values are filled in for each recipient:
+        email_context = dict(global_email_context, course_id=course_email.course_id)
+        email_merge = course_email_template.compile(course_email.text_message, course_email.html_message, email_context)
+
+        def generate_messages():
+            """
+            Yields a ((index in to_list, recipient number), message) pair for each recipient,
+            starting with the recipient at the end of the to_list.
+            """
+            indexes = xrange(len(to_list) - 1, -1, -1)
+            for index, (current_recipient, plaintext_msg, html_msg) in izip(indexes, email_merge.render_many(reversed(to_list))):
+                recipient_num = len(to_list) - index
+                email = current_recipient['email']
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    subject,
+                    plaintext_msg,
+                    from_addr,
+                    [email],
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
 
-            try:
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
@@ -539,82 +571,101 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     current_recipient['profile__name'],
                     email
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+                yield (index, recipient_num), email_msg
+
+        # The messages are sent concurrently when the pool has several connections, so recipients
+        # complete in any order.  Only once a recipient has been processed is it removed from the
+        # to_list.  That way, the to_list will always contain the recipients remaining to be emailed.
+        # This is convenient for retries, which will need to send to those who haven't
+        # yet been emailed, but not send to those who have already been sent to.
+        processed = set()
+        send_exception = None
+        try:
+            for (index, recipient_num), exc in connection_pool.imap(generate_messages()):
+                email = to_list[index]['email']
+
+                if isinstance(exc, SMTPDataError):
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if not _is_single_email_failure(exc):
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        send_exception = send_exception or exc
+                        continue
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
                         recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
+                elif exc is not None:
+                    # Any other error is handled by the outer handlers, once the sends
+                    # already under way have completed.
+                    send_exception = send_exception or exc
+                    continue
 
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                recipients_info[email] += 1
+                processed.add(index)
+        finally:
+            to_list[:] = [recipient for index, recipient in enumerate(to_list) if index not in processed]
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+        if send_exception is not None:
+            raise send_exception  # pylint: disable=raising-bad-type
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -693,7 +744,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        connection_pool.close()
 
 
 def _get_current_task():
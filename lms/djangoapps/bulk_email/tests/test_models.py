@@ -137,6 +137,51 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def _get_sample_recipients(self):
+        """Provide sample recipients, as in the recipient lists of bulk email subtasks"""
+        user = UserFactory.create()
+        return [
+            {'email': user.email, 'profile__name': u'Fr\xe9d\xe9ric', 'pk': user.id},
+            {'email': 'other@test.com', 'profile__name': 'Other {name}', 'pk': user.id},
+        ]
+
+    def test_compiled_render(self):
+        # The compiled messages are the same as those rendered from scratch for every recipient.
+        message = "<p>Dear %%USER_FULLNAME%% (%%USER_ID%%), welcome to %%COURSE_DISPLAY_NAME%%.</p>"
+        for template in CourseEmailTemplate.objects.all():
+            context = self._get_sample_html_context()
+            context['course_id'] = SlashSeparatedCourseKey('abc', '123', 'doremi')
+            email_merge = template.compile(message, message, context)
+            for recipient in self._get_sample_recipients():
+                recipient_context = dict(context, email=recipient['email'], name=recipient['profile__name'])
+                recipient_context['user_id'] = recipient['pk']
+                self.assertEquals(email_merge.render(recipient), (
+                    template.render_plaintext(message, recipient_context),
+                    template.render_htmltext(message, recipient_context),
+                ))
+
+    def test_compiled_render_many(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        context['course_id'] = SlashSeparatedCourseKey('abc', '123', 'doremi')
+        del context['email']
+        recipients = self._get_sample_recipients()
+        email_merge = template.compile("My new plain text.", "My new html text.", context)
+        rendered = list(email_merge.render_many(recipients))
+        self.assertEquals([recipient for recipient, __, __ in rendered], recipients)
+        for recipient, plaintext, html in rendered:
+            self.assertIn(recipient['email'], plaintext)
+            self.assertIn("My new plain text.", plaintext)
+            self.assertIn("My new html text.", html)
+
+    def test_compiled_render_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        del context['course_title']
+        email_merge = template.compile("My new plain text.", "My new html text.", context)
+        with self.assertRaises(KeyError):
+            email_merge.render(self._get_sample_recipients()[0])
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
@@ -0,0 +1,110 @@
+"""
+Unit tests for sending bulk email over a pool of connections, against a local SMTP server.
+"""
+import asyncore
+import smtpd
+from smtplib import SMTPDataError
+import threading
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.test import TestCase
+
+from bulk_email.smtp_pool import SMTPConnectionPool, SendThrottle
+
+
+class LocalSMTPServer(smtpd.SMTPServer):
+    """
+    SMTP server recording the recipients of the messages it accepts, and rejecting
+    messages to addresses starting with 'bounce'.
+    """
+    def __init__(self):
+        smtpd.SMTPServer.__init__(self, ('127.0.0.1', 0), None)
+        self.port = self.socket.getsockname()[1]
+        self.recipients = []
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        if any(rcpt.startswith('bounce') for rcpt in rcpttos):
+            return '554 Address rejected'
+        self.recipients.extend(rcpttos)
+
+
+class SMTPConnectionPoolTest(TestCase):
+    """
+    Tests of SMTPConnectionPool.
+    """
+    def setUp(self):
+        super(SMTPConnectionPoolTest, self).setUp()
+        self.server = LocalSMTPServer()
+        self.serving = True
+        self.server_thread = threading.Thread(target=self._serve)
+        self.server_thread.start()
+        self.addCleanup(self._stop_serving)
+
+    def _serve(self):
+        """
+        Run the local SMTP server until the test ends.
+        """
+        while self.serving:
+            asyncore.loop(timeout=0.01, count=1)
+
+    def _stop_serving(self):
+        """
+        Stop and close the local SMTP server.
+        """
+        self.serving = False
+        self.server_thread.join()
+        self.server.close()
+
+    def _connection(self):
+        """
+        Return a new connection to the local SMTP server.
+        """
+        return get_connection('django.core.mail.backends.smtp.EmailBackend', host='127.0.0.1', port=self.server.port)
+
+    def _send(self, addresses, **kwargs):
+        """
+        Send a message to each of `addresses` over a new pool, and return the results by address.
+        """
+        pool = SMTPConnectionPool(self._connection, **kwargs)
+        messages = (
+            (address, EmailMessage('Subject', 'Body', 'course@example.com', [address]))
+            for address in addresses
+        )
+        pool.open()
+        try:
+            return dict(pool.imap(messages))
+        finally:
+            pool.close()
+
+    def test_send_over_several_connections(self):
+        addresses = ['learner{}@example.com'.format(num) for num in range(20)]
+        results = self._send(addresses, size=3)
+        self.assertEqual(results, {address: None for address in addresses})
+        self.assertItemsEqual(self.server.recipients, addresses)
+
+    def test_send_inline(self):
+        addresses = ['learner{}@example.com'.format(num) for num in range(5)]
+        results = self._send(addresses, size=1)
+        self.assertEqual(results, {address: None for address in addresses})
+        self.assertEqual(self.server.recipients, addresses)
+
+    def test_failures_which_do_not_stop(self):
+        addresses = ['learner{}@example.com'.format(num) for num in range(10)] + ['bounce@example.com']
+        results = self._send(addresses, size=3, stop_on=lambda exc: False)
+        self.assertIsInstance(results.pop('bounce@example.com'), SMTPDataError)
+        self.assertEqual(results, {address: None for address in addresses[:-1]})
+        self.assertItemsEqual(self.server.recipients, addresses[:-1])
+
+    def test_failure_which_stops(self):
+        addresses = ['bounce@example.com'] + ['learner{}@example.com'.format(num) for num in range(10)]
+        results = self._send(addresses, size=1)
+        self.assertEqual(results.keys(), ['bounce@example.com'])
+        self.assertEqual(self.server.recipients, [])
+
+    def test_throttle(self):
+        addresses = ['learner{}@example.com'.format(num) for num in range(5)]
+        start = time.time()
+        self._send(addresses, size=2, throttle=SendThrottle(0.05))
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        self.assertItemsEqual(self.server.recipients, addresses)
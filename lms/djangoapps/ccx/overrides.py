@@ -9,7 +9,11 @@ from contextlib import contextmanager
 
 from django.db import transaction, IntegrityError
 
-from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
+from courseware.field_overrides import (  # pylint: disable=import-error
+    FieldOverrideProvider,
+    clear_prefetched_overrides,
+    prefetched_overrides,
+)
 from ccx import ACTIVE_CCX_KEY  # pylint: disable=import-error
 
 from .models import CcxMembership, CcxFieldOverride
@@ -93,18 +97,33 @@ def _get_overrides_for_ccx(ccx, block):
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
     """
-    overrides = {}
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=block.location
+    prefetched = prefetched_overrides(
+        _ccx_overrides_key(ccx),
+        lambda: CcxFieldOverride.objects.filter(ccx=ccx).values_list('location', 'field', 'value')
     )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    if prefetched is None:
+        serialized = CcxFieldOverride.objects.filter(
+            ccx=ccx,
+            location=block.location
+        ).values_list('field', 'value')
+    else:
+        location = CcxFieldOverride._meta.get_field('location').get_prep_value(block.location)
+        serialized = prefetched.get(location, {}).items()
+
+    overrides = {}
+    for name, value in serialized:
+        field = block.fields[name]
+        overrides[name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _ccx_overrides_key(ccx):
+    """
+    Returns the key under which the overrides for `ccx` are prefetched.
+    """
+    return ('ccx', ccx.id)
+
+
 @transaction.commit_on_success
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -128,8 +147,9 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
+    clear_prefetched_overrides(_ccx_overrides_key(ccx))
     if hasattr(block, '_ccx_overrides'):
-        del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+        block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -145,8 +165,9 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
+        clear_prefetched_overrides(_ccx_overrides_key(ccx))
         if hasattr(block, '_ccx_overrides'):
-            del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+            block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
 
     except CcxFieldOverride.DoesNotExist:
         pass
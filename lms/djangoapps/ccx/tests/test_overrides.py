@@ -7,13 +7,15 @@ import pytz
 from nose.plugins.attrib import attr
 
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
+from request_cache.middleware import RequestCache
 from student.tests.factories import AdminFactory  # pylint: disable=import-error
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from ..models import CustomCourseForEdX
-from ..overrides import override_field_for_ccx
+from ..overrides import clear_override_for_ccx, override_field_for_ccx
 
 from .test_views import flatten, iter_blocks
 
@@ -129,3 +131,30 @@ class TestFieldOverrides(ModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    def test_overrides_prefetched_per_request(self):
+        """
+        Test that overrides for every block are loaded with a single query
+        while a request is being serviced, and that setting or clearing an
+        override invalidates the prefetched overrides.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        middleware = RequestCache()
+        middleware.process_request(RequestFactory().get('/'))
+        self.addCleanup(middleware.clear_request_cache)
+
+        with self.assertNumQueries(1):
+            for chapter in chapters:
+                for block in iter_blocks(chapter):
+                    self.assertEquals(block.start, ccx_start)
+
+        ccx_start = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, chapters[0], 'start', ccx_start)
+        self.assertEquals(chapters[0].start, ccx_start)
+
+        clear_override_for_ccx(self.ccx, chapters[0], 'start')
+        self.assertEquals(chapters[0].start, self.mooc_start)
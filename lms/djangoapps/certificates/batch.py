@@ -0,0 +1,218 @@
+"""
+Generate the certificates of every student enrolled in a course, in batches.
+
+`add_cert` looks up everything it needs about a student with a few queries of its own,
+and grades and queues one student at a time.  For a whole course, the students are
+instead processed in batches of enrollments, in user id order:
+
+  * the certificate statuses, enrollment modes and profiles of a batch are fetched with
+    one query each, and the course whitelist with one query for the whole run;
+  * the students of a batch who need a certificate are graded, optionally over a pool
+    of worker processes;
+  * their XQueue tasks are sent over several concurrent requests.
+
+After every batch, the progress is reported with the id of the last user processed,
+which can be given as `after_user_id` to resume an interrupted run.
+"""
+from collections import Counter
+import logging
+import multiprocessing
+
+from django.contrib.auth.models import User
+from django.db import connections
+
+from courseware import grades
+from student.models import CourseEnrollment, UserProfile
+from xmodule.modulestore.django import modulestore
+
+from certificates.models import CertificateStatuses, CertificateWhitelist, GeneratedCertificate
+from certificates.queue import XQueueCertInterface
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of enrollments processed in each batch
+CERTIFICATE_BATCH_SIZE = 500
+
+# Number of XQueue tasks sent concurrently
+CERTIFICATE_XQUEUE_THREADS = 4
+
+# Courses loaded by this process, by course key: the course of the current run in
+# the process generating the certificates, and the courses graded by a worker process
+_COURSES = {}
+
+
+def _get_course(course_key):
+    """
+    Return the course for `course_key`, loading it only once per process.
+    """
+    if course_key not in _COURSES:
+        _COURSES[course_key] = modulestore().get_course(course_key, depth=2)
+    return _COURSES[course_key]
+
+
+def grade_students(course_key, user_ids):
+    """
+    Grade the students with ids `user_ids` in the course, and return a list of
+    (user id, grade, error message) tuples, where the grade only has the 'grade'
+    and 'percent' fields used for certificates, so that it can be returned by a
+    worker process.  The error message is empty if the student was graded.
+    """
+    students = User.objects.filter(id__in=user_ids)
+    return [
+        (student.id, {'grade': gradeset.get('grade'), 'percent': gradeset.get('percent')}, err_msg)
+        for student, gradeset, err_msg in grades.iterate_grades_for(_get_course(course_key), students)
+    ]
+
+
+def _grade_students_star(args):
+    """
+    Unpack the argument tuple for `grade_students`; used as the worker function
+    of the process pool in `generate_certificates`.
+    """
+    return grade_students(*args)
+
+
+def _enrollment_batches(course_key, batch_size, after_user_id):
+    """
+    Yield lists of the (user id, enrollment mode) of the students enrolled in the
+    course, in batches of `batch_size` in user id order, starting after `after_user_id`.
+    """
+    enrollments = CourseEnrollment.objects.filter(course_id=course_key).order_by('user__id')
+    while True:
+        batch = list(enrollments.filter(user__id__gt=after_user_id).values_list('user_id', 'mode')[:batch_size])
+        if not batch:
+            return
+        yield batch
+        after_user_id = batch[-1][0]
+
+
+def _chunks(items, count):
+    """
+    Split `items` into at most `count` lists of similar length.
+    """
+    size = -(-len(items) // count)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def generate_certificates(
+        course_key, valid_statuses=(CertificateStatuses.unavailable,), after_user_id=0,
+        batch_size=CERTIFICATE_BATCH_SIZE, processes=1, xqueue_threads=CERTIFICATE_XQUEUE_THREADS,
+        insecure=False, noop=False
+):
+    """
+    Request certificates for the students enrolled in the course whose certificate
+    status is one of `valid_statuses`, starting after the user `after_user_id`.
+
+    Students who cannot be graded, or who have no profile, are skipped: their status
+    is unchanged, so that a later run picks them up again.
+
+    With `noop`, nothing is graded nor queued, and the students who would have been are
+    only counted.
+
+    Yields a dict reporting the progress after each batch, with:
+      'last_user_id' - the id of the last user of the batch
+      'students' - the number of enrollments processed so far
+      'statuses' - a Counter of the new certificate statuses so far, with the
+                   'skipped' students who could not be processed
+    """
+    valid_statuses = set(valid_statuses) & set(XQueueCertInterface.VALID_STATUSES)
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    # prefetch all chapters/sequentials by saying depth=2; forked workers inherit the course
+    course = _COURSES[course_key] = modulestore().get_course(course_key, depth=2)
+    whitelisted_ids = set(
+        CertificateWhitelist.objects.filter(course_id=course_key, whitelist=True).values_list('user_id', flat=True)
+    )
+    progress = {'last_user_id': after_user_id, 'students': 0, 'statuses': Counter()}
+
+    pool = None
+    if processes > 1 and not noop:
+        # Forked workers must not share the parent's database connections,
+        # so close them here; Django reopens them lazily on next use.
+        for connection in connections.all():
+            connection.close()
+        pool = multiprocessing.Pool(processes)
+
+    try:
+        for batch in _enrollment_batches(course_key, batch_size, after_user_id):
+            user_ids = [user_id for user_id, __ in batch]
+            cert_statuses = dict(
+                GeneratedCertificate.objects.filter(
+                    course_id=course_key, user__id__in=user_ids
+                ).values_list('user_id', 'status')
+            )
+            candidate_modes = dict(
+                (user_id, mode) for user_id, mode in batch
+                if cert_statuses.get(user_id, CertificateStatuses.unavailable) in valid_statuses
+            )
+
+            if noop:
+                progress['statuses']['candidates'] += len(candidate_modes)
+            elif candidate_modes:
+                _create_certificates(
+                    xqueue, course, candidate_modes, whitelisted_ids, pool, processes, xqueue_threads,
+                    progress['statuses']
+                )
+
+            progress['last_user_id'] = user_ids[-1]
+            progress['students'] += len(batch)
+            yield progress
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def _create_certificates(
+        xqueue, course, enrollment_modes, whitelisted_ids, pool, processes, xqueue_threads, statuses
+):
+    """
+    Grade the students of `enrollment_modes` (user id -> enrollment mode), over the
+    `processes` workers of `pool` if there is one, update their certificates and send
+    the XQueue tasks of those who get one, counting the new certificate statuses in `statuses`.
+    """
+    user_ids = sorted(enrollment_modes)
+    if pool is not None:
+        graded = []
+        chunks = [(course.id, chunk) for chunk in _chunks(user_ids, processes)]
+        for results in pool.imap_unordered(_grade_students_star, chunks):
+            graded.extend(results)
+    else:
+        graded = grade_students(course.id, user_ids)
+
+    students = User.objects.in_bulk(user_ids)
+    profiles = dict(
+        (user_id, (name, allow_certificate))
+        for user_id, name, allow_certificate
+        in UserProfile.objects.filter(user__id__in=user_ids).values_list('user_id', 'name', 'allow_certificate')
+    )
+
+    xqueue_batch = []
+    for user_id, grade, err_msg in graded:
+        if err_msg or user_id not in profiles:
+            LOGGER.warning(
+                u"Skipped certificate generation for student %s in course '%s': %s",
+                user_id,
+                unicode(course.id),
+                err_msg or u"the student has no profile"
+            )
+            statuses['skipped'] += 1
+            continue
+
+        profile_name, allow_certificate = profiles[user_id]
+        new_status = xqueue.create_cert(
+            students[user_id],
+            course.id,
+            course,
+            grade,
+            profile_name=profile_name,
+            is_whitelisted=user_id in whitelisted_ids,
+            is_restricted=not allow_certificate,
+            enrollment_mode=enrollment_modes[user_id],
+            xqueue_batch=xqueue_batch,
+        )
+        if new_status != CertificateStatuses.generating:
+            statuses[new_status] += 1
+
+    statuses.update(xqueue.send_batch(xqueue_batch, threads=xqueue_threads))
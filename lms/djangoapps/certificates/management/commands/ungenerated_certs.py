@@ -6,15 +6,13 @@ import logging
 import datetime
 from pytz import UTC
 from django.core.management.base import BaseCommand, CommandError
-from certificates.models import certificate_status_for_student
-from certificates.queue import XQueueCertInterface
-from django.contrib.auth.models import User
+from certificates.batch import CERTIFICATE_BATCH_SIZE, generate_certificates
 from optparse import make_option
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
-from xmodule.modulestore.django import modulestore
 from certificates.models import CertificateStatuses
+from student.models import CourseEnrollment
 
 
 LOGGER = logging.getLogger(__name__)
@@ -30,6 +28,10 @@ class Command(BaseCommand):
 
     Use the --noop option to test without actually putting certificates on the
     queue to be generated.
+
+    Students are processed in batches, in user id order.  The id of the last
+    user of every batch is printed, so that an interrupted run can be resumed
+    after it with --resume-after.
     """
 
     option_list = BaseCommand.option_list + (
@@ -57,6 +59,22 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('--batch-size',
+                    type='int',
+                    dest='batch_size',
+                    default=CERTIFICATE_BATCH_SIZE,
+                    help='Number of enrolled students processed in each batch'),
+        make_option('--processes',
+                    type='int',
+                    dest='processes',
+                    default=1,
+                    help='Number of processes grading students in parallel'),
+        make_option('--resume-after',
+                    metavar='USER_ID',
+                    type='int',
+                    dest='resume_after',
+                    default=0,
+                    help='Only process the students with a user id greater than USER_ID'),
     )
 
     def handle(self, *args, **options):
@@ -79,10 +97,6 @@ class Command(BaseCommand):
         else:
             valid_statuses = [CertificateStatuses.unavailable]
 
-        # Print update after this many students
-
-        STATUS_INTERVAL = 500
-
         if options['course']:
             # try to parse out the course from the serialized form
             try:
@@ -101,89 +115,35 @@ class Command(BaseCommand):
             raise CommandError("You must specify a course")
 
         for course_key in ended_courses:
-            # prefetch all chapters/sequentials by saying depth=2
-            course = modulestore().get_course(course_key, depth=2)
-
-            enrolled_students = User.objects.filter(
-                courseenrollment__course_id=course_key
-            )
-
-            xq = XQueueCertInterface()
-            if options['insecure']:
-                xq.use_https = False
-            total = enrolled_students.count()
-            count = 0
+            total = CourseEnrollment.objects.filter(course_id=course_key).count()
             start = datetime.datetime.now(UTC)
-
-            for student in enrolled_students:
-                count += 1
-                if count % STATUS_INTERVAL == 0:
-                    # Print a status update with an approximation of
-                    # how much time is left based on how long the last
-                    # interval took
-                    diff = datetime.datetime.now(UTC) - start
-                    timeleft = diff * (total - count) / STATUS_INTERVAL
-                    hours, remainder = divmod(timeleft.seconds, 3600)
-                    minutes, _seconds = divmod(remainder, 60)
-                    print "{0}/{1} completed ~{2:02}:{3:02}m remaining".format(
-                        count, total, hours, minutes)
-                    start = datetime.datetime.now(UTC)
-
-                cert_status = certificate_status_for_student(student, course_key)['status']
-                LOGGER.info(
-                    (
-                        u"Student %s has certificate status '%s' "
-                        u"in course '%s'"
-                    ),
-                    student.id,
-                    cert_status,
-                    unicode(course_key)
-                )
-
-                if cert_status in valid_statuses:
-
-                    if not options['noop']:
-                        # Add the certificate request to the queue
-                        ret = xq.add_cert(student, course_key, course=course)
-
-                        if ret == 'generating':
-                            LOGGER.info(
-                                (
-                                    u"Added a certificate generation task to the XQueue "
-                                    u"for student %s in course '%s'. "
-                                    u"The new certificate status is '%s'."
-                                ),
-                                student.id,
-                                unicode(course_key),
-                                ret
-                            )
-
-                    else:
-                        LOGGER.info(
-                            (
-                                u"Skipping certificate generation for "
-                                u"student %s in course '%s' "
-                                u"because the noop flag is set."
-                            ),
-                            student.id,
-                            unicode(course_key)
-                        )
-
-                else:
-                    LOGGER.info(
-                        (
-                            u"Skipped student %s because "
-                            u"certificate status '%s' is not in %s"
-                        ),
-                        student.id,
-                        cert_status,
-                        unicode(valid_statuses)
-                    )
+            progress = None
+
+            for progress in generate_certificates(
+                    course_key,
+                    valid_statuses=valid_statuses,
+                    after_user_id=options['resume_after'],
+                    batch_size=options['batch_size'],
+                    processes=options['processes'],
+                    insecure=options['insecure'],
+                    noop=options['noop'],
+            ):
+                # Print a status update with an approximation of
+                # how much time is left based on how long the
+                # batches have taken so far
+                count = progress['students']
+                diff = datetime.datetime.now(UTC) - start
+                timeleft = diff * max(total - count, 0) / count
+                hours, remainder = divmod(timeleft.seconds, 3600)
+                minutes, _seconds = divmod(remainder, 60)
+                print "{0}/{1} completed ~{2:02}:{3:02}m remaining, last user {4} (use --resume-after {4})".format(
+                    count, total, hours, minutes, progress['last_user_id'])
 
             LOGGER.info(
                 (
                     u"Completed ungenerated certificates command "
-                    u"for course '%s'"
+                    u"for course '%s' with certificate statuses %s"
                 ),
-                unicode(course_key)
+                unicode(course_key),
+                unicode(dict(progress['statuses']) if progress else {})
             )
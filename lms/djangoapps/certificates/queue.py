@@ -2,6 +2,7 @@
 import json
 import random
 import logging
+from multiprocessing.pool import ThreadPool
 import lxml.html
 from lxml.etree import XMLSyntaxError, ParserError  # pylint:disable=no-name-in-module
 
@@ -78,6 +79,16 @@ class XQueueCertInterface(object):
 
     """
 
+    # Certificate statuses from which a new certificate can be requested
+    VALID_STATUSES = [
+        status.generating,
+        status.unavailable,
+        status.deleted,
+        status.error,
+        status.notpassing,
+        status.downloadable
+    ]
+
     def __init__(self, request=None):
 
         # Get basic auth (username/password) for
@@ -201,19 +212,10 @@ class XQueueCertInterface(object):
         Returns the student's status
         """
 
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable
-        ]
-
         cert_status = certificate_status_for_student(student, course_id)['status']
         new_status = cert_status
 
-        if cert_status not in valid_statuses:
+        if cert_status not in self.VALID_STATUSES:
             LOGGER.warning(
                 (
                     u"Cannot create certificate generation task for user %s "
@@ -223,7 +225,7 @@ class XQueueCertInterface(object):
                 student.id,
                 unicode(course_id),
                 cert_status,
-                unicode(valid_statuses)
+                unicode(self.VALID_STATUSES)
             )
         else:
             # grade the student
@@ -233,159 +235,247 @@ class XQueueCertInterface(object):
             if course is None:
                 course = modulestore().get_course(course_id, depth=0)
             profile = UserProfile.objects.get(user=student)
-            profile_name = profile.name
 
             # Needed
             self.request.user = student
             self.request.session = {}
 
-            course_name = course.display_name or unicode(course_id)
             is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
             grade = grades.grade(student, self.request, course)
             enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-            mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
-            user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
-            user_is_reverified = SoftwareSecurePhotoVerification.user_is_reverified_for_all(course_id, student)
-            cert_mode = enrollment_mode
-            if (mode_is_verified and user_is_verified and user_is_reverified):
-                template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
-            elif (mode_is_verified and not (user_is_verified and user_is_reverified)):
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-                cert_mode = GeneratedCertificate.MODES.honor
-            else:
-                # honor code and audit students
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-            if forced_grade:
-                grade['grade'] = forced_grade
+            new_status = self.create_cert(
+                student,
+                course_id,
+                course,
+                grade,
+                profile_name=profile.name,
+                is_whitelisted=is_whitelisted,
+                is_restricted=self.restricted.filter(user=student).exists(),
+                enrollment_mode=enrollment_mode,
+                forced_grade=forced_grade,
+                template_file=template_file,
+            )
 
-            cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+        return new_status
 
-            if not created:
-                LOGGER.info(
-                    u"Regenerate certificate for user %s in course %s "
-                    u"with status %s, download_uuid %s, "
-                    u"and download_url %s",
-                    cert.user.id, unicode(cert.course_id),
-                    cert.status, cert.download_uuid, cert.download_url
-                )
+    def create_cert(
+            self, student, course_id, course, grade, profile_name, is_whitelisted, is_restricted, enrollment_mode,
+            forced_grade=None, template_file=None, xqueue_batch=None
+    ):
+        """
+        Update the certificate of a student who has been graded, and request its generation if
+        the student passed or is whitelisted.  This is the part of `add_cert` which follows
+        grading, for callers which fetch the other facts about the student themselves.
 
-            cert.mode = cert_mode
-            cert.user = student
-            cert.grade = grade['percent']
-            cert.course_id = course_id
-            cert.name = profile_name
-            cert.download_url = ''
-            # Strip HTML from grade range label
-            grade_contents = grade.get('grade', None)
-            try:
-                grade_contents = lxml.html.fromstring(grade_contents).text_content()
-            except (TypeError, XMLSyntaxError, ParserError) as exc:
+        Arguments:
+          grade - the grade summary of the student, as returned by grades.grade
+          profile_name - the name in the profile of the student
+          is_whitelisted - whether the student is whitelisted in the course
+          is_restricted - whether the student's profile does not allow certificates
+          enrollment_mode - the mode of the student's enrollment in the course
+          xqueue_batch - if given, a list to append the XQueue task to, for
+                         `send_batch`, instead of sending it right away
+
+        Returns the student's new status
+        """
+        course_name = course.display_name or unicode(course_id)
+        mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
+        # Only verified enrollments depend on the verification status
+        user_is_verified = mode_is_verified and SoftwareSecurePhotoVerification.user_is_verified(student)
+        user_is_reverified = mode_is_verified and SoftwareSecurePhotoVerification.user_is_reverified_for_all(
+            course_id, student
+        )
+        cert_mode = enrollment_mode
+        if (mode_is_verified and user_is_verified and user_is_reverified):
+            template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
+        elif (mode_is_verified and not (user_is_verified and user_is_reverified)):
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+            cert_mode = GeneratedCertificate.MODES.honor
+        else:
+            # honor code and audit students
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+        if forced_grade:
+            grade['grade'] = forced_grade
+
+        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+
+        if not created:
+            LOGGER.info(
+                u"Regenerate certificate for user %s in course %s "
+                u"with status %s, download_uuid %s, "
+                u"and download_url %s",
+                cert.user.id, unicode(cert.course_id),
+                cert.status, cert.download_uuid, cert.download_url
+            )
+
+        cert.mode = cert_mode
+        cert.user = student
+        cert.grade = grade['percent']
+        cert.course_id = course_id
+        cert.name = profile_name
+        cert.download_url = ''
+        # Strip HTML from grade range label
+        grade_contents = grade.get('grade', None)
+        try:
+            grade_contents = lxml.html.fromstring(grade_contents).text_content()
+        except (TypeError, XMLSyntaxError, ParserError) as exc:
+            LOGGER.info(
+                (
+                    u"Could not retrieve grade for student %s "
+                    u"in the course '%s' "
+                    u"because an exception occurred while parsing the "
+                    u"grade contents '%s' as HTML. "
+                    u"The exception was: '%s'"
+                ),
+                student.id,
+                unicode(course_id),
+                grade_contents,
+                unicode(exc)
+            )
+
+            #   Despite blowing up the xml parser, bad values here are fine
+            grade_contents = None
+
+        if is_whitelisted or grade_contents is not None:
+
+            if is_whitelisted:
                 LOGGER.info(
-                    (
-                        u"Could not retrieve grade for student %s "
-                        u"in the course '%s' "
-                        u"because an exception occurred while parsing the "
-                        u"grade contents '%s' as HTML. "
-                        u"The exception was: '%s'"
-                    ),
+                    u"Student %s is whitelisted in '%s'",
                     student.id,
-                    unicode(course_id),
-                    grade_contents,
-                    unicode(exc)
+                    unicode(course_id)
                 )
 
-                #   Despite blowing up the xml parser, bad values here are fine
-                grade_contents = None
-
-            if is_whitelisted or grade_contents is not None:
-
-                if is_whitelisted:
-                    LOGGER.info(
-                        u"Student %s is whitelisted in '%s'",
-                        student.id,
-                        unicode(course_id)
-                    )
-
-                # check to see whether the student is on the
-                # the embargoed country restricted list
-                # otherwise, put a new certificate request
-                # on the queue
-
-                if self.restricted.filter(user=student).exists():
-                    new_status = status.restricted
-                    cert.status = new_status
-                    cert.save()
-
-                    LOGGER.info(
-                        (
-                            u"Student %s is in the embargoed country restricted "
-                            u"list, so their certificate status has been set to '%s' "
-                            u"for the course '%s'. "
-                            u"No certificate generation task was sent to the XQueue."
-                        ),
-                        student.id,
-                        new_status,
-                        unicode(course_id)
-                    )
-                else:
-                    key = make_hashkey(random.random())
-                    cert.key = key
-                    contents = {
-                        'action': 'create',
-                        'username': student.username,
-                        'course_id': unicode(course_id),
-                        'course_name': course_name,
-                        'name': profile_name,
-                        'grade': grade_contents,
-                        'template_pdf': template_pdf,
-                    }
-                    if template_file:
-                        contents['template_pdf'] = template_file
-                    new_status = status.generating
-                    cert.status = new_status
-                    cert.save()
-
-                    try:
-                        self._send_to_xqueue(contents, key)
-                    except XQueueAddToQueueError as exc:
-                        new_status = ExampleCertificate.STATUS_ERROR
-                        cert.status = new_status
-                        cert.error_reason = unicode(exc)
-                        cert.save()
-                        LOGGER.critical(
-                            (
-                                u"Could not add certificate task to XQueue.  "
-                                u"The course was '%s' and the student was '%s'."
-                                u"The certificate task status has been marked as 'error' "
-                                u"and can be re-submitted with a management command."
-                            ), student.id, course_id
-                        )
-                    else:
-                        LOGGER.info(
-                            (
-                                u"The certificate status has been set to '%s'.  "
-                                u"Sent a certificate grading task to the XQueue "
-                                u"with the key '%s'. "
-                            ),
-                            key,
-                            new_status
-                        )
-            else:
-                new_status = status.notpassing
+            # check to see whether the student is on the
+            # the embargoed country restricted list
+            # otherwise, put a new certificate request
+            # on the queue
+
+            if is_restricted:
+                new_status = status.restricted
                 cert.status = new_status
                 cert.save()
 
                 LOGGER.info(
                     (
-                        u"Student %s does not have a grade for '%s', "
-                        u"so their certificate status has been set to '%s'. "
+                        u"Student %s is in the embargoed country restricted "
+                        u"list, so their certificate status has been set to '%s' "
+                        u"for the course '%s'. "
                         u"No certificate generation task was sent to the XQueue."
                     ),
                     student.id,
-                    unicode(course_id),
-                    new_status
+                    new_status,
+                    unicode(course_id)
                 )
+            else:
+                key = make_hashkey(random.random())
+                cert.key = key
+                contents = {
+                    'action': 'create',
+                    'username': student.username,
+                    'course_id': unicode(course_id),
+                    'course_name': course_name,
+                    'name': profile_name,
+                    'grade': grade_contents,
+                    'template_pdf': template_pdf,
+                }
+                if template_file:
+                    contents['template_pdf'] = template_file
+                new_status = status.generating
+                cert.status = new_status
+                cert.save()
 
+                if xqueue_batch is not None:
+                    xqueue_batch.append((cert, contents))
+                else:
+                    new_status = self._send_cert_to_xqueue(cert, contents)
+        else:
+            new_status = status.notpassing
+            cert.status = new_status
+            cert.save()
+
+            LOGGER.info(
+                (
+                    u"Student %s does not have a grade for '%s', "
+                    u"so their certificate status has been set to '%s'. "
+                    u"No certificate generation task was sent to the XQueue."
+                ),
+                student.id,
+                unicode(course_id),
+                new_status
+            )
+
+        return new_status
+
+    def send_batch(self, xqueue_batch, threads=1):
+        """
+        Send the XQueue tasks of the certificates collected by `create_cert` in
+        `xqueue_batch`, over up to `threads` concurrent requests.
+
+        Returns the list of the new statuses of the certificates.
+        """
+        if threads > 1 and len(xqueue_batch) > 1:
+            pool = ThreadPool(min(threads, len(xqueue_batch)))
+            try:
+                results = pool.map(self._post_cert_to_xqueue, xqueue_batch)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self._post_cert_to_xqueue(item) for item in xqueue_batch]
+
+        return [
+            self._record_xqueue_result(cert, exc)
+            for (cert, __), exc in zip(xqueue_batch, results)
+        ]
+
+    def _send_cert_to_xqueue(self, cert, contents):
+        """
+        Send the XQueue task of `cert`, and return its new status.
+        """
+        return self._record_xqueue_result(cert, self._post_cert_to_xqueue((cert, contents)))
+
+    def _post_cert_to_xqueue(self, cert_and_contents):
+        """
+        Send the XQueue task for a (certificate, contents) pair, and return the
+        XQueueAddToQueueError raised, if any.  This makes no database queries,
+        so that it can run in any thread.
+        """
+        cert, contents = cert_and_contents
+        try:
+            self._send_to_xqueue(contents, cert.key)
+        except XQueueAddToQueueError as exc:
+            return exc
+        return None
+
+    def _record_xqueue_result(self, cert, exc):
+        """
+        Update the status of `cert` after sending its XQueue task failed with `exc`,
+        or log that it was sent if `exc` is None.  Returns the certificate status.
+        """
+        if exc is not None:
+            new_status = ExampleCertificate.STATUS_ERROR
+            cert.status = new_status
+            cert.error_reason = unicode(exc)
+            cert.save()
+            LOGGER.critical(
+                (
+                    u"Could not add certificate task to XQueue.  "
+                    u"The course was '%s' and the student was '%s'."
+                    u"The certificate task status has been marked as 'error' "
+                    u"and can be re-submitted with a management command."
+                ), cert.user_id, cert.course_id
+            )
+        else:
+            new_status = cert.status
+            LOGGER.info(
+                (
+                    u"The certificate status has been set to '%s'.  "
+                    u"Sent a certificate grading task to the XQueue "
+                    u"with the key '%s'. "
+                ),
+                new_status,
+                cert.key
+            )
         return new_status
 
     def add_example_cert(self, example_cert):
@@ -0,0 +1,126 @@
+"""Tests for generating the certificates of a course in batches. """
+from mock import patch
+from nose.plugins.attrib import attr
+
+from django.test.utils import override_settings
+
+from capa.xqueue_interface import XQueueInterface
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+from student.tests.factories import UserFactory, CourseEnrollmentFactory
+
+from certificates.batch import generate_certificates
+from certificates.models import CertificateStatuses, GeneratedCertificate
+from certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
+
+
+@attr('shard_1')
+@override_settings(CERT_QUEUE='certificates')
+class GenerateCertificatesTest(ModuleStoreTestCase):
+    """Tests for `generate_certificates`. """
+
+    def setUp(self):
+        super(GenerateCertificatesTest, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [UserFactory.create() for __ in range(5)]
+        for student in self.students:
+            CourseEnrollmentFactory(user=student, course_id=self.course.id, mode='honor')
+        # Students with an even index pass the course
+        self.grades = dict(
+            (student.id, {'grade': 'Pass' if index % 2 == 0 else None, 'percent': 0.75 if index % 2 == 0 else 0.1})
+            for index, student in enumerate(self.students)
+        )
+
+    def _grade(self, student, request, course, keep_raw_scores=False):  # pylint: disable=unused-argument
+        """Return the grade of `student` from `self.grades`. """
+        if student.id not in self.grades:
+            raise ValueError('Cannot grade the student')
+        return self.grades[student.id]
+
+    def _generate(self, xqueue_error=None, **kwargs):
+        """
+        Generate the certificates of the course, and return the list of progress
+        reports and the mock of the XQueue.
+        """
+        with patch('courseware.grades.grade', side_effect=self._grade):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (1, xqueue_error) if xqueue_error else (0, None)
+                reports = [dict(progress) for progress in generate_certificates(self.course.id, **kwargs)]
+        return reports, mock_send
+
+    def _assert_statuses(self, expected_statuses):
+        """Check the certificate status of each student. """
+        statuses = [
+            GeneratedCertificate.certificate_for_student(student, self.course.id)
+            for student in self.students
+        ]
+        self.assertEqual(
+            [cert.status if cert else None for cert in statuses],
+            expected_statuses
+        )
+
+    def test_generate_in_batches(self):
+        reports, mock_send = self._generate(batch_size=2, xqueue_threads=2)
+
+        generating, notpassing = CertificateStatuses.generating, CertificateStatuses.notpassing
+        self._assert_statuses([generating, notpassing, generating, notpassing, generating])
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual([report['students'] for report in reports], [2, 4, 5])
+        self.assertEqual(reports[-1]['last_user_id'], self.students[-1].id)
+        self.assertEqual(dict(reports[-1]['statuses']), {generating: 3, notpassing: 2})
+
+    def test_resume_after(self):
+        reports, __ = self._generate(after_user_id=self.students[2].id)
+
+        generating, notpassing = CertificateStatuses.generating, CertificateStatuses.notpassing
+        self._assert_statuses([None, None, None, notpassing, generating])
+        self.assertEqual(reports[-1]['students'], 2)
+
+    def test_only_valid_statuses(self):
+        GeneratedCertificateFactory(
+            user=self.students[0], course_id=self.course.id, status=CertificateStatuses.downloadable
+        )
+        GeneratedCertificateFactory(
+            user=self.students[2], course_id=self.course.id, status=CertificateStatuses.error
+        )
+        self._generate(valid_statuses=[CertificateStatuses.error])
+
+        self._assert_statuses([CertificateStatuses.downloadable, None, CertificateStatuses.generating, None, None])
+
+    def test_whitelisted_and_restricted(self):
+        CertificateWhitelistFactory(user=self.students[1], course_id=self.course.id)
+        profile = self.students[2].profile
+        profile.allow_certificate = False
+        profile.save()
+        self._generate()
+
+        self.assertEqual(
+            GeneratedCertificate.certificate_for_student(self.students[1], self.course.id).status,
+            CertificateStatuses.generating
+        )
+        self.assertEqual(
+            GeneratedCertificate.certificate_for_student(self.students[2], self.course.id).status,
+            CertificateStatuses.restricted
+        )
+
+    def test_grading_error_skips_student(self):
+        del self.grades[self.students[0].id]
+        reports, __ = self._generate()
+
+        self.assertIsNone(GeneratedCertificate.certificate_for_student(self.students[0], self.course.id))
+        self.assertEqual(reports[-1]['statuses']['skipped'], 1)
+
+    def test_xqueue_error(self):
+        reports, __ = self._generate(xqueue_error='Kaboom!', xqueue_threads=2)
+
+        cert = GeneratedCertificate.certificate_for_student(self.students[0], self.course.id)
+        self.assertEqual(cert.status, CertificateStatuses.error)
+        self.assertIn('Kaboom!', cert.error_reason)
+        self.assertEqual(reports[-1]['statuses'][CertificateStatuses.error], 3)
+
+    def test_noop(self):
+        reports, mock_send = self._generate(noop=True)
+
+        self._assert_statuses([None] * 5)
+        self.assertFalse(mock_send.called)
+        self.assertEqual(dict(reports[-1]['statuses']), {'candidates': 5})
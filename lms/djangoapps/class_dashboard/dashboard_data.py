@@ -5,6 +5,7 @@ from util.json_request import JsonResponse
 import json
 
 from courseware import models
+from django.db import transaction
 from django.db.models import Count
 from django.utils.translation import ugettext as _
 
@@ -14,10 +15,127 @@ from instructor_analytics.csvs import create_csv_response
 
 from opaque_keys.edx.locations import Location
 
+from class_dashboard.models import ProblemGradeRollup, RollupRefresh, SequentialOpenRollup
+
 # Used to limit the length of list displayed to the screen.
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _live_problem_grade_rows(course_id, problem_set=None):
+    """
+    Aggregate query on studentmodule table for grade data for all problems in course,
+    or only for the problems in `problem_set` if given.
+
+    Returns a queryset of dicts with 'module_state_key', 'grade', 'max_grade' and 'count_grade'.
+    """
+    db_query = models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        grade__isnull=False,
+        module_type__exact="problem",
+    )
+    if problem_set is not None:
+        db_query = db_query.filter(module_state_key__in=problem_set)
+    return db_query.values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+
+
+def _live_sequential_open_rows(course_id):
+    """
+    Aggregate query on studentmodule table for "opening a subsection" data.
+
+    Returns a queryset of dicts with 'module_state_key' and 'count_sequential'.
+    """
+    return models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        module_type__exact="sequential",
+    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+
+
+def has_rollups(course_id):
+    """
+    Returns whether the aggregates of `course_id` have been materialized by `refresh_rollups`.
+    """
+    return RollupRefresh.objects.filter(course_id=course_id).exists()
+
+
+def refresh_rollups(course_id):
+    """
+    Recompute the rollup tables of `course_id` from the studentmodule table.
+
+    The dashboard reads the aggregates of a course from the rollups once they
+    have been refreshed at least once, so this is meant to be run periodically
+    (see the `refresh_class_dashboard_rollups` management command).
+    """
+    problem_rollups = [
+        ProblemGradeRollup(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            grade=row['grade'],
+            max_grade=row['max_grade'],
+            count=row['count_grade'],
+        )
+        for row in _live_problem_grade_rows(course_id)
+    ]
+    sequential_rollups = [
+        SequentialOpenRollup(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            count=row['count_sequential'],
+        )
+        for row in _live_sequential_open_rows(course_id)
+    ]
+
+    with transaction.commit_on_success():
+        ProblemGradeRollup.objects.filter(course_id=course_id).delete()
+        ProblemGradeRollup.objects.bulk_create(problem_rollups)
+        SequentialOpenRollup.objects.filter(course_id=course_id).delete()
+        SequentialOpenRollup.objects.bulk_create(sequential_rollups)
+        refresh, __ = RollupRefresh.objects.get_or_create(course_id=course_id)
+        refresh.save()
+
+
+def _problem_grade_rows(course_id, problem_set=None):
+    """
+    Returns the per problem, per grade student counts of `course_id` as dicts with
+    'module_state_key', 'grade', 'max_grade' and 'count_grade', read from the rollups
+    if the course has them.
+
+    `problem_set` optionally restricts the rows to an array of problem UsageKeys, in
+    which case the rows are ordered by problem and grade.
+    """
+    if has_rollups(course_id):
+        db_query = ProblemGradeRollup.objects.filter(course_id=course_id)
+        if problem_set is not None:
+            db_query = db_query.filter(module_state_key__in=problem_set).order_by('module_state_key', 'grade')
+        return [
+            {
+                'module_state_key': row['module_state_key'],
+                'grade': row['grade'],
+                'max_grade': row['max_grade'],
+                'count_grade': row['count'],
+            }
+            for row in db_query.values('module_state_key', 'grade', 'max_grade', 'count')
+        ]
+
+    db_query = _live_problem_grade_rows(course_id, problem_set)
+    if problem_set is not None:
+        db_query = db_query.order_by('module_state_key', 'grade')
+    return db_query
+
+
+def _sequential_open_rows(course_id):
+    """
+    Returns the number of students that opened each subsection of `course_id` as dicts
+    with 'module_state_key' and 'count_sequential', read from the rollups if the course
+    has them.
+    """
+    if has_rollups(course_id):
+        return [
+            {'module_state_key': row['module_state_key'], 'count_sequential': row['count']}
+            for row in SequentialOpenRollup.objects.filter(course_id=course_id).values('module_state_key', 'count')
+        ]
+    return _live_sequential_open_rows(course_id)
+
+
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -32,12 +150,7 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    db_query = _problem_grade_rows(course_id)
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -75,11 +188,7 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    db_query = _sequential_open_rows(course_id)
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -105,17 +214,7 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    db_query = _problem_grade_rows(course_id, problem_set)
 
     prob_grade_distrib = {}
 
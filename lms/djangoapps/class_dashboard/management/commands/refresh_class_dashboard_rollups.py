@@ -0,0 +1,37 @@
+"""
+Refresh the rollup tables read by the Metrics tab of the instructor dashboard.
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from class_dashboard.dashboard_data import refresh_rollups
+
+
+class Command(BaseCommand):
+    """
+    Recompute the class dashboard rollups of the given courses, or of every
+    course if none are given. Meant to be run periodically (e.g. from cron);
+    once a course has been refreshed, its dashboard reads from the rollups.
+
+    Usage: refresh_class_dashboard_rollups [<course_id> ...]
+    """
+    args = '[<course_id> ...]'
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if args:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in args]
+            except InvalidKeyError as error:
+                raise CommandError("Invalid course_id: {}".format(error))
+        else:
+            course_keys = [course.id for course in modulestore().get_courses()]
+
+        for course_key in course_keys:
+            refresh_rollups(course_key)
+            self.stdout.write("Refreshed rollups for {}\n".format(course_key))
@@ -0,0 +1,41 @@
+"""
+Rollup tables for the Metrics tab of the instructor dashboard.
+
+The class dashboard charts are aggregates over every StudentModule row of a
+course. On large courses computing them on each page load is too slow, so the
+aggregates are materialized here by `class_dashboard.dashboard_data.refresh_rollups`
+(usually run periodically through the `refresh_class_dashboard_rollups`
+management command) and read back by the dashboard instead.
+"""
+from django.db import models
+
+from xmodule_django.models import CourseKeyField, LocationKeyField  # pylint: disable=import-error
+
+
+class ProblemGradeRollup(models.Model):
+    """
+    Number of students with a given grade on a problem.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+
+class SequentialOpenRollup(models.Model):
+    """
+    Number of students that opened a subsection.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+
+class RollupRefresh(models.Model):
+    """
+    When the rollups of a course were last refreshed. The dashboard only reads
+    from the rollup tables for courses that have an entry here.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    refreshed = models.DateTimeField(auto_now=True)
@@ -21,6 +21,7 @@ from class_dashboard.dashboard_data import (
     get_d3_sequential_open_distrib, get_d3_section_grade_distrib,
     get_section_display_name, get_array_section_has_problem,
     get_students_opened_subsection, get_students_problem_grades,
+    has_rollups, refresh_rollups,
 )
 from class_dashboard.views import has_instructor_access_for_class
 
@@ -128,6 +129,33 @@ class TestGetProblemGradeDistribution(ModuleStoreTestCase):
                 sum_attempts += item[1]
             self.assertEquals(USER_COUNT, sum_attempts)
 
+    def test_rollups(self):
+        live_grade_distrib = get_problem_grade_distribution(self.course.id)
+        live_sequential_distrib = get_sequential_open_distrib(self.course.id)
+        live_problemset_distrib = get_problem_set_grade_distrib(self.course.id, live_grade_distrib[0])
+
+        self.assertFalse(has_rollups(self.course.id))
+        refresh_rollups(self.course.id)
+        self.assertTrue(has_rollups(self.course.id))
+
+        with self.assertNumQueries(2):
+            self.assertEquals(live_grade_distrib, get_problem_grade_distribution(self.course.id))
+        self.assertEquals(live_sequential_distrib, get_sequential_open_distrib(self.course.id))
+        self.assertEquals(
+            live_problemset_distrib,
+            get_problem_set_grade_distrib(self.course.id, live_grade_distrib[0])
+        )
+
+        # Rollups are a snapshot until they are refreshed again
+        StudentModuleFactory.create(
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.item.location,
+        )
+        self.assertEquals(live_sequential_distrib, get_sequential_open_distrib(self.course.id))
+        refresh_rollups(self.course.id)
+        self.assertEquals(USER_COUNT + 1, get_sequential_open_distrib(self.course.id)[self.item.location])
+
     def test_get_d3_problem_grade_distrib(self):
 
         d3_data = get_d3_problem_grade_distrib(self.course.id)
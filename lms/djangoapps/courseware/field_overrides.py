@@ -19,11 +19,13 @@ import threading
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 from django.conf import settings
+from request_cache.middleware import RequestCache
 from xblock.field_data import FieldData
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 
 NOTSET = object()
+PREFETCHED_OVERRIDES_CACHE_KEY = 'courseware.field_overrides.prefetched'
 
 
 def resolve_dotted(name):
@@ -193,6 +195,47 @@ class FieldOverrideProvider(object):
         raise NotImplementedError
 
 
+def prefetched_overrides(provider_key, load):
+    """
+    Returns the overrides for `provider_key`, e.g. a ccx or a user in a
+    course, as a dictionary mapping location strings to dictionaries of
+    serialized field values keyed by field name.  `load` is called at most
+    once per request and should return an iterable of `(location, field,
+    value)` tuples, so providers can fetch every override they own with a
+    single query instead of one query per block.
+
+    The map is kept in the request cache, so it is shared by every
+    :class:`OverrideFieldData` built while servicing the request.  Returns
+    `None` if no request is being serviced, in which case the caller should
+    look up overrides block by block.
+    """
+    if RequestCache.get_current_request() is None:
+        return None
+
+    prefetched = RequestCache.get_request_cache().data.setdefault(
+        PREFETCHED_OVERRIDES_CACHE_KEY, {})
+    overrides = prefetched.get(provider_key)
+    if overrides is None:
+        overrides = {}
+        for location, field, value in load():
+            overrides.setdefault(location, {})[field] = value
+        prefetched[provider_key] = overrides
+    return overrides
+
+
+def clear_prefetched_overrides(provider_key):
+    """
+    Discards the overrides prefetched for `provider_key` during the current
+    request.  Providers call this whenever an override they own is set or
+    cleared.
+    """
+    if RequestCache.get_current_request() is None:
+        return
+    prefetched = RequestCache.get_request_cache().data.get(PREFETCHED_OVERRIDES_CACHE_KEY)
+    if prefetched:
+        prefetched.pop(provider_key, None)
+
+
 def _lineage(block):
     """
     Returns an iterator over all ancestors of the given block, starting with
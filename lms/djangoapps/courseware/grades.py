@@ -2,12 +2,14 @@
 from __future__ import division
 from collections import defaultdict
 import json
+import multiprocessing
 import random
 import logging
 
 from contextlib import contextmanager
 from django.conf import settings
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connections, transaction
 from django.test.client import RequestFactory
 
 import dogstats_wrapper as dog_stats_api
@@ -20,17 +22,117 @@ from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, StudentModuleAnswerCount
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 log = logging.getLogger("edx.courseware")
 
 
-def answer_distributions(course_key):
+# Number of StudentModule rows handled by each step of the answer distribution scan
+ANSWER_DISTRIBUTION_CHUNK_SIZE = 1000
+
+
+def submitted_answers(state, grade):
+    """
+    Given the raw `state` and `grade` of a problem StudentModule, return a
+    dict mapping each problem part id to the unicode value of the answer the
+    student submitted for it. Unsubmitted problems (null grade) and missing
+    state yield an empty dict.
+
+    Raises:
+        ValueError: if `state` is not valid JSON.
+    """
+    if grade is None or not state:
+        return {}
+    raw_answers = json.loads(state).get("student_answers", {})
+    # Convert whatever raw answers we have (numbers, unicode, None, etc.)
+    # to be unicode values. Note that if we get a string, it's always
+    # unicode and not str -- state comes from the json decoder, and that
+    # always returns unicode for strings.
+    return {problem_part_id: unicode(raw_answer) for problem_part_id, raw_answer in raw_answers.items()}
+
+
+def submitted_problem_pk_ranges(course_key, chunk_size=ANSWER_DISTRIBUTION_CHUNK_SIZE):
+    """
+    Yield (first_pk, last_pk) tuples that partition the submitted problem
+    StudentModule rows of a course into chunks of at most `chunk_size` rows.
+
+    The ranges are found with keyset pagination over the primary key, so
+    no query holds a cursor open for the whole course, and each range can be
+    processed independently (and in parallel) by
+    `answer_counts_for_pk_range`.
+    """
+    queryset = StudentModule.all_submitted_problems_read_only(course_key).order_by('id')
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(id__gt=last_pk).values_list('id', flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield (pks[0], pks[-1])
+        last_pk = pks[-1]
+
+
+def answer_counts_for_pk_range(course_key, first_pk, last_pk):
+    """
+    Return the partial answer counts for the submitted problems of a course
+    whose StudentModule id lies in [first_pk, last_pk], as a dict mapping:
+
+      (module_state_key string, problem_id) -> {dict: answer -> count}
+
+    This only touches the StudentModule table (no modulestore access), and
+    returns plain picklable dicts so that it can run in a worker process.
+    Partial results are combined with `merge_answer_counts`.
+    """
+    answer_counts = defaultdict(lambda: defaultdict(int))
+    modules = StudentModule.all_submitted_problems_read_only(course_key).filter(
+        id__gte=first_pk,
+        id__lte=last_pk,
+    ).only('id', 'module_state_key', 'state', 'grade')
+    for module in modules:
+        try:
+            answers = submitted_answers(module.state, module.grade)
+        except ValueError:
+            log.error(
+                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
+                module.id,
+                course_key,
+            )
+            continue
+
+        # Each problem part has an ID that is derived from the
+        # module.module_state_key (with some suffix appended)
+        module_state_key = unicode(module.module_state_key)
+        for problem_part_id, answer in answers.items():
+            answer_counts[(module_state_key, problem_part_id)][answer] += 1
+
+    return {key: dict(counts) for key, counts in answer_counts.items()}
+
+
+def merge_answer_counts(answer_counts, partial_counts):
+    """
+    Add the counts of `partial_counts` into `answer_counts` in place. Both
+    arguments map a key to a {dict: answer -> count}. Returns `answer_counts`.
+    """
+    for key, counts in partial_counts.items():
+        merged = answer_counts.setdefault(key, {})
+        for answer, count in counts.items():
+            merged[answer] = merged.get(answer, 0) + count
+    return answer_counts
+
+
+def _answer_counts_for_pk_range_star(args):
+    """
+    Unpack the argument tuple for `answer_counts_for_pk_range`; used as the
+    worker function of the process pool in `answer_distributions`.
+    """
+    return answer_counts_for_pk_range(*args)
+
+
+def answer_distributions(course_key, chunk_size=ANSWER_DISTRIBUTION_CHUNK_SIZE, processes=1):
     """
     Given a course_key, return answer distributions in the form of a dictionary
     mapping:
@@ -57,8 +159,45 @@ def answer_distributions(course_key):
     not be aware of problems that are not visible to the user being used to
     generate the report.
 
+    The records are streamed in primary key ranges of `chunk_size` rows. If
+    `processes` is greater than 1, the ranges are counted by a pool of worker
+    processes and their partial counts are merged; the modulestore is only
+    consulted once per problem, after merging.
+
     This method will try to use a read-replica database if one is available.
     """
+    pk_ranges = [
+        (course_key, first_pk, last_pk)
+        for first_pk, last_pk in submitted_problem_pk_ranges(course_key, chunk_size)
+    ]
+
+    raw_counts = {}
+    if processes > 1 and len(pk_ranges) > 1:
+        # Forked workers must not share the parent's database connections,
+        # so close them here; Django reopens them lazily on next use.
+        for connection in connections.all():
+            connection.close()
+        pool = multiprocessing.Pool(processes)
+        try:
+            for partial_counts in pool.imap_unordered(_answer_counts_for_pk_range_star, pk_ranges):
+                merge_answer_counts(raw_counts, partial_counts)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for args in pk_ranges:
+            merge_answer_counts(raw_counts, answer_counts_for_pk_range(*args))
+
+    return _resolve_answer_distribution_keys(course_key, raw_counts)
+
+
+def _resolve_answer_distribution_keys(course_key, raw_counts):
+    """
+    Convert answer counts keyed by (module_state_key string, problem_id) into
+    the (problem url_name, problem display_name, problem_id) keyed form
+    returned by `answer_distributions`. Answers to problems that can't be
+    found in the modulestore are omitted.
+    """
     # dict: { module.module_state_key : (url_name, display_name) }
     state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
 
@@ -80,47 +219,73 @@ def answer_distributions(course_key):
 
         return state_keys_to_problem_info[usage_key]
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
     answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
+    for (module_state_key, problem_part_id), counts in raw_counts.items():
         try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
-        except ValueError:
-            log.error(
-                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
-                course_key,
-            )
-            continue
-
-        try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
-            # Each problem part has an ID that is derived from the
-            # module.module_state_key (with some suffix appended)
-            for problem_part_id, raw_answer in raw_answers.items():
-                # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-                # to be unicode values. Note that if we get a string, it's always
-                # unicode and not str -- state comes from the json decoder, and that
-                # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
-
+            usage_key = UsageKey.from_string(module_state_key).map_into_course(course_key)
+            url, display_name = url_and_display_name(usage_key)
         except (ItemNotFoundError, InvalidKeyError):
-            msg = "Answer Distribution: Item {} referenced in StudentModule {} " + \
-                  "for user {} in course {} not found; " + \
+            msg = "Answer Distribution: Item {} referenced in StudentModule " + \
+                  "state in course {} not found; " + \
                   "This can happen if a student answered a question that " + \
-                  "was later deleted from the course. This answer will be " + \
+                  "was later deleted from the course. These answers will be " + \
                   "omitted from the answer distribution CSV."
-            log.warning(
-                msg.format(module.module_state_key, module.id, module.student_id, course_key)
-            )
+            log.warning(msg.format(module_state_key, course_key))
             continue
 
+        for answer, count in counts.items():
+            answer_counts[(url, display_name, problem_part_id)][answer] += count
+
     return answer_counts
 
 
+def materialized_answer_distributions(course_key):
+    """
+    Return the same mapping as `answer_distributions`, but read from the
+    incrementally maintained StudentModuleAnswerCount table instead of
+    scanning every StudentModule of the course.
+
+    The table is only complete for courses whose counts were rebuilt with
+    `rebuild_answer_counts` after ENABLE_ANSWER_DISTRIBUTION_COUNTS was turned on.
+    """
+    raw_counts = {}
+    for row in StudentModuleAnswerCount.objects.filter(course_id=course_key, count__gt=0):
+        counts = raw_counts.setdefault((unicode(row.module_state_key), row.part_id), {})
+        counts[row.answer] = row.count
+    return _resolve_answer_distribution_keys(course_key, raw_counts)
+
+
+def rebuild_answer_counts(course_key, chunk_size=ANSWER_DISTRIBUTION_CHUNK_SIZE):
+    """
+    Recompute the StudentModuleAnswerCount rows of a course from a full scan
+    of its submitted StudentModule entries. Submissions saved while the
+    rebuild runs may be missed, so run it before enabling
+    ENABLE_ANSWER_DISTRIBUTION_COUNTS or during a quiet period.
+
+    Returns the number of count rows written.
+    """
+    raw_counts = {}
+    for first_pk, last_pk in submitted_problem_pk_ranges(course_key, chunk_size):
+        merge_answer_counts(raw_counts, answer_counts_for_pk_range(course_key, first_pk, last_pk))
+
+    rows = [
+        StudentModuleAnswerCount(
+            course_id=course_key,
+            module_state_key=UsageKey.from_string(module_state_key),
+            part_id=problem_part_id,
+            answer_hash=StudentModuleAnswerCount.hash_answer(answer),
+            answer=answer,
+            count=count,
+        )
+        for (module_state_key, problem_part_id), counts in raw_counts.items()
+        for answer, count in counts.items()
+    ]
+    with transaction.commit_on_success():
+        StudentModuleAnswerCount.objects.filter(course_id=course_key).delete()
+        StudentModuleAnswerCount.objects.bulk_create(rows)
+    return len(rows)
+
+
 @transaction.commit_manually
 def grade(student, request, course, keep_raw_scores=False):
     """
@@ -131,6 +296,85 @@ def grade(student, request, course, keep_raw_scores=False):
         return _grade(student, request, course, keep_raw_scores)
 
 
+# How long a serialized grading context stays in the cache. Entries are keyed by
+# course version, so this only bounds how long unused versions linger.
+GRADING_CONTEXT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _grading_context_cache_key(course):
+    """
+    Returns the cache key of the serialized grading context of `course`, or None
+    if the course has no version information to key it by (e.g. XML courses).
+    """
+    version = getattr(course, 'subtree_edited_on', None)
+    if version is None:
+        return None
+    return u"courseware.grades.grading_context.{}.{}".format(course.id, version.isoformat())
+
+
+def _serialize_grading_context(grading_context):
+    """
+    Convert the `graded_sections` of a CourseDescriptor.grading_context into
+    plain data: for each graded section, its usage key, display name, whether it
+    contains blocks that always need regrading, and the usage keys of its scored
+    blocks (all as strings).
+    """
+    return {
+        section_format: [
+            {
+                'location': unicode(section['section_descriptor'].location),
+                'display_name': section['section_descriptor'].display_name_with_default,
+                'always_recalculate_grades': any(
+                    descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
+                ),
+                'scored_locations': [
+                    unicode(descriptor.location) for descriptor in section['xmoduledescriptors']
+                ],
+            }
+            for section in sections
+        ]
+        for section_format, sections in grading_context['graded_sections'].iteritems()
+    }
+
+
+def grading_context_index(course):
+    """
+    Returns a lightweight version of `course.grading_context`, which doesn't
+    require walking the course tree when it is in the cache.
+
+    The returned dict has a single key, 'graded_sections', which maps each
+    section format to a list of dicts with:
+        location: the UsageKey of the section
+        display_name: the display name of the section
+        always_recalculate_grades: True if any scored block of the section must always be regraded
+        scored_locations: the UsageKeys of the scored blocks of the section (including the section)
+
+    The serialized index is kept in the shared cache keyed by the course version,
+    so it is built once per course version rather than once per process.
+    """
+    cache_key = _grading_context_cache_key(course)
+    serialized = cache.get(cache_key) if cache_key else None
+    if serialized is None:
+        serialized = _serialize_grading_context(course.grading_context)
+        if cache_key:
+            cache.set(cache_key, serialized, GRADING_CONTEXT_CACHE_TIMEOUT)
+
+    return {
+        'graded_sections': {
+            section_format: [
+                {
+                    'location': UsageKey.from_string(section['location']),
+                    'display_name': section['display_name'],
+                    'always_recalculate_grades': section['always_recalculate_grades'],
+                    'scored_locations': [UsageKey.from_string(key) for key in section['scored_locations']],
+                }
+                for section in sections
+            ]
+            for section_format, sections in serialized.iteritems()
+        }
+    }
+
+
 def _grade(student, request, course, keep_raw_scores):
     """
     Unwrapped version of "grade"
@@ -152,7 +396,7 @@ def _grade(student, request, course, keep_raw_scores):
 
     More information on the format is in the docstring for CourseGrader.
     """
-    grading_context = course.grading_context
+    grading_context = grading_context_index(course)
     raw_scores = []
 
     # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
@@ -168,32 +412,27 @@ def _grade(student, request, course, keep_raw_scores):
     for section_format, sections in grading_context['graded_sections'].iteritems():
         format_scores = []
         for section in sections:
-            section_descriptor = section['section_descriptor']
-            section_name = section_descriptor.display_name_with_default
+            section_name = section['display_name']
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
-            should_grade_section = any(
-                descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
-            )
+            should_grade_section = section['always_recalculate_grades']
 
             # If there are no problems that always have to be regraded, check to
             # see if any of our locations are in the scores from the submissions
             # API. If scores exist, we have to calculate grades for this section.
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
-                    for descriptor in section['xmoduledescriptors']
+                    location.to_deprecated_string() in submissions_scores
+                    for location in section['scored_locations']
                 )
 
             if not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
-                        module_state_key__in=[
-                            descriptor.location for descriptor in section['xmoduledescriptors']
-                        ]
+                        module_state_key__in=section['scored_locations']
                     ).exists()
 
             # If we haven't seen a single problem in the section, we don't have
@@ -209,6 +448,9 @@ def _grade(student, request, course, keep_raw_scores):
                         field_data_cache = FieldDataCache([descriptor], course.id, student)
                     return get_module_for_descriptor(student, request, descriptor, field_data_cache, course.id)
 
+                # Only load the section from the modulestore if the student has
+                # something to grade in it
+                section_descriptor = course.runtime.get_block(section['location'])
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
                     (correct, total) = get_score(
@@ -250,7 +492,7 @@ def _grade(student, request, course, keep_raw_scores):
             else:
                 log.info(
                     "Unable to grade a section with a total possible score of zero. " +
-                    str(section_descriptor.location)
+                    str(section['location'])
                 )
 
         totaled_scores[section_format] = format_scores
@@ -0,0 +1,45 @@
+"""
+Recompute the materialized answer distribution counts of one or more courses.
+"""
+from optparse import make_option
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.grades import ANSWER_DISTRIBUTION_CHUNK_SIZE, rebuild_answer_counts
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the StudentModuleAnswerCount rows of the given courses from their
+    submitted problem state. Use this to backfill existing courses after
+    turning on the ENABLE_ANSWER_DISTRIBUTION_COUNTS feature.
+
+    Usage: rebuild_answer_counts <course_id> [<course_id> ...]
+    """
+    args = '<course_id course_id ...>'
+    help = dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option('--chunk-size',
+                    action='store',
+                    type='int',
+                    dest='chunk_size',
+                    default=ANSWER_DISTRIBUTION_CHUNK_SIZE,
+                    help='Number of StudentModule rows to read per query'),
+    )
+
+    def handle(self, *args, **options):
+        if not args:
+            raise CommandError("At least one course_id is required")
+
+        for course_id in args:
+            try:
+                course_key = CourseKey.from_string(course_id)
+            except InvalidKeyError:
+                raise CommandError("Invalid course_id: {}".format(course_id))
+
+            count = rebuild_answer_counts(course_key, options['chunk_size'])
+            self.stdout.write("{}: wrote {} answer count rows\n".format(course_id, count))
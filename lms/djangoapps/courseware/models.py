@@ -12,13 +12,16 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+import hashlib
+import json
 import logging
 import itertools
 
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
@@ -178,6 +181,138 @@ class StudentModuleHistory(models.Model):
             history_entry.save()
 
 
+class StudentModuleAnswerCount(models.Model):
+    """
+    Incrementally maintained count of how many students currently have a given
+    answer submitted for a problem part. This is a materialized form of the
+    answer distribution report computed by `courseware.grades.answer_distributions`,
+    kept up to date on every problem StudentModule save when the
+    ENABLE_ANSWER_DISTRIBUTION_COUNTS feature is on.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    part_id = models.CharField(max_length=255)
+
+    # Answers can be arbitrarily long, so uniqueness is enforced on their hash
+    answer_hash = models.CharField(max_length=40)
+    answer = models.TextField()
+
+    count = models.IntegerField(default=0)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('course_id', 'module_state_key', 'part_id', 'answer_hash'),)
+
+    @staticmethod
+    def hash_answer(answer):
+        """
+        Return the hex digest used to index the unicode `answer`.
+        """
+        return hashlib.sha1(answer.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def adjust(cls, course_id, module_state_key, part_id, answer, delta):
+        """
+        Add `delta` to the count of `answer` for the given problem part.
+        """
+        row, __ = cls.objects.get_or_create(
+            course_id=course_id,
+            module_state_key=module_state_key,
+            part_id=part_id,
+            answer_hash=cls.hash_answer(answer),
+            defaults={'answer': answer},
+        )
+        cls.objects.filter(id=row.id).update(count=F('count') + delta)
+
+    def __unicode__(self):
+        return u'StudentModuleAnswerCount<{}, {}, {!r}: {}>'.format(
+            self.module_state_key, self.part_id, self.answer, self.count
+        )
+
+
+def _answer_count_entries(module_state_key, state, grade):
+    """
+    Return a dict mapping (module_state_key, part_id) to the answer submitted
+    in a problem StudentModule with the given values. Unparseable state
+    counts as no answers, like it does in the answer distribution report.
+    """
+    if grade is None or not state or module_state_key is None:
+        return {}
+    try:
+        raw_answers = json.loads(state).get("student_answers", {})
+    except ValueError:
+        return {}
+    return {
+        (module_state_key, part_id): unicode(raw_answer)
+        for part_id, raw_answer in raw_answers.items()
+    }
+
+
+def _answer_counts_enabled(instance):
+    """
+    Whether StudentModuleAnswerCount rows should be maintained for `instance`.
+    """
+    return (
+        settings.FEATURES.get('ENABLE_ANSWER_DISTRIBUTION_COUNTS', False) and
+        instance.module_type == 'problem'
+    )
+
+
+def _update_answer_counts(instance, new_entries):
+    """
+    Apply the difference between the answers `instance` had when it was
+    loaded and `new_entries` to the StudentModuleAnswerCount table.
+    """
+    old_entries = getattr(instance, '_submitted_answer_entries', None)
+    if old_entries is None:
+        old_entries = _answer_count_entries(*instance._answer_count_snapshot)  # pylint: disable=protected-access
+    for key in set(old_entries) | set(new_entries):
+        old_answer, new_answer = old_entries.get(key), new_entries.get(key)
+        if old_answer == new_answer:
+            continue
+        module_state_key, part_id = key
+        if old_answer is not None:
+            StudentModuleAnswerCount.adjust(instance.course_id, module_state_key, part_id, old_answer, -1)
+        if new_answer is not None:
+            StudentModuleAnswerCount.adjust(instance.course_id, module_state_key, part_id, new_answer, 1)
+    instance._submitted_answer_entries = new_entries  # pylint: disable=protected-access
+
+
+@receiver(post_init, sender=StudentModule)
+def snapshot_submitted_answers(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember the submission state a problem StudentModule was loaded with, so
+    that saving it can adjust the answer counts by the difference. Only the raw
+    values are kept here; the state is parsed lazily on save.
+    """
+    if _answer_counts_enabled(instance):
+        instance._answer_count_snapshot = (  # pylint: disable=protected-access
+            instance.module_state_key if instance.pk else None,
+            instance.state,
+            instance.grade,
+        )
+
+
+@receiver(post_save, sender=StudentModule)
+def update_answer_counts_on_save(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Keep StudentModuleAnswerCount in step with submitted problem answers.
+    """
+    if _answer_counts_enabled(instance) and hasattr(instance, '_answer_count_snapshot'):
+        _update_answer_counts(
+            instance,
+            _answer_count_entries(instance.module_state_key, instance.state, instance.grade)
+        )
+
+
+@receiver(post_delete, sender=StudentModule)
+def update_answer_counts_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove the answers of a deleted problem StudentModule from the counts.
+    """
+    if _answer_counts_enabled(instance) and hasattr(instance, '_answer_count_snapshot'):
+        _update_answer_counts(instance, {})
+
+
 class XBlockFieldBase(models.Model):
     """
     Base class for all XBlock field storage.
@@ -11,7 +11,9 @@ import static_replace
 import xblock.reference.plugins
 
 from collections import OrderedDict
+from datetime import datetime
 from functools import partial
+from pytz import UTC
 from requests.auth import HTTPBasicAuth
 import dogstats_wrapper as dog_stats_api
 from opaque_keys import InvalidKeyError
@@ -28,7 +30,7 @@ from django.views.decorators.csrf import csrf_exempt
 
 import newrelic.agent
 
-from capa.xqueue_interface import XQueueInterface
+from capa.xqueue_interface import BufferedXQueueInterface, XQueueInterface, XQUEUE_POOL_SIZE
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
@@ -79,17 +81,31 @@ from .field_overrides import OverrideFieldData
 
 log = logging.getLogger(__name__)
 
+TOC_SKELETON_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
     REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
 else:
     REQUESTS_AUTH = None
 
-XQUEUE_INTERFACE = XQueueInterface(
-    settings.XQUEUE_INTERFACE['url'],
-    settings.XQUEUE_INTERFACE['django_auth'],
-    REQUESTS_AUTH,
-)
+# Setting XQUEUE_INTERFACE['buffered'] makes CodeResponse submissions return
+# without waiting for xqueue; they are sent in batches from a background thread.
+if settings.XQUEUE_INTERFACE.get('buffered', False):
+    XQUEUE_INTERFACE = BufferedXQueueInterface(
+        settings.XQUEUE_INTERFACE['url'],
+        settings.XQUEUE_INTERFACE['django_auth'],
+        REQUESTS_AUTH,
+        pool_size=settings.XQUEUE_INTERFACE.get('pool_size', XQUEUE_POOL_SIZE),
+        batch_size=settings.XQUEUE_INTERFACE.get('batch_size', 20),
+    )
+else:
+    XQUEUE_INTERFACE = XQueueInterface(
+        settings.XQUEUE_INTERFACE['url'],
+        settings.XQUEUE_INTERFACE['django_auth'],
+        REQUESTS_AUTH,
+        pool_size=settings.XQUEUE_INTERFACE.get('pool_size', XQUEUE_POOL_SIZE),
+    )
 
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
@@ -138,6 +154,10 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
 
     field_data_cache must include data from the course module and 2 levels of its descendents
     '''
+    # The skeleton is read from the descriptors, so it can't take field
+    # overrides (e.g. individual due dates or CCX start dates) into account.
+    if settings.FEATURES.get('ENABLE_TOC_SKELETON_CACHE') and not settings.FIELD_OVERRIDE_PROVIDERS:
+        return _toc_from_skeleton(request, course, active_chapter, active_section)
 
     with modulestore().bulk_operations(course.id):
         course_module = get_module_for_descriptor(request.user, request, course, field_data_cache, course.id)
@@ -189,6 +209,127 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
         return toc_chapters
 
 
+def _toc_skeleton_cache_key(course):
+    """
+    Returns the cache key of the TOC skeleton of `course`, or None if the
+    course has no version information to key it by (e.g. XML courses).
+    """
+    version = getattr(course, 'subtree_edited_on', None)
+    if version is None:
+        return None
+    return u"courseware.module_render.toc_skeleton.{}.{}".format(course.id, version.isoformat())
+
+
+def _toc_skeleton_entry(descriptor):
+    """
+    Returns the user independent TOC data of a chapter or section descriptor.
+
+    `restricted` is set if loading the block may depend on who the user is,
+    regardless of the time; `start` is kept so that blocks which haven't
+    started yet can be checked too.
+    """
+    return {
+        'location': unicode(descriptor.location),
+        'url_name': descriptor.url_name,
+        'display_name': descriptor.display_name_with_default,
+        'hide_from_toc': descriptor.hide_from_toc,
+        'restricted': bool(descriptor.visible_to_staff_only or descriptor.merged_group_access),
+        'start': None if 'detached' in descriptor._class_tags else descriptor.start,  # pylint: disable=protected-access
+    }
+
+
+def toc_skeleton(course):
+    """
+    Returns the table of contents of `course` as seen by a user with access to
+    every chapter and section: a list of chapter entries, each with a
+    'sections' list of section entries which also have 'format', 'due' and
+    'graded'.
+
+    The skeleton is kept in the shared cache keyed by the course version, so
+    it is built once per course version rather than once per page view.
+    """
+    cache_key = _toc_skeleton_cache_key(course)
+    skeleton = cache.get(cache_key) if cache_key else None
+    if skeleton is None:
+        skeleton = []
+        for chapter in course.get_children():
+            chapter_entry = _toc_skeleton_entry(chapter)
+            chapter_entry['sections'] = []
+            for section in chapter.get_children():
+                section_entry = _toc_skeleton_entry(section)
+                section_entry.update({
+                    'format': section.format if section.format is not None else '',
+                    'due': section.due,
+                    'graded': section.graded,
+                })
+                chapter_entry['sections'].append(section_entry)
+            skeleton.append(chapter_entry)
+        if cache_key:
+            cache.set(cache_key, skeleton, TOC_SKELETON_CACHE_TIMEOUT)
+    return skeleton
+
+
+def _toc_from_skeleton(request, course, active_chapter, active_section):
+    """
+    Builds the same table of contents as `toc_for_course` by overlaying the
+    user's access, milestones and the active chapter and section onto the
+    cached `toc_skeleton` of the course, without binding any module to the
+    user.
+    """
+    user = request.user
+    if getattr(user, 'known', True) and not has_access(user, 'load', course, course.id):
+        return None
+
+    now = datetime.now(UTC)
+
+    def can_load(entry):
+        """
+        Returns whether the user can load the chapter or section of `entry`.
+        Only blocks which are restricted or haven't started yet need an
+        access check on their descriptor.
+        """
+        if not entry['restricted'] and (entry['start'] is None or now > entry['start']):
+            return True
+        if not getattr(user, 'known', True):
+            return True
+        descriptor = course.runtime.get_block(UsageKey.from_string(entry['location']))
+        return has_access(user, 'load', descriptor, course.id)
+
+    # See if the course is gated by one or more content milestones
+    required_content = milestones_helpers.get_required_content(course, user)
+
+    # The user may not actually have to complete the entrance exam, if one is required
+    if not user_must_complete_entrance_exam(request, user, course):
+        required_content = [content for content in required_content if not content == course.entrance_exam_id]
+
+    toc_chapters = list()
+    for chapter in toc_skeleton(course):
+        if chapter['hide_from_toc'] or (required_content and chapter['location'] not in required_content):
+            continue
+        if not can_load(chapter):
+            continue
+
+        sections = list()
+        for section in chapter['sections']:
+            if section['hide_from_toc'] or not can_load(section):
+                continue
+            sections.append({
+                'display_name': section['display_name'],
+                'url_name': section['url_name'],
+                'format': section['format'],
+                'due': section['due'],
+                'active': chapter['url_name'] == active_chapter and section['url_name'] == active_section,
+                'graded': section['graded'],
+            })
+        toc_chapters.append({
+            'display_name': chapter['display_name'],
+            'url_name': chapter['url_name'],
+            'sections': sections,
+            'active': chapter['url_name'] == active_chapter
+        })
+    return toc_chapters
+
+
 def get_module(user, request, usage_key, field_data_cache,
                position=None, log_if_not_found=True, wrap_xmodule_display=True,
                grade_bucket_type=None, depth=0,
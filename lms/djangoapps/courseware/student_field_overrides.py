@@ -4,7 +4,7 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_prefetched_overrides, prefetched_overrides
 from .models import StudentFieldOverride
 
 
@@ -38,19 +38,39 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
+    course_id = block.runtime.course_id
+    prefetched = prefetched_overrides(
+        _user_overrides_key(user, course_id),
+        lambda: StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        ).values_list('location', 'field', 'value')
     )
+    if prefetched is None:
+        serialized = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            location=block.location,
+            student_id=user.id,
+        ).values_list('field', 'value')
+    else:
+        location = StudentFieldOverride._meta.get_field('location').get_prep_value(block.location)
+        serialized = prefetched.get(location, {}).items()
+
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for name, value in serialized:
+        field = block.fields[name]
+        overrides[name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _user_overrides_key(user, course_id):
+    """
+    Returns the key under which the overrides for `user` in the course
+    identified by `course_id` are prefetched.
+    """
+    return ('user', user.id, unicode(course_id))
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -65,6 +85,9 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_prefetched_overrides(_user_overrides_key(user, block.runtime.course_id))
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
 
 
 def clear_override_for_user(user, block, name):
@@ -82,3 +105,6 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    clear_prefetched_overrides(_user_overrides_key(user, block.runtime.course_id))
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
@@ -2,13 +2,14 @@
 Test grade calculation.
 """
 from django.http import Http404
-from mock import patch
+from django.test.client import RequestFactory
+from mock import patch, PropertyMock
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import grade, grading_context_index, iterate_grades_for
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -121,3 +122,48 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@attr('shard_1')
+class TestGradingContextIndex(ModuleStoreTestCase):
+    """
+    Test the cached, serializable grading context index.
+    """
+    def setUp(self):
+        super(TestGradingContextIndex, self).setUp()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        self.section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            display_name='Homework 1',
+            metadata={'graded': True, 'format': 'Homework'},
+        )
+        vertical = ItemFactory.create(parent_location=self.section.location, category='vertical')
+        self.problem = ItemFactory.create(parent_location=vertical.location, category='problem')
+        ItemFactory.create(parent_location=chapter.location, category='sequential', display_name='Ungraded')
+        self.course = self.store.get_course(self.course.id)
+
+    def test_index(self):
+        index = grading_context_index(self.course)
+        self.assertEqual(index['graded_sections'].keys(), ['Homework'])
+        section, = index['graded_sections']['Homework']
+        self.assertEqual(section['location'], self.section.location)
+        self.assertEqual(section['display_name'], 'Homework 1')
+        self.assertFalse(section['always_recalculate_grades'])
+        self.assertEqual(section['scored_locations'], [self.problem.location])
+
+    def test_index_is_cached(self):
+        first = grading_context_index(self.course)
+
+        # A fresh instance of the same course version doesn't walk the course tree
+        course = self.store.get_course(self.course.id)
+        with patch.object(type(course), 'grading_context', new_callable=PropertyMock) as mock_grading_context:
+            self.assertEqual(grading_context_index(course), first)
+        self.assertFalse(mock_grading_context.called)
+
+    def test_grade_with_index(self):
+        student = UserFactory.create()
+        gradeset = grade(student, RequestFactory().get('/'), self.course)
+        self.assertEqual(gradeset['percent'], 0.0)
+        self.assertEqual([score.section for score in gradeset['totaled_scores']['Homework']], ['Homework 1'])
@@ -644,6 +644,54 @@ class TestTOC(ModuleStoreTestCase):
             for toc_section in expected:
                 self.assertIn(toc_section, actual)
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 6, 0))
+    @ddt.unpack
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=())
+    def test_toc_from_skeleton(self, default_ms, setup_finds, setup_sends):
+        with self.store.default_store(default_ms):
+            self.setup_modulestore(default_ms, setup_finds, setup_sends)
+            expected = render.toc_for_course(
+                self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+            )
+            with patch.dict('django.conf.settings.FEATURES', {'ENABLE_TOC_SKELETON_CACHE': True}):
+                actual = render.toc_for_course(
+                    self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+                )
+        self.assertEqual(actual, expected)
+
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=())
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_TOC_SKELETON_CACHE': True})
+    def test_toc_skeleton_overlay(self):
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter', display_name='Week 1')
+        ItemFactory.create(parent_location=chapter.location, category='sequential', display_name='Lesson 1')
+        ItemFactory.create(
+            parent_location=chapter.location, category='sequential', display_name='Staff Only',
+            metadata={'visible_to_staff_only': True}
+        )
+        ItemFactory.create(
+            parent_location=course.location, category='chapter', display_name='Hidden', metadata={'hide_from_toc': True}
+        )
+        course = self.store.get_course(course.id, depth=2)
+        request = RequestFactory().get('/')
+        request.user = UserFactory()
+
+        toc = render.toc_for_course(request, course, chapter.url_name, None, None)
+        self.assertEqual([chapter_info['display_name'] for chapter_info in toc], ['Week 1'])
+        self.assertEqual([section['display_name'] for section in toc[0]['sections']], ['Lesson 1'])
+        self.assertTrue(toc[0]['active'])
+
+        request.user = GlobalStaffFactory()
+        toc = render.toc_for_course(request, course, None, None, None)
+        self.assertEqual([section['display_name'] for section in toc[0]['sections']], ['Lesson 1', 'Staff Only'])
+        self.assertFalse(toc[0]['active'])
+
+        # A fresh instance of the same course version reads the cached skeleton
+        course = self.store.get_course(course.id, depth=2)
+        with patch.object(type(course), 'get_children') as mock_get_children:
+            render.toc_for_course(request, course, None, None, None)
+        self.assertFalse(mock_get_children.called)
+
 
 @attr('shard_1')
 @ddt.ddt
@@ -1052,6 +1052,68 @@ class TestAnswerDistributions(TestSubmittingProblems):
                 }
             )
 
+    def test_chunked(self):
+        # Streaming the rows in small pk ranges gives the same counts as a
+        # single pass over the course.
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+
+        self.assertEqual(len(list(grades.submitted_problem_pk_ranges(self.course.id, chunk_size=1))), 3)
+        self.assertEqual(
+            grades.answer_distributions(self.course.id, chunk_size=1),
+            grades.answer_distributions(self.course.id),
+        )
+
+    def test_merge_answer_counts(self):
+        merged = grades.merge_answer_counts(
+            {('p1', '2_1'): {u'Correct': 1}},
+            {('p1', '2_1'): {u'Correct': 2, u'Incorrect': 1}, ('p2', '2_1'): {u'Correct': 1}},
+        )
+        self.assertEqual(
+            merged,
+            {('p1', '2_1'): {u'Correct': 3, u'Incorrect': 1}, ('p2', '2_1'): {u'Correct': 1}},
+        )
+
+    @patch.dict(settings.FEATURES, {'ENABLE_ANSWER_DISTRIBUTION_COUNTS': True})
+    def test_materialized_counts(self):
+        # Counts are maintained as answers are submitted and changed
+        self.submit_question_answer('p1', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p2', {'2_1': u'Correct'})
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+
+        expected = {
+            ('p1', 'p1', '{}_2_1'.format(self.p1_html_id)): {
+                'Correct': 1
+            },
+            ('p2', 'p2', '{}_2_1'.format(self.p2_html_id)): {
+                'Correct': 1
+            }
+        }
+        self.assertEqual(grades.materialized_answer_distributions(self.course.id), expected)
+        self.assertEqual(grades.answer_distributions(self.course.id), expected)
+
+        # Deleting the state removes its answers from the counts
+        StudentModule.objects.get(
+            course_id=self.course.id,
+            student=self.student_user,
+            module_state_key=self.problem_location('p2'),
+        ).delete()
+        del expected[('p2', 'p2', '{}_2_1'.format(self.p2_html_id))]
+        self.assertEqual(grades.materialized_answer_distributions(self.course.id), expected)
+
+    def test_rebuild_answer_counts(self):
+        # Answers submitted while the feature is off are picked up by a rebuild
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.assertFalse(grades.materialized_answer_distributions(self.course.id))
+
+        self.assertEqual(grades.rebuild_answer_counts(self.course.id), 2)
+        self.assertEqual(
+            grades.materialized_answer_distributions(self.course.id),
+            grades.answer_distributions(self.course.id),
+        )
+
 
 @attr('shard_1')
 class TestConditionalContent(TestSubmittingProblems):
@@ -22,6 +22,7 @@ from cache_toolbox.core import del_cached_content
 from xmodule.exceptions import NotFoundError
 
 from xmodule.video_module.transcripts_utils import (
+    TRANSCRIPT_CACHE,
     TranscriptException,
     TranscriptsGenerationException,
 )
@@ -706,6 +707,32 @@ class TestGetTranscript(TestVideo):
         self.assertEqual(filename, self.item.sub + '.txt')
         self.assertEqual(mime_type, 'text/plain; charset=utf-8')
 
+    def test_converted_transcript_cached(self):
+        """
+        A converted transcript is served from the transcript cache until its content changes.
+        """
+        TRANSCRIPT_CACHE.clear()
+        self.addCleanup(TRANSCRIPT_CACHE.clear)
+        sjson = _create_file(content='{"start": [270], "end": [2720], "text": ["Hi, welcome to Edx."]}')
+        _upload_sjson_file(sjson, self.item.location)
+        self.item.sub = _get_subs_id(sjson.name)
+
+        first, __, __ = self.item.get_transcript("txt")
+        with patch('xmodule.video_module.transcripts_utils.Transcript.convert') as mock_convert:
+            second, __, __ = self.item.get_transcript("txt")
+        self.assertFalse(mock_convert.called)
+        self.assertEqual(first, second)
+        self.assertEqual(TRANSCRIPT_CACHE.stats()['hits'], 1)
+
+        # uploading new content under the same name is picked up straight away
+        sjson.seek(0)
+        sjson.truncate()
+        sjson.write('{"start": [270], "end": [2720], "text": ["Goodbye."]}')
+        sjson.seek(0)
+        _upload_sjson_file(sjson, self.item.location)
+        text, __, __ = self.item.get_transcript("txt")
+        self.assertEqual(text, "Goodbye.")
+
     def test_en_with_empty_sub(self):
 
         # no self.sub, self.youttube_1_0 exist, but no file in assets
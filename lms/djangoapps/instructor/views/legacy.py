@@ -1087,7 +1087,10 @@ def get_answers_distribution(request, course_key):
     """
     course = get_course_with_access(request.user, 'staff', course_key)
 
-    course_answer_distributions = grades.answer_distributions(course.id)
+    if settings.FEATURES.get('ENABLE_ANSWER_DISTRIBUTION_COUNTS', False):
+        course_answer_distributions = grades.materialized_answer_distributions(course.id)
+    else:
+        course_answer_distributions = grades.answer_distributions(course.id)
 
     dist = {}
     dist['header'] = ['url_name', 'display name', 'answer id', 'answer', 'count']
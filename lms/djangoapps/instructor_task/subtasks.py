@@ -23,6 +23,8 @@ SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
+# Number of items fetched by each query when generating the items of subtasks.
+ITEMS_PER_QUERY = 10000
 
 
 class DuplicateTaskException(Exception):
@@ -69,6 +71,67 @@ def track_memory_usage(metric, course_id):
         )
 
 
+def _iterate_by_pk(queryset, fields, items_per_query):
+    """
+    Yields the values of `fields` of every item in `queryset`, as dicts, in order of pk.
+
+    Items are fetched `items_per_query` at a time, each query starting after the last pk
+    fetched by the previous one, so that no database cursor is held open while the items
+    are consumed.  `fields` must include 'pk'.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        page = list(page_queryset.values(*fields)[:items_per_query])
+        for item in page:
+            yield item
+        if len(page) < items_per_query:
+            return
+        last_pk = page[-1]['pk']
+
+
+def _pk_ranges(indexed_pks):
+    """
+    Returns the ranges covering a list of (queryset index, pk) pairs, as dicts with
+    the keys 'queryset', 'first_pk' and 'last_pk'.
+    """
+    ranges = []
+    for index, pk in indexed_pks:
+        if ranges and ranges[-1]['queryset'] == index:
+            ranges[-1]['last_pk'] = pk
+        else:
+            ranges.append({'queryset': index, 'first_pk': pk, 'last_pk': pk})
+    return ranges
+
+
+def is_pk_range_list(item_list):
+    """
+    Returns whether `item_list` holds pk ranges rather than items, as passed to
+    subtasks by `queue_subtasks_for_query` when called with `pk_ranges=True`.
+    """
+    return bool(item_list) and 'first_pk' in item_list[0]
+
+
+def get_items_in_pk_ranges(item_querysets, item_fields, pk_ranges):
+    """
+    Returns the items of `item_querysets` in the `pk_ranges` a subtask was created with,
+    as a list of dicts of the fields in `item_fields` plus the 'pk' field.
+
+    `item_querysets` must be the same list of query sets as was used to queue the subtasks.
+    """
+    all_item_fields = list(item_fields)
+    all_item_fields.append('pk')
+    items = []
+    for pk_range in pk_ranges:
+        queryset = item_querysets[pk_range['queryset']].filter(
+            pk__gte=pk_range['first_pk'],
+            pk__lte=pk_range['last_pk'],
+        )
+        items.extend(queryset.order_by('pk').values(*all_item_fields))
+    return items
+
+
 def _generate_items_for_subtask(
     item_querysets,  # pylint: disable=bad-continuation
     item_fields,
@@ -76,6 +139,8 @@ def _generate_items_for_subtask(
     items_per_task,
     total_num_subtasks,
     course_id,
+    pk_ranges=False,
+    items_per_query=None,
 ):
     """
     Generates a chunk of "items" that should be passed into a subtask.
@@ -85,34 +150,44 @@ def _generate_items_for_subtask(
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
+        `total_num_subtasks` : the number of chunks to generate, from _get_number_of_subtasks().
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `pk_ranges` : if True, each chunk lists the ranges of pks of its items instead of the items.
+        `items_per_query` : number of items to fetch from the database at a time (ITEMS_PER_QUERY by default).
 
     Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
+        If `pk_ranges` is True, each dict instead has the keys 'queryset' (the index of a query set
+        in `item_querysets`), 'first_pk' and 'last_pk', which `get_items_in_pk_ranges` turns back into items.
 
     Warning:  if the algorithm here changes, the _get_number_of_subtasks() method should similarly be changed.
     """
     num_items_queued = 0
-    all_item_fields = list(item_fields)
-    all_item_fields.append('pk')
+    items_per_query = items_per_query or ITEMS_PER_QUERY
+    all_item_fields = ['pk'] if pk_ranges else list(item_fields) + ['pk']
     num_subtasks = 0
 
     items_for_task = []
 
+    def chunk(items):
+        """Returns the list to pass to a subtask for `items`, a list of (queryset index, item) pairs."""
+        if pk_ranges:
+            return _pk_ranges((index, item['pk']) for index, item in items)
+        return [item for __, item in items]
+
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
-        for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
+        for index, queryset in enumerate(item_querysets):
+            for item in _iterate_by_pk(queryset, all_item_fields, items_per_query):
                 if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
-                    yield items_for_task
+                    yield chunk(items_for_task)
                     num_items_queued += items_per_task
                     items_for_task = []
                     num_subtasks += 1
-                items_for_task.append(item)
+                items_for_task.append((index, item))
 
         # yield remainder items for task, if any
         if items_for_task:
-            yield items_for_task
+            yield chunk(items_for_task)
             num_items_queued += len(items_for_task)
 
     # Note, depending on what kind of DB is used, it's possible for the queryset
@@ -284,6 +359,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    pk_ranges=False,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -299,6 +375,8 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `pk_ranges` : if True, subtasks are created with the ranges of pks of their items instead
+            of the items, and fetch the items themselves with `get_items_in_pk_ranges`.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -328,6 +406,7 @@ def queue_subtasks_for_query(
         items_per_task,
         total_num_subtasks,
         entry.course_id,
+        pk_ranges=pk_ranges,
     )
 
     # Now create the subtasks, and start them running.
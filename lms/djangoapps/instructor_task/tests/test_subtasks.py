@@ -7,7 +7,7 @@ from mock import Mock, patch
 
 from student.models import CourseEnrollment
 
-from instructor_task.subtasks import queue_subtasks_for_query
+from instructor_task.subtasks import queue_subtasks_for_query, get_items_in_pk_ranges, is_pk_range_list
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase
 
@@ -26,7 +26,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
+    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count, pk_ranges=False):
         """Queue subtasks while enrolling more students into course in the middle of the process."""
 
         task_id = str(uuid4())
@@ -55,7 +55,9 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_fields=[],
                 items_per_task=items_per_task,
                 total_num_items=initial_count,
+                pk_ranges=pk_ranges,
             )
+        return task_querysets
 
     def test_queue_subtasks_for_query1(self):
         """Test queue_subtasks_for_query() if the last subtask only needs to accommodate < items_per_tasks items."""
@@ -80,3 +82,33 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    @patch('instructor_task.subtasks.ITEMS_PER_QUERY', 2)
+    def test_queue_subtasks_for_query_in_pages(self):
+        """Test queue_subtasks_for_query() when the items are fetched in several queries."""
+
+        mock_create_subtask_fcn = Mock()
+        task_querysets = self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 1)
+
+        item_lists = [args[0][0] for args in mock_create_subtask_fcn.call_args_list]
+        self.assertEqual([len(item_list) for item_list in item_lists], [3, 3, 2])
+        self.assertEqual(
+            [item['pk'] for item_list in item_lists for item in item_list],
+            list(task_querysets[0].order_by('pk').values_list('pk', flat=True)),
+        )
+
+    def test_queue_subtasks_for_query_pk_ranges(self):
+        """Test queue_subtasks_for_query() when subtasks are passed ranges of pks."""
+
+        mock_create_subtask_fcn = Mock()
+        task_querysets = self._queue_subtasks(mock_create_subtask_fcn, 3, 8, 3, pk_ranges=True)
+
+        pk_range_lists = [args[0][0] for args in mock_create_subtask_fcn.call_args_list]
+        self.assertEqual(len(pk_range_lists), 3)
+        self.assertTrue(all(is_pk_range_list(pk_range_list) for pk_range_list in pk_range_lists))
+        item_lists = [get_items_in_pk_ranges(task_querysets, [], pk_range_list) for pk_range_list in pk_range_lists]
+        self.assertEqual([len(item_list) for item_list in item_lists], [3, 3, 5])
+        self.assertEqual(
+            [item['pk'] for item_list in item_lists for item in item_list],
+            list(task_querysets[0].order_by('pk').values_list('pk', flat=True)),
+        )
@@ -1,9 +1,16 @@
 """
 Serializer for video outline
 """
+from datetime import datetime
+from functools import partial
+
+from django.core.cache import cache
+from pytz import UTC
 from rest_framework.reverse import reverse
 
-from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
+from opaque_keys.edx.keys import UsageKey
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.mongo.base import block_types_with_children
 from courseware.access import has_access
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor
@@ -13,10 +20,27 @@ from edxval.api import (
     get_video_info_for_course_and_profiles, ValInternalError
 )
 
+# VAL encodings can change without the course being published, so keep this short
+VIDEO_OUTLINE_CACHE_TIMEOUT = 60 * 60
+
+
+class UserDependentOutlineError(Exception):
+    """
+    Raised when building an outline for no particular user reaches a block
+    whose children depend on the user (e.g. a split_test or library_content
+    block).
+    """
+    pass
+
 
 class BlockOutline(object):
     """
     Serializes course videos, pulling data from VAL and the video modules.
+
+    If `request` is None, the outline is built for no particular user: access
+    isn't checked, URLs are relative, and each item records in 'access' what
+    `video_outline` needs to check access later. UserDependentOutlineError is
+    raised if a block with dynamic children is reached.
     """
     def __init__(self, course_id, start_block, block_types, request, video_profiles):
         """Create a BlockOutline using `start_block` as a starting point."""
@@ -39,7 +63,7 @@ class BlockOutline(object):
             """
             return (
                 usage_key.block_type in self.block_types or
-                usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
+                usage_key.block_type in block_types_with_children()
             )
 
         def create_module(descriptor):
@@ -68,22 +92,32 @@ class BlockOutline(object):
                 continue
 
             if curr_block.location.block_type in self.block_types:
-                if not has_access(self.request.user, 'load', curr_block, course_key=self.course_id):
+                if self.request is not None and not has_access(
+                        self.request.user, 'load', curr_block, course_key=self.course_id
+                ):
                     continue
 
                 summary_fn = self.block_types[curr_block.category]
                 block_path = list(path(curr_block, child_to_parent, self.start_block))
                 unit_url, section_url = find_urls(self.course_id, curr_block, child_to_parent, self.request)
 
-                yield {
+                item = {
                     "path": block_path,
                     "named_path": [b["name"] for b in block_path],
                     "unit_url": unit_url,
                     "section_url": section_url,
                     "summary": summary_fn(self.course_id, curr_block, self.request, self.local_cache)
                 }
+                if self.request is None:
+                    item["access"] = {
+                        "restricted": bool(curr_block.visible_to_staff_only or curr_block.merged_group_access),
+                        "start": None if 'detached' in curr_block._class_tags else curr_block.start,  # pylint: disable=protected-access
+                    }
+                yield item
 
             if curr_block.has_children:
+                if self.request is None and curr_block.has_dynamic_children():
+                    raise UserDependentOutlineError(unicode(curr_block.location))
                 children = get_dynamic_descriptor_children(
                     curr_block,
                     create_module,
@@ -233,3 +267,94 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
     }
     ret.update(always_available_data)
     return ret
+
+
+def _video_outline_cache_key(course, video_profiles):
+    """
+    Returns the cache key of the user independent video outline of `course`
+    for `video_profiles`, or None if the course has no version information to
+    key it by (e.g. XML courses).
+    """
+    version = getattr(course, 'subtree_edited_on', None)
+    if version is None:
+        return None
+    return u"mobile_api.video_outline.{}.{}.{}".format(course.id, version.isoformat(), u",".join(video_profiles))
+
+
+def video_outline_artifact(course, video_profiles):
+    """
+    Returns the video outline of `course` built for no particular user (see
+    BlockOutline), or None if the outline depends on the user.
+
+    The artifact is kept in the shared cache keyed by the course version and
+    the video profiles, so it is regenerated once after each publish rather
+    than on every request. Whether the outline depends on the user is cached
+    too.
+    """
+    cache_key = _video_outline_cache_key(course, video_profiles)
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return cached['outline']
+
+    course = modulestore().get_course(course.id, depth=None)
+    try:
+        outline = list(
+            BlockOutline(
+                course.id,
+                course,
+                {"video": partial(video_summary, video_profiles)},
+                None,
+                video_profiles,
+            )
+        )
+    except UserDependentOutlineError:
+        outline = None
+    if cache_key:
+        cache.set(cache_key, {'outline': outline}, VIDEO_OUTLINE_CACHE_TIMEOUT)
+    return outline
+
+
+def video_outline(course, request, video_profiles):
+    """
+    Returns the video outline of `course` for `request.user`.
+
+    The user's access is applied to the cached `video_outline_artifact`: only
+    videos which are restricted or haven't started yet are checked against
+    their descriptor. Courses whose outline depends on the user fall back to
+    walking the course with BlockOutline.
+    """
+    artifact = video_outline_artifact(course, video_profiles)
+    if artifact is None:
+        return list(
+            BlockOutline(
+                course.id,
+                modulestore().get_course(course.id, depth=None),
+                {"video": partial(video_summary, video_profiles)},
+                request,
+                video_profiles,
+            )
+        )
+
+    now = datetime.now(UTC)
+    outline = []
+    for item in artifact:
+        access = item["access"]
+        if access["restricted"] or (access["start"] is not None and now <= access["start"]):
+            usage_key = UsageKey.from_string(item["summary"]["id"]).map_into_course(course.id)
+            descriptor = modulestore().get_item(usage_key)
+            if not has_access(request.user, 'load', descriptor, course_key=course.id):
+                continue
+
+        summary = dict(item["summary"])
+        if summary.get("transcripts"):
+            summary["transcripts"] = {
+                lang: request.build_absolute_uri(url) for lang, url in summary["transcripts"].iteritems()
+            }
+        outline.append({
+            "path": item["path"],
+            "named_path": item["named_path"],
+            "unit_url": request.build_absolute_uri(item["unit_url"]),
+            "section_url": request.build_absolute_uri(item["section_url"]),
+            "summary": summary,
+        })
+    return outline
@@ -5,11 +5,13 @@ Tests for video outline API
 # pylint: disable=no-member
 import ddt
 import itertools
+from mock import patch
 from uuid import uuid4
 from collections import namedtuple
 
 from edxval import api
 from mobile_api.models import MobileApiConfig
+from mobile_api.video_outlines.serializers import video_outline_artifact
 from xmodule.modulestore.tests.factories import ItemFactory
 from xmodule.video_module import transcripts_utils
 from xmodule.modulestore.django import modulestore
@@ -767,6 +769,61 @@ class TestVideoSummaryList(
         video_outline = self.api_response().data
         self.assertEqual(len(video_outline), 2)
 
+    def test_cached_outline(self):
+        self.login_and_enroll()
+        self._create_video_with_subs()
+        ItemFactory.create(
+            parent=self.other_unit,
+            category="video",
+            display_name=u"test video omega 2 \u03a9",
+            html5_sources=[self.html5_video_url]
+        )
+        ItemFactory.create(
+            parent=self.unit,
+            category="video",
+            edx_video_id=self.edx_video_id,
+            display_name=u"test draft video omega \u03a9",
+            visible_to_staff_only=True,
+        )
+
+        expected = self.api_response().data
+        with patch.dict('django.conf.settings.FEATURES', {'ENABLE_VIDEO_OUTLINE_CACHE': True}):
+            self.assertEqual(self.api_response().data, expected)
+
+            # the cached artifact is filtered for each user
+            self.user.is_staff = True
+            self.user.save()
+            self.assertEqual(len(self.api_response().data), 3)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_VIDEO_OUTLINE_CACHE': True})
+    def test_cached_outline_with_cohorted_content(self):
+        self.login_and_enroll()
+        self._setup_course_partitions(scheme_id='cohort', is_cohorted=True)
+        self._create_cohorted_video(0)
+        self._create_cohorted_video(1)
+        cohort = CohortFactory(course_id=self.course.id, name=u"Cohort 1")
+        CourseUserGroupPartitionGroup(course_user_group=cohort, partition_id=self.partition_id, group_id=1).save()
+
+        self.assertEqual(len(self.api_response().data), 0)
+
+        cohort.users.add(self.user)
+        video_outline = self.api_response().data
+        self.assertEqual([video["summary"]["name"] for video in video_outline], [u"video for group 1"])
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_VIDEO_OUTLINE_CACHE': True})
+    def test_cached_outline_with_split_vertical(self):
+        """The outline of a course with split_test blocks depends on the user, so it isn't cached."""
+        self.login_and_enroll()
+        split_vertical_a, __ = self._setup_split_module("vertical")
+        ItemFactory.create(
+            parent=split_vertical_a,
+            category="video",
+            display_name=u"video in vertical a",
+        )
+        video_outline = self.api_response().data
+        self.assertLessEqual(len(video_outline), 1)
+        self.assertIsNone(video_outline_artifact(self.course, MobileApiConfig.get_video_profiles()))
+
     def test_with_hidden_blocks(self):
         self.login_and_enroll()
         hidden_subsection = ItemFactory.create(
@@ -8,6 +8,7 @@ general XBlock representation in this rather specialized formatting.
 """
 from functools import partial
 
+from django.conf import settings
 from django.http import Http404, HttpResponse
 from mobile_api.models import MobileApiConfig
 
@@ -19,7 +20,7 @@ from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 
 from ..utils import mobile_view, mobile_course_access
-from .serializers import BlockOutline, video_summary
+from .serializers import BlockOutline, video_outline, video_summary
 
 
 @mobile_view()
@@ -77,19 +78,22 @@ class VideoSummaryList(generics.ListAPIView):
                 * size: The size of the video file
     """
 
-    @mobile_course_access(depth=None)
+    @mobile_course_access()
     def list(self, request, course, *args, **kwargs):
         video_profiles = MobileApiConfig.get_video_profiles()
-        video_outline = list(
+        if settings.FEATURES.get('ENABLE_VIDEO_OUTLINE_CACHE'):
+            return Response(video_outline(course, request, video_profiles))
+
+        outline = list(
             BlockOutline(
                 course.id,
-                course,
+                modulestore().get_course(course.id, depth=None),
                 {"video": partial(video_summary, video_profiles)},
                 request,
                 video_profiles,
             )
         )
-        return Response(video_outline)
+        return Response(outline)
 
 
 @mobile_view()
@@ -395,6 +395,25 @@ FEATURES = {
 
     # Teams feature
     'ENABLE_TEAMS': False,
+
+    # Maintain per-answer counts on problem submission and serve the answer
+    # distribution report from them. Run the rebuild_answer_counts management
+    # command for existing courses after turning this on.
+    'ENABLE_ANSWER_DISTRIBUTION_COUNTS': False,
+
+    # Build the courseware table of contents from a per course version
+    # skeleton kept in the cache instead of binding every chapter and section
+    # to the user. Only used when no FIELD_OVERRIDE_PROVIDERS are configured.
+    'ENABLE_TOC_SKELETON_CACHE': False,
+
+    # Serve the mobile video outline from a per course version artifact kept
+    # in the cache, filtered by the user's access, instead of walking the
+    # course on every request.
+    'ENABLE_VIDEO_OUTLINE_CACHE': False,
+
+    # Load every mako template in each web server process before it accepts
+    # requests (compile them ahead of time with compile_mako_templates).
+    'ENABLE_MAKO_WARMUP': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -1585,6 +1604,18 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of mail connections each bulk email subtask opens and sends over concurrently.
+BULK_EMAIL_SMTP_CONNECTIONS = 1
+
+# Maximum number of messages each bulk email subtask sends per second, over all of its
+# connections, or None for no limit.  Choose this value depending on the number of workers
+# that might be sending email in parallel, and what the SES rate is.
+BULK_EMAIL_MAX_SENDS_PER_SECOND = None
+
+# Whether bulk email subtasks are queued with the ranges of pks of their recipients rather than
+# the recipients themselves, and fetch their recipients when they start.
+BULK_EMAIL_SUBTASK_PK_RANGES = False
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1648,6 +1679,8 @@ INSTALLED_APPS = (
     'dashboard',
     'instructor',
     'instructor_task',
+    # installed even when FEATURES['CLASS_DASHBOARD'] is off, so that its rollup tables exist
+    'class_dashboard',
     'open_ended_grading',
     'psychometrics',
     'licenses',
@@ -1900,8 +1933,6 @@ VERIFY_STUDENT = {
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = False
-if FEATURES.get('CLASS_DASHBOARD'):
-    INSTALLED_APPS += ('class_dashboard',)
 
 ######################## CAS authentication ###########################
 
@@ -15,6 +15,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lms.envs.aws")
 import lms.startup as startup
 startup.run()
 
+# Load what the first requests would otherwise pay for (e.g. compiled templates)
+from openedx.core.lib.django_startup import autowarmup
+autowarmup()
+
 from xmodule.modulestore.django import modulestore
 
 # Trigger a forced initialization of our modulestores since this can take a
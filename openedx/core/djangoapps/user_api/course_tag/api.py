@@ -5,8 +5,14 @@ just in-process.  Exposes global and per-course key-value pairs for users.
 Implementation note:
 Stores global metadata using the UserPreference model, and per-course metadata using the
 UserCourseTag model.
+
+While a request is being serviced, all of a user's tags in a course are loaded with
+a single query on the first lookup, and later lookups in the request are served from
+the request cache.
 """
 
+from request_cache.middleware import RequestCache
+
 from ..models import UserCourseTag
 
 # Scopes
@@ -15,6 +21,39 @@ from ..models import UserCourseTag
 COURSE_SCOPE = 'course'
 
 
+def _course_tags_cache_key(user, course_id):
+    """
+    Returns the request cache key of the user's tags in the course.
+    """
+    return u"course_tag.api.course_tags.{}.{}".format(user.id, course_id)
+
+
+def get_course_tags(user, course_id):
+    """
+    Gets all of the user's course tags in the specified course_id, loading them at
+    most once per request.
+
+    Args:
+        user: the User object for the course tags
+        course_id: course identifier (string)
+
+    Returns:
+        a dict mapping the keys of the course tags to their values, shared with the
+        request cache, or None if no request is being serviced, in which case the
+        caller should look up the tags one by one
+    """
+    if RequestCache.get_current_request() is None:
+        return None
+
+    request_cache = RequestCache.get_request_cache()
+    cache_key = _course_tags_cache_key(user, course_id)
+    if cache_key not in request_cache.data:
+        request_cache.data[cache_key] = dict(
+            UserCourseTag.objects.filter(user=user, course_id=course_id).values_list('key', 'value')
+        )
+    return request_cache.data[cache_key]
+
+
 def get_course_tag(user, course_id, key):
     """
     Gets the value of the user's course tag for the specified key in the specified
@@ -28,6 +67,10 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
+    course_tags = get_course_tags(user, course_id)
+    if course_tags is not None:
+        return course_tags.get(key)
+
     try:
         record = UserCourseTag.objects.get(
             user=user,
@@ -65,3 +108,8 @@ def set_course_tag(user, course_id, key, value):
 
     record.value = value
     record.save()
+
+    # Write through to the tags loaded for the request, if any, as the text they are stored as
+    course_tags = RequestCache.get_request_cache().data.get(_course_tags_cache_key(user, course_id))
+    if course_tags is not None:
+        course_tags[key] = value if isinstance(value, basestring) else unicode(value)
@@ -2,6 +2,9 @@
 Test the user course tag API.
 """
 from django.test import TestCase
+from django.test.client import RequestFactory
+
+from request_cache.middleware import RequestCache
 
 from student.tests.factories import UserFactory
 from openedx.core.djangoapps.user_api.course_tag import api as course_tag_api
@@ -34,3 +37,32 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_course_tags_cached_for_request(self):
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(self.user, self.course_id, 'other_key', 1)
+
+        middleware = RequestCache()
+        middleware.process_request(RequestFactory().get('/'))
+        self.addCleanup(middleware.clear_request_cache)
+
+        # all of the tags are loaded with the first lookup
+        with self.assertNumQueries(1):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key), 'value')
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'other_key'), '1')
+            self.assertIsNone(course_tag_api.get_course_tag(self.user, self.course_id, 'missing_key'))
+
+        # setting a tag writes through to the cached tags
+        course_tag_api.set_course_tag(self.user, self.course_id, 'new_key', 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'new_key'), '2')
+            self.assertEqual(
+                course_tag_api.get_course_tags(self.user, self.course_id),
+                {self.test_key: 'value', 'other_key': '1', 'new_key': '2'}
+            )
+
+        # the tags are loaded again in the next request
+        middleware.process_response(None, None)
+        middleware.process_request(RequestFactory().get('/'))
+        with self.assertNumQueries(1):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'new_key'), '2')
@@ -6,9 +6,9 @@ from importlib import import_module
 from django.conf import settings
 
 
-def autostartup():
+def _startup_modules():
     """
-    Execute app.startup:run() for all installed django apps
+    Yield the startup module of each installed django app which has one
     """
     for app in settings.INSTALLED_APPS:
         # See if there's a startup module in each app.
@@ -16,7 +16,27 @@ def autostartup():
             mod = import_module(app + '.startup')
         except ImportError:
             continue
+        yield mod
+
 
+def autostartup():
+    """
+    Execute app.startup:run() for all installed django apps
+    """
+    for mod in _startup_modules():
         # If the module has a run method, run it.
         if hasattr(mod, 'run'):
             mod.run()
+
+
+def autowarmup():
+    """
+    Execute app.startup:warmup() for all installed django apps
+
+    Called by web server processes once startup is complete, before they
+    accept requests, so the first requests don't pay for loading that can be
+    done up front.
+    """
+    for mod in _startup_modules():
+        if hasattr(mod, 'warmup'):
+            mod.warmup()
@@ -0,0 +1,112 @@
+"""
+Measure how long modules take to import.
+
+Usage, in a fresh process (modules which are already imported cost nothing)::
+
+    python -m openedx.core.lib.import_profiler lms.wsgi
+
+or through the `profile_imports` management command.
+"""
+import __builtin__
+from importlib import import_module
+import sys
+import time
+
+
+class ImportProfiler(object):
+    """
+    Context manager which records, for every module first imported while it is
+    active, the time taken by the import including its own imports (`cumulative`)
+    and excluding them (`own`).
+    """
+    def __init__(self):
+        self.cumulative = {}
+        self.own = {}
+        self._nested = []
+        self._original_import = None
+
+    def __enter__(self):
+        self._original_import = __builtin__.__import__
+        __builtin__.__import__ = self._import
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        __builtin__.__import__ = self._original_import
+
+    def _import(self, name, globals=None, locals=None, fromlist=None, level=-1):  # pylint: disable=redefined-builtin
+        """
+        Replacement for `__import__` which times imports of new modules.
+        """
+        if name in sys.modules and not fromlist:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        already_imported = set(sys.modules)
+        self._nested.append(0.0)
+        start = time.time()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.time() - start
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            # python 2 leaves None entries behind for implicit relative imports which failed
+            imported = set(
+                module_name for module_name in set(sys.modules) - already_imported
+                if sys.modules[module_name] is not None
+            )
+            if imported:
+                module_name = self._resolve(name, imported)
+                self.cumulative[module_name] = self.cumulative.get(module_name, 0.0) + elapsed
+                self.own[module_name] = self.own.get(module_name, 0.0) + elapsed - nested
+
+    @staticmethod
+    def _resolve(name, imported):
+        """
+        Return the full name of the module imported as `name` (which may be relative,
+        or the package of the submodules imported with `from name import ...`).
+        """
+        if name in imported:
+            return name
+        candidates = [module_name for module_name in imported if module_name.endswith('.' + name)]
+        return min(candidates or imported, key=len)
+
+    def slowest(self, count=20, own=False):
+        """
+        Return the `count` slowest (module name, seconds) imports, by cumulative or own time.
+        """
+        timings = self.own if own else self.cumulative
+        return sorted(timings.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def profile_imports(module_names):
+    """
+    Import `module_names` under an `ImportProfiler`, and return it.
+    """
+    with ImportProfiler() as profiler:
+        for module_name in module_names:
+            import_module(module_name)
+    return profiler
+
+
+def main(argv):
+    """
+    Profile the import of the modules named in `argv` and print the slowest imports.
+    """
+    count = 30
+    if argv and argv[0].startswith('--count='):
+        count = int(argv[0].split('=', 1)[1])
+        argv = argv[1:]
+
+    start = time.time()
+    profiler = profile_imports(argv)
+    print "Imported {} modules in {:.2f}s".format(len(profiler.cumulative), time.time() - start)
+    for title, own in (("Slowest imports, including their own imports:", False), ("Slowest imports, by themselves:", True)):
+        print
+        print title
+        for module_name, seconds in profiler.slowest(count, own=own):
+            print "{:8.3f}s  {}".format(seconds, module_name)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
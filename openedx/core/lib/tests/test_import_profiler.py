@@ -0,0 +1,40 @@
+"""
+Tests for the import profiler.
+"""
+import __builtin__
+import sys
+import unittest
+
+from openedx.core.lib.import_profiler import ImportProfiler
+
+
+class ImportProfilerTest(unittest.TestCase):
+    """
+    Tests for `ImportProfiler`.
+    """
+    def setUp(self):
+        super(ImportProfilerTest, self).setUp()
+        # make sure the modules under test are imported afresh
+        for module_name in ('wave', 'chunk'):
+            self.addCleanup(sys.modules.pop, module_name, None)
+            sys.modules.pop(module_name, None)
+
+    def test_records_new_imports(self):
+        with ImportProfiler() as profiler:
+            import wave  # pylint: disable=unused-variable
+            import os  # pylint: disable=unused-variable
+
+        # wave imports chunk, so it took at least as long as chunk
+        self.assertIn('wave', profiler.cumulative)
+        self.assertIn('chunk', profiler.cumulative)
+        self.assertGreaterEqual(profiler.cumulative['wave'], profiler.cumulative['chunk'])
+        self.assertLessEqual(profiler.own['wave'], profiler.cumulative['wave'])
+        # already imported modules cost nothing
+        self.assertNotIn('os', profiler.cumulative)
+        self.assertEqual(profiler.slowest(1)[0][0], 'wave')
+
+    def test_restores_import(self):
+        original_import = __builtin__.__import__
+        with ImportProfiler():
+            self.assertIsNot(__builtin__.__import__, original_import)
+        self.assertIs(__builtin__.__import__, original_import)